@@ -20,7 +20,10 @@ export type ConnectionDetails = {
   participantToken: string;
 };
 
-export async function GET() {
+// Transcript session tickets are UUIDs issued by the backend
+const SESSION_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export async function GET(request: Request) {
   try {
     if (LIVEKIT_URL === undefined) {
       throw new Error("LIVEKIT_URL is not defined");
@@ -35,8 +38,13 @@ export async function GET() {
     // Generate participant token
     const participantIdentity = `voice_assistant_user_${Math.floor(Math.random() * 10_000)}`;
     const roomName = `voice_assistant_room_${Math.floor(Math.random() * 10_000)}`;
+    // Pass the backend's transcript session on to the agent through participant metadata
+    const session = new URL(request.url).searchParams.get("session");
+    const metadata = session && SESSION_PATTERN.test(session)
+      ? JSON.stringify({ transcript_session: session })
+      : undefined;
     const participantToken = await createParticipantToken(
-      { identity: participantIdentity },
+      { identity: participantIdentity, metadata },
       roomName,
     );
 
@@ -38,6 +38,10 @@ export default function Page() {
       "/api/connection-details",
       window.location.origin
     );
+    const session = new URLSearchParams(window.location.search).get("session");
+    if (session) {
+      url.searchParams.set("session", session);
+    }
     const response = await fetch(url.toString());
     const connectionDetailsData = await response.json();
     updateConnectionDetails(connectionDetailsData);
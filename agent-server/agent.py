@@ -1,10 +1,6 @@
 import logging
-import os
-import json
-import re
 import asyncio
-from datetime import datetime
-import ast
+import os
 
 from dotenv import load_dotenv
 from livekit.agents import (
@@ -15,116 +11,28 @@ from livekit.agents import (
     cli,
     llm,
     metrics,
-    stt,
-    transcription,
 )
 from livekit import rtc
-from livekit.agents.pipeline import VoicePipelineAgent
-from livekit.plugins import cartesia, openai, deepgram, silero, turn_detector
-
-# Set up transcript storage
-class TranscriptStore:
-    def __init__(self, file_path=None):
-        self.file_path = file_path
-        self.conversations = {"conversations": []}
-        self.initialized = False
-        
-    def set_file_path(self, file_path):
-        self.file_path = file_path
-        # Initialize file
-        with open(self.file_path, "w") as f:
-            json.dump(self.conversations, f, indent=2)
-        print(f"Initialized transcript file: {file_path}")
-        self.initialized = True
-    
-    def add_transcript(self, speaker, text):
-        if not self.initialized or not text.strip():
-            return
-            
-        # Check if this message is already saved (to avoid duplicates)
-        existing = [
-            entry for entry in self.conversations["conversations"] 
-            if entry["speaker"] == speaker and entry["text"] == text
-        ]
-        
-        if not existing:
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                "speaker": speaker,
-                "text": text
-            }
-            
-            self.conversations["conversations"].append(entry)
-            
-            # Save to file
-            try:
-                with open(self.file_path, "w") as f:
-                    json.dump(self.conversations, f, indent=2)
-                print(f"Saved transcript: {speaker}: {text}")
-            except Exception as e:
-                print(f"Error saving transcript: {e}")
-
-# Create a transcript store
-transcript_store = TranscriptStore()
+from livekit.agents.pipeline import AgentTranscriptionOptions, VoicePipelineAgent
+
+from ingest import TranscriptUploader, session_from_metadata
+from resources import ModelPool
+from telemetry import SessionMetrics, start_metrics_server
+from transcripts import TranscriptStoreRegistry, message_text
+
+# Transcript stores of the sessions running in this worker process. Utterances
+# arrive once each from the pipeline events, so duplicates are only checked
+# against the last few lines and a "Yeah." repeated later in the call is kept
+transcript_stores = TranscriptStoreRegistry(directory="transcriptions", dedup_window=4)
 
 # Set up logging
 load_dotenv(dotenv_path=".env.local")
 # logging.basicConfig(level=logging.DEBUG)
-# logger = logging.getLogger("voice-agent")
-
-# Add OpenAI log handler
-class OpenAITranscriptHandler(logging.Handler):
-    def emit(self, record):
-        try:
-            log_msg = self.format(record)
-            
-            # Look for OpenAI request logs with message content
-            if "Request options" in log_msg and "'messages':" in log_msg:
-                # Extract the JSON-like structure
-                match = re.search(r"'json_data': (\{.*\})", log_msg)
-                if match:
-                    # Parse the JSON-like string
-                    json_str = match.group(1)
-                    try:
-                        data = ast.literal_eval(json_str)
-                        if 'messages' in data:
-                            messages = data['messages']
-                            # Process all non-system messages
-                            for msg in messages:
-                                if msg['role'] == 'system':
-                                    continue
-                                speaker = "Bot" if msg['role'] == 'assistant' else "User"
-                                text = msg['content']
-                                transcript_store.add_transcript(speaker, text)
-                    except (SyntaxError, ValueError) as e:
-                        print(f"Error parsing JSON-like data: {e}")
-        except Exception as e:
-            print(f"Error in OpenAI log handler: {e}")
-
-openai_handler = OpenAITranscriptHandler()
-openai_logger = logging.getLogger("openai._base_client")
-openai_logger.addHandler(openai_handler)
+logger = logging.getLogger("voice-agent")
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
-
-# STT forwarding function
-async def forward_transcription(
-    stt_stream: stt.SpeechStream,
-    stt_forwarder: transcription.STTSegmentsForwarder,
-):
-    """Forward the transcription and log the transcript in the console and to our store"""
-    async for ev in stt_stream:
-        stt_forwarder.update(ev)
-        
-        if ev.type == stt.SpeechEventType.INTERIM_TRANSCRIPT:
-            # Interim transcripts can be logged but we don't save them
-            print(f"Interim: {ev.alternatives[0].text}", end="")
-        elif ev.type == stt.SpeechEventType.FINAL_TRANSCRIPT:
-            # Final transcripts should be saved
-            final_text = ev.alternatives[0].text
-            print(f"\nFinal: {final_text}")
-            transcript_store.add_transcript("User", final_text)
+    # Load models and build plugin clients once per process, before any job arrives
+    proc.userdata["models"] = ModelPool().load()
 
 async def entrypoint(ctx: JobContext):
     initial_ctx = llm.ChatContext().append(
@@ -143,96 +51,99 @@ async def entrypoint(ctx: JobContext):
     participant = await ctx.wait_for_participant()
     logger.info(f"Starting voice assistant for participant {participant.identity}")
     
-    os.makedirs("transcriptions", exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    json_file_path = os.path.abspath(os.path.join("transcriptions", f"transcript_{participant.identity}_{timestamp}.json"))
-    
-    logger.info(f"Transcriptions will be saved to: {json_file_path}")
-    
-    # Set the file path for the transcript store
-    transcript_store.set_file_path(json_file_path)
-    
-    # Create DeepGram STT service
-    deepgram_stt = deepgram.STT()
-    transcription_tasks = []
-    
-    # Set up track subscription for direct STT forwarding
-    @ctx.room.on("track_subscribed")
-    def on_track_subscribed(
-        track: rtc.Track,
-        publication: rtc.TrackPublication,
-        participant: rtc.RemoteParticipant,
-    ):
-        if track.kind == rtc.TrackKind.KIND_AUDIO:
-            logger.info(f"Subscribed to audio track from {participant.identity}")
-            
-            async def transcribe_track(participant, track):
-                try:
-                    audio_stream = rtc.AudioStream(track)
-                    stt_forwarder = transcription.STTSegmentsForwarder(
-                        room=ctx.room, participant=participant, track=track
-                    )
-                    stt_stream = deepgram_stt.stream()
-                    
-                    # Start forwarding transcriptions
-                    forward_task = asyncio.create_task(
-                        forward_transcription(stt_stream, stt_forwarder)
-                    )
-                    transcription_tasks.append(forward_task)
-                    
-                    # Process audio frames
-                    async for ev in audio_stream:
-                        stt_stream.push_frame(ev.frame)
-                except Exception as e:
-                    logger.exception(f"Error in transcribe_track: {e}")
-            
-            transcription_tasks.append(asyncio.create_task(transcribe_track(participant, track)))
+    # Stream the transcript to the backend when the client passed a session ticket
+    sinks = []
+    uploader = TranscriptUploader.from_env(session_from_metadata(participant.metadata), ctx.room.name)
+    if uploader is not None:
+        logger.info(f"Uploading transcript for session {uploader.session}")
+        sinks.append(uploader)
+
+    # Each session gets its own store; opening it binds it to this task's context
+    transcript_store = transcript_stores.open(ctx.room.name, participant.identity, sinks=sinks)
+    logger.info(f"Transcriptions will be saved to: {transcript_store.file_path}")
     
-    # Set up the voice pipeline agent
+    models = ctx.proc.userdata["models"]
+
+    # Set up the voice pipeline agent. Its single STT stream on the participant's
+    # track feeds the LLM turn, the live transcription sent to the room and,
+    # through the events below, the stored transcript
     agent = VoicePipelineAgent(
-        vad=ctx.proc.userdata["vad"],
-        stt=deepgram.STT(),  # Using DeepGram for the agent STT as well
-        llm=openai.LLM(model="gpt-4o-mini"),
-        tts=cartesia.TTS(),
-        turn_detector=turn_detector.EOUModel(),
+        vad=models.vad,
+        stt=models.stt,
+        llm=models.llm,
+        tts=models.tts,
+        turn_detector=models.turn_detector,
         min_endpointing_delay=0.5,
         max_endpointing_delay=5.0,
         chat_ctx=initial_ctx,
+        transcription=AgentTranscriptionOptions(user_transcription=True, agent_transcription=True),
     )
     
-    # Save bot responses directly
-    @agent.on("speech_committed")
-    def on_speech_committed(event):
-        if hasattr(event, 'agent_transcript') and event.agent_transcript:
-            transcript_store.add_transcript("Bot", event.agent_transcript)
-    
-    usage_collector = metrics.UsageCollector()
+    # Save both sides of the conversation as the agent commits them to its chat context
+    @agent.on("user_speech_committed")
+    def on_user_speech_committed(msg: llm.ChatMessage):
+        transcript_store.add_transcript("User", message_text(msg.content))
+
+    @agent.on("agent_speech_committed")
+    def on_agent_speech_committed(msg: llm.ChatMessage):
+        transcript_store.add_transcript("Bot", message_text(msg.content))
+
+    @agent.on("agent_speech_interrupted")
+    def on_agent_speech_interrupted(msg: llm.ChatMessage):
+        transcript_store.add_transcript("Bot", message_text(msg.content))
     
+    session_metrics = SessionMetrics(ctx.room.name)
+
     @agent.on("metrics_collected")
     def on_metrics_collected(agent_metrics: metrics.AgentMetrics):
         metrics.log_metrics(agent_metrics)
-        usage_collector.collect(agent_metrics)
+        session_metrics.collect(agent_metrics)
     
-    agent.start(ctx.room, participant)
-    
-    # Send an initial greeting
-    initial_greeting = "Hey, ready to tell me your completed tasks and your new tasks?"
-    await agent.say(initial_greeting, allow_interruptions=True)
-    transcript_store.add_transcript("Bot", initial_greeting)
-    
-    # Keep the room connection alive until it's closed
+    # The session ends when the room disconnects or the participant leaves
+    session_ended = asyncio.Event()
+
+    @ctx.room.on("disconnected")
+    def on_disconnected(*args):
+        session_ended.set()
+
+    @ctx.room.on("participant_disconnected")
+    def on_participant_disconnected(remote_participant: rtc.RemoteParticipant):
+        if remote_participant.identity == participant.identity:
+            session_ended.set()
+
+    session_metrics.start()
     try:
-        while ctx.room.connection_state != "disconnected":
-            await asyncio.sleep(1)
+        agent.start(ctx.room, participant)
+
+        # Send an initial greeting
+        initial_greeting = "Hey, ready to tell me your completed tasks and your new tasks?"
+        await agent.say(initial_greeting, allow_interruptions=True)
+        transcript_store.add_transcript("Bot", initial_greeting)
+
+        # Either may have happened before the handlers were registered
+        if (
+            ctx.room.connection_state == rtc.ConnectionState.CONN_DISCONNECTED
+            or participant.identity not in ctx.room.remote_participants
+        ):
+            session_ended.set()
+        await session_ended.wait()
+        logger.info(f"Session for {participant.identity} in {ctx.room.name} ended")
     except Exception as e:
         logger.error(f"Error in room connection: {e}")
     finally:
-        # Clean up tasks
-        for task in transcription_tasks:
-            if not task.done():
-                task.cancel()
+        # Stop the pipeline and wait for its STT/LLM/TTS tasks before the
+        # transcript is closed, so no committed turn arrives after the flush
+        await agent.aclose()
+        # Write out whatever is still queued and fsync the transcript
+        await transcript_stores.close(ctx.room.name, participant.identity)
+        session_metrics.end()
+
+    ctx.shutdown(reason="session ended")
 
 if __name__ == "__main__":
+    # Prometheus endpoint for the whole worker, e.g. AGENT_METRICS_PORT=9100
+    if os.getenv("AGENT_METRICS_PORT"):
+        start_metrics_server(int(os.getenv("AGENT_METRICS_PORT")))
     cli.run_app(
         WorkerOptions(
             entrypoint_fnc=entrypoint,
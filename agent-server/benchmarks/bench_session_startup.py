@@ -0,0 +1,108 @@
+"""Session startup cost with per-session plugin construction vs the shared model pool.
+
+"cold" matches the agent before the pool: the VAD is loaded once, as the old
+prewarm hook did, and every session builds two DeepGram STT clients, the
+turn detector, an OpenAI LLM and a Cartesia TTS. "warm" loads a
+``ModelPool`` once, as the prewarm hook does now, and then only reads the
+shared instances per session. For each mode the script reports
+the mean time to get a session's resources and the resident memory growth
+over ``--sessions`` sessions.
+
+Only the cost of constructing those resources is measured. No room is joined
+and no audio or LLM request is made, so the numbers do not include the time
+from job entry to the agent's first response. They show the part of that
+latency the pool removes, not the latency a caller sees.
+
+The turn detector needs a job's inference executor, so it is only built with
+``--turn-detector`` inside a running worker. By default it is left out of
+both modes, and the cold numbers then understate the per-session cost.
+
+Usage (from the ``agent-server`` directory, with the agent's dependencies installed):
+    python benchmarks/bench_session_startup.py --sessions 20
+"""
+from pathlib import Path
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Plugin constructors only check that a key is present; no request is made
+for key in ("DEEPGRAM_API_KEY", "OPENAI_API_KEY", "CARTESIA_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+
+import aiohttp  # noqa: E402
+from livekit.plugins import cartesia, deepgram, openai, silero, turn_detector  # noqa: E402
+
+from resources import LLM_MODEL, ModelPool  # noqa: E402
+
+
+def rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def cold_session(vad, http_session, with_turn_detector):
+    resources = [
+        vad,
+        deepgram.STT(http_session=http_session),
+        deepgram.STT(http_session=http_session),
+        openai.LLM(model=LLM_MODEL),
+        cartesia.TTS(http_session=http_session),
+    ]
+    if with_turn_detector:
+        resources.append(turn_detector.EOUModel())
+    return resources
+
+
+def warm_session(pool, with_turn_detector):
+    resources = [pool.vad, pool.stt, pool.llm, pool.tts]
+    if with_turn_detector:
+        resources.append(pool.turn_detector)
+    return resources
+
+
+async def run(mode, sessions, with_turn_detector):
+    started_rss = rss_mb()
+    timings = []
+    kept = []
+    async with aiohttp.ClientSession() as http_session:
+        load_started = time.perf_counter()
+        if mode == "warm":
+            pool = ModelPool().load()
+        else:
+            vad = silero.VAD.load()
+        print(f"{mode}: prewarm took {(time.perf_counter() - load_started) * 1e3:.0f} ms (before any job)")
+        for _ in range(sessions):
+            session_started = time.perf_counter()
+            if mode == "cold":
+                # Keep them alive, like concurrent sessions would
+                kept.append(cold_session(vad, http_session, with_turn_detector))
+            else:
+                kept.append(warm_session(pool, with_turn_detector))
+            timings.append(time.perf_counter() - session_started)
+    return statistics.mean(timings) * 1e3, max(timings) * 1e3, rss_mb() - started_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--mode", choices=["cold", "warm", "both"], default="both")
+    parser.add_argument("--turn-detector", action="store_true")
+    args = parser.parse_args()
+
+    # Run warm first: cold mode's loads would otherwise pre-fault the warm numbers
+    modes = ["warm", "cold"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        mean_ms, worst_ms, rss_growth = asyncio.run(run(mode, args.sessions, args.turn_detector))
+        print(f"{mode}: {mean_ms:.1f} ms mean / {worst_ms:.1f} ms worst per session join, "
+              f"+{rss_growth:.0f} MB RSS over {args.sessions} sessions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Per-turn CPU cost of transcript capture: OpenAI debug-log parsing vs agent events.
+
+The log path formats the ``Request options`` record that ``openai._base_client``
+emits for every LLM request (which carries the full chat history) and parses
+it with a regex and ``ast.literal_eval``, as the removed
+``OpenAITranscriptHandler`` did. The event path receives the one committed
+message per turn, as the ``user_speech_committed``/``agent_speech_committed``
+handlers in ``agent.py`` do. Both feed the same ``TranscriptStore``.
+
+Usage (from the ``agent-server`` directory):
+    python benchmarks/bench_transcript_capture.py --turns 20 40 80
+"""
+from pathlib import Path
+
+import argparse
+import ast
+import asyncio
+import contextlib
+import io
+import logging
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcripts import TranscriptStore, message_text  # noqa: E402
+
+
+class LogParsingCapture(logging.Handler):
+    """The previous handler, minus its console output.
+
+    Its greedy regex also captures the closing brace of the outer options
+    dict, so ``literal_eval`` raises on this record shape; the work is still
+    done on every request, which is what is measured here.
+    """
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def emit(self, record):
+        log_msg = self.format(record)
+        if "Request options" in log_msg and "'messages':" in log_msg:
+            match = re.search(r"'json_data': (\{.*\})", log_msg)
+            if match:
+                try:
+                    data = ast.literal_eval(match.group(1))
+                except (SyntaxError, ValueError):
+                    return
+                for msg in data.get('messages', []):
+                    if msg['role'] == 'system':
+                        continue
+                    speaker = "Bot" if msg['role'] == 'assistant' else "User"
+                    self.store.add_transcript(speaker, msg['content'])
+
+
+def utterance(turn, role):
+    return f"Turn {turn} from the {role}: I finished the API integration and I'm moving on to the dashboard tests today."
+
+
+def request_options(history):
+    return {
+        'method': 'post',
+        'url': '/chat/completions',
+        'files': None,
+        'json_data': {
+            'messages': history,
+            'model': 'gpt-4o-mini',
+            'n': 1,
+            'stream': True,
+            'stream_options': {'include_usage': True},
+            'temperature': 0.8,
+        },
+    }
+
+
+def open_store():
+    store = TranscriptStore(flush_interval=3600, flush_size=10 ** 9)
+    store.set_file_path(str(Path(tempfile.mkdtemp()) / "bench.jsonl"))
+    return store
+
+
+async def run_log_path(turns):
+    store = open_store()
+    logger = logging.getLogger("bench.openai._base_client")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = LogParsingCapture(store)
+    logger.addHandler(handler)
+
+    history = [{'role': 'system', 'content': "You are a bot that tracks an employee's daily progress."}]
+    started = time.process_time()
+    for turn in range(turns):
+        history.append({'role': 'user', 'content': utterance(turn, 'user')})
+        logger.debug("Request options: %s", request_options(history))
+        history.append({'role': 'assistant', 'content': utterance(turn, 'assistant')})
+    elapsed = time.process_time() - started
+
+    logger.removeHandler(handler)
+    await store.aclose()
+    return elapsed
+
+
+async def run_event_path(turns):
+    store = open_store()
+    started = time.process_time()
+    for turn in range(turns):
+        store.add_transcript("User", message_text(utterance(turn, 'user')))
+        store.add_transcript("Bot", message_text(utterance(turn, 'assistant')))
+    elapsed = time.process_time() - started
+    await store.aclose()
+    return elapsed
+
+
+async def main(args):
+    print(f"{'turns':>6}{'log us/turn':>14}{'event us/turn':>16}{'ratio':>8}")
+    for turns in args.turns:
+        # The store prints every saved line; keep that out of both measurements
+        with contextlib.redirect_stdout(io.StringIO()):
+            log_seconds = await run_log_path(turns)
+            event_seconds = await run_event_path(turns)
+        log_us = log_seconds / turns * 1e6
+        event_us = event_seconds / turns * 1e6
+        print(f"{turns:>6}{log_us:>14.1f}{event_us:>16.1f}{log_us / max(event_us, 1e-9):>7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[20, 40, 80])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""Runs many simulated standup sessions concurrently in one process.
+
+Each session opens its own store through ``TranscriptStoreRegistry`` and
+writes user and bot turns through speech event handlers bound to that store,
+as ``agent.py`` does, from several tasks at once.
+Afterwards every transcript file is checked to contain exactly its own
+session's lines, and throughput plus the worst event loop stall are reported.
+
+Usage (from the ``agent-server`` directory):
+    python benchmarks/load_test_sessions.py --sessions 200 --turns 50
+"""
+from pathlib import Path
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transcripts import TranscriptStoreRegistry, read_transcript  # noqa: E402
+
+
+async def run_session(registry, index, turns, results):
+    room, identity = f"room_{index}", f"user_{index}"
+    store = registry.open(room, identity)
+
+    # Stand-ins for the agent's "user_speech_committed" and "agent_speech_committed" handlers
+    handlers = {
+        "User": lambda text: store.add_transcript("User", text),
+        "Bot": lambda text: store.add_transcript("Bot", text),
+    }
+
+    async def speak(speaker, step):
+        for turn in range(0, turns, step):
+            await asyncio.sleep(random.uniform(0, 0.005))
+            handlers[speaker](f"{room} {speaker} turn {turn}")
+
+    await asyncio.gather(speak("User", 1), speak("Bot", 2))
+    results[room] = store.file_path
+    await registry.close(room, identity)
+
+
+async def monitor_loop_lag(stop, interval=0.01):
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def main(args):
+    directory = tempfile.mkdtemp(prefix="transcripts_")
+    registry = TranscriptStoreRegistry(directory=directory, flush_interval=args.flush_interval)
+    results = {}
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(monitor_loop_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(run_session(registry, i, args.turns, results) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await lag_task
+
+    expected_lines = args.turns + (args.turns + 1) // 2
+    leaked = 0
+    missing = 0
+    for room, path in results.items():
+        entries = read_transcript(path)["conversations"]
+        leaked += sum(1 for entry in entries if not entry["text"].startswith(f"{room} "))
+        missing += expected_lines - len(entries)
+
+    total = args.sessions * expected_lines
+    print(f"sessions: {args.sessions}, utterances: {total}, elapsed: {elapsed:.2f}s "
+          f"({total / elapsed:.0f} utterances/s)")
+    print(f"worst event loop stall: {worst_lag * 1e3:.1f} ms")
+    print(f"lines in the wrong file: {leaked}, lines missing: {missing}, stores left open: {len(registry)}")
+    print(f"transcripts written to {directory}")
+    return 1 if leaked or missing or len(registry) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+
+import aiohttp
+
+logger = logging.getLogger("voice-agent")
+
+
+def session_from_metadata(metadata):
+    """Returns the transcript session ticket the client put in the participant's metadata, if any."""
+    try:
+        return json.loads(metadata or "{}").get("transcript_session")
+    except (ValueError, AttributeError):
+        return None
+
+
+class TranscriptUploader:
+    """Transcript sink that posts batches to the Django ingestion endpoint as the session runs.
+
+    Utterances are numbered in the order they were stored. A batch that fails
+    to send stays queued and goes out with the next one; the server ignores
+    sequence numbers it already has, so resending is safe. ``close`` sends the
+    final batch, which makes the server extract tasks from the transcript.
+    """
+
+    def __init__(self, url, token, session, room_name, timeout=10.0, final_attempts=3):
+        self.url = url
+        self.token = token
+        self.session = session
+        self.room_name = room_name
+        self.timeout = timeout
+        self.final_attempts = final_attempts
+        self._sequence = 0
+        self._unsent = []
+        self._http = None
+        self._rejected = False
+
+    @classmethod
+    def from_env(cls, session, room_name):
+        url = os.getenv("TRANSCRIPT_INGEST_URL")
+        token = os.getenv("TRANSCRIPT_INGEST_TOKEN")
+        if not session or not url or not token:
+            return None
+        return cls(url, token, session, room_name)
+
+    async def write(self, entries):
+        for entry in entries:
+            self._unsent.append({
+                "sequence": self._sequence,
+                # Store timestamps are local wall-clock time; send them with their offset
+                "timestamp": datetime.fromisoformat(entry["timestamp"]).astimezone().isoformat(),
+                "speaker": entry["speaker"],
+                "text": entry["text"],
+            })
+            self._sequence += 1
+        await self._send(final=False)
+
+    async def close(self):
+        try:
+            for attempt in range(self.final_attempts):
+                if await self._send(final=True):
+                    return
+                await asyncio.sleep(2 ** attempt)
+            logger.error(f"Giving up on transcript {self.session}; {len(self._unsent)} utterances were not uploaded")
+        finally:
+            if self._http is not None:
+                await self._http.close()
+
+    async def _send(self, final):
+        if self._rejected:
+            return True
+        if not self._unsent and not final:
+            return True
+
+        batch = list(self._unsent)
+        payload = {"session": self.session, "room": self.room_name, "utterances": batch, "final": final}
+        try:
+            if self._http is None:
+                self._http = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers={"Authorization": f"Bearer {self.token}"},
+                )
+            async with self._http.post(self.url, json=payload) as response:
+                if response.status == 409:
+                    # An earlier final batch got through before its response was lost
+                    self._unsent.clear()
+                    return True
+                if response.status >= 500 or response.status in (408, 429):
+                    logger.warning(f"Transcript upload got {response.status}, will retry")
+                    return False
+                if response.status >= 400:
+                    # Unknown session or bad token: retrying cannot help
+                    logger.error(f"Transcript upload rejected with {response.status}: {await response.text()}")
+                    self._rejected = True
+                    return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Transcript upload failed, will retry: {e}")
+            return False
+
+        del self._unsent[:len(batch)]
+        return True
@@ -0,0 +1,52 @@
+import aiohttp
+from livekit.plugins import cartesia, deepgram, openai, silero, turn_detector
+
+LLM_MODEL = "gpt-4o-mini"
+
+
+class ModelPool:
+    """Models and plugin clients shared by every session a worker process runs.
+
+    ``load`` runs in the prewarm hook, before a job is assigned: it loads the
+    VAD and builds the LLM client (which keeps its own connection pool). The
+    STT and TTS clients need an HTTP session on the worker's event loop and
+    the turn detector needs the job's inference executor, so those are built
+    by the first session and reused by every later one.
+    """
+
+    def __init__(self):
+        self.vad = None
+        self.llm = None
+        self._stt = None
+        self._tts = None
+        self._turn_detector = None
+        self._http_session = None
+
+    def load(self):
+        self.vad = silero.VAD.load()
+        self.llm = openai.LLM(model=LLM_MODEL)
+        return self
+
+    def _session(self):
+        # Owned by the pool rather than a job, so it outlives the session that created it
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
+
+    @property
+    def stt(self):
+        if self._stt is None:
+            self._stt = deepgram.STT(http_session=self._session())
+        return self._stt
+
+    @property
+    def tts(self):
+        if self._tts is None:
+            self._tts = cartesia.TTS(http_session=self._session())
+        return self._tts
+
+    @property
+    def turn_detector(self):
+        if self._turn_detector is None:
+            self._turn_detector = turn_detector.EOUModel()
+        return self._turn_detector
@@ -0,0 +1,101 @@
+import atexit
+import glob
+import logging
+import os
+import statistics
+
+from livekit.agents import metrics
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+logger = logging.getLogger("voice-agent")
+
+# Job processes write their samples here and the worker's main process serves the sum
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0)
+
+STT_DELAY = Histogram(
+    "agent_stt_transcription_delay_seconds",
+    "Time from the end of user speech to the final transcript",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TTFT = Histogram("agent_llm_ttft_seconds", "LLM time to first token", buckets=LATENCY_BUCKETS)
+TTS_TTFB = Histogram("agent_tts_ttfb_seconds", "TTS time to first audio byte", buckets=LATENCY_BUCKETS)
+EOU_DELAY = Histogram(
+    "agent_end_of_utterance_delay_seconds",
+    "Time from the end of user speech until the turn is committed (min/max_endpointing_delay)",
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter("agent_llm_tokens", "LLM tokens used", ["kind"])
+SESSIONS = Counter("agent_sessions", "Sessions started")
+ACTIVE_SESSIONS = Gauge("agent_active_sessions", "Sessions currently running", multiprocess_mode="livesum")
+
+if MULTIPROC_DIR:
+    # Drop this process's live gauge so a finished job stops counting towards the sum
+    atexit.register(multiprocess.mark_process_dead, os.getpid())
+
+
+def start_metrics_server(port):
+    """Serves /metrics on ``port``, merged across job processes when PROMETHEUS_MULTIPROC_DIR is set."""
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        # Samples left by a previous run would otherwise be added to this one
+        own_suffix = f"_{os.getpid()}.db"
+        for path in glob.glob(os.path.join(MULTIPROC_DIR, "*.db")):
+            if not path.endswith(own_suffix):
+                os.remove(path)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
+    logger.info(f"Serving metrics on :{port}/metrics")
+
+
+class SessionMetrics:
+    """Pipeline metrics of one session.
+
+    Every sample is exported to the process-wide histograms above and kept for
+    the session, whose latency percentiles and usage are logged when it ends.
+    """
+
+    def __init__(self, room_name):
+        self.room_name = room_name
+        self.usage = metrics.UsageCollector()
+        self._samples = {"stt_delay": [], "llm_ttft": [], "tts_ttfb": [], "eou_delay": []}
+
+    def start(self):
+        SESSIONS.inc()
+        ACTIVE_SESSIONS.inc()
+
+    def end(self):
+        ACTIVE_SESSIONS.dec()
+        self.log_summary()
+
+    def collect(self, agent_metrics):
+        self.usage.collect(agent_metrics)
+        if isinstance(agent_metrics, metrics.PipelineEOUMetrics):
+            self._observe("eou_delay", EOU_DELAY, agent_metrics.end_of_utterance_delay)
+            self._observe("stt_delay", STT_DELAY, agent_metrics.transcription_delay)
+        elif isinstance(agent_metrics, metrics.PipelineLLMMetrics):
+            self._observe("llm_ttft", LLM_TTFT, agent_metrics.ttft)
+            LLM_TOKENS.labels(kind="prompt").inc(agent_metrics.prompt_tokens)
+            LLM_TOKENS.labels(kind="completion").inc(agent_metrics.completion_tokens)
+        elif isinstance(agent_metrics, metrics.PipelineTTSMetrics):
+            self._observe("tts_ttfb", TTS_TTFB, agent_metrics.ttfb)
+
+    def _observe(self, name, histogram, value):
+        # Failed requests report -1
+        if value is None or value < 0:
+            return
+        histogram.observe(value)
+        self._samples[name].append(value)
+
+    def log_summary(self):
+        latencies = []
+        for name, values in self._samples.items():
+            if not values:
+                continue
+            p95 = statistics.quantiles(values, n=20, method="inclusive")[-1] if len(values) > 1 else values[0]
+            latencies.append(f"{name} p50={statistics.median(values):.3f}s p95={p95:.3f}s n={len(values)}")
+        logger.info(f"Session {self.room_name} usage: {self.usage.get_summary()}")
+        if latencies:
+            logger.info(f"Session {self.room_name} latency: {'; '.join(latencies)}")
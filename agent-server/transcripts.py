@@ -0,0 +1,224 @@
+import asyncio
+import json
+import os
+import re
+import sys
+from collections import Counter, deque
+from datetime import datetime
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+EDGE_PUNCTUATION = " .,!?;:'\"-…"
+
+
+def normalize_utterance(text):
+    """Canonical form used for duplicate detection: case, spacing and edge punctuation ignored."""
+    return WHITESPACE_PATTERN.sub(" ", text.lower()).strip(EDGE_PUNCTUATION)
+
+
+class TranscriptStore:
+    """Append-only JSONL transcript writer.
+
+    Each utterance is one JSON line. ``add_transcript`` only queues the entry;
+    a background task appends queued entries to the file ``flush_interval``
+    seconds after the first one was queued, or as soon as ``flush_size``
+    entries are waiting, with the file I/O done off the event loop. While
+    nothing is queued the task sleeps without waking up. The file is fsynced
+    once, when the session is closed. Every flushed batch is also handed to
+    each of ``sinks`` (objects with async ``write(entries)`` and ``close()``).
+
+    Duplicates are keyed on ``(speaker, normalize_utterance(text))`` in a hash
+    set, so the check is constant time. By default an utterance is only ever
+    stored once. With ``dedup_window=N`` an utterance is only suppressed if
+    it matches one of the last ``N`` stored ones, so a "Yeah." repeated later
+    in the call is kept.
+    """
+
+    def __init__(self, file_path=None, flush_interval=1.0, flush_size=20, dedup_window=None, sinks=None):
+        self.file_path = file_path
+        self.sinks = list(sinks or [])
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.dedup_window = dedup_window
+        self.initialized = False
+        self._seen = set() if dedup_window is None else Counter()
+        self._recent = deque()
+        self._pending = []
+        self._file = None
+        self._queued = None
+        self._full = None
+        self._writer_task = None
+        self._closing = False
+        self._loop = None
+
+    def set_file_path(self, file_path):
+        self.file_path = file_path
+        # Create the file and start the background writer on the running loop
+        self._file = open(self.file_path, "a", encoding="utf-8")
+        self._loop = asyncio.get_running_loop()
+        self._queued = asyncio.Event()
+        self._full = asyncio.Event()
+        self._writer_task = self._loop.create_task(self._writer())
+        print(f"Initialized transcript file: {file_path}")
+        self.initialized = True
+
+    def add_transcript(self, speaker, text):
+        if not self.initialized or not text.strip():
+            return
+
+        # Check if this message is already saved (to avoid duplicates)
+        key = (speaker, normalize_utterance(text))
+        if key in self._seen:
+            return
+        self._remember(key)
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "speaker": speaker,
+            "text": text
+        }
+
+        self._pending.append(entry)
+        if len(self._pending) == 1:
+            self._loop.call_soon_threadsafe(self._queued.set)
+        if len(self._pending) >= self.flush_size:
+            self._loop.call_soon_threadsafe(self._full.set)
+        print(f"Saved transcript: {speaker}: {text}")
+
+    def _remember(self, key):
+        if self.dedup_window is None:
+            self._seen.add(key)
+            return
+        # Rolling window: the Counter holds exactly the keys of the last N entries
+        self._seen[key] += 1
+        self._recent.append(key)
+        if len(self._recent) > self.dedup_window:
+            expired = self._recent.popleft()
+            self._seen[expired] -= 1
+            if not self._seen[expired]:
+                del self._seen[expired]
+
+    async def _writer(self):
+        while not self._closing:
+            await self._queued.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._queued.clear()
+            self._full.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Appends all queued entries to the file without blocking the event loop."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        lines = "".join(json.dumps(entry) + "\n" for entry in batch)
+        try:
+            await asyncio.to_thread(self._append, lines)
+        except Exception as e:
+            print(f"Error saving transcript: {e}")
+        for sink in self.sinks:
+            try:
+                await sink.write(batch)
+            except Exception as e:
+                print(f"Error sending transcript to {type(sink).__name__}: {e}")
+
+    def _append(self, lines):
+        self._file.write(lines)
+        self._file.flush()
+
+    async def aclose(self):
+        """Lets the writer finish its batch and exit, writes what is left and fsyncs the file.
+
+        The writer is not cancelled: a batch it has taken off the queue would
+        never reach the sinks, and the file could be closed under its thread.
+        """
+        if not self.initialized:
+            return
+        self.initialized = False
+        self._closing = True
+        # Wake the writer wherever it waits; it flushes once more and leaves the loop
+        self._queued.set()
+        self._full.set()
+        await self._writer_task
+        await self.flush()
+        await asyncio.to_thread(self._sync_and_close)
+        for sink in self.sinks:
+            try:
+                await sink.close()
+            except Exception as e:
+                print(f"Error closing {type(sink).__name__}: {e}")
+
+    def _sync_and_close(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+class TranscriptStoreRegistry:
+    """Per-process registry of session transcript stores keyed by (room, participant)."""
+
+    def __init__(self, directory="transcriptions", **store_options):
+        self.directory = directory
+        self.store_options = store_options
+        self._stores = {}
+
+    def __len__(self):
+        return len(self._stores)
+
+    def get(self, room_name, participant_identity):
+        return self._stores.get((room_name, participant_identity))
+
+    def open(self, room_name, participant_identity, sinks=None):
+        key = (room_name, participant_identity)
+        if key in self._stores:
+            raise ValueError(f"Transcript for {participant_identity} in {room_name} is already open")
+
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.abspath(os.path.join(
+            self.directory, f"transcript_{participant_identity}_{timestamp}_{room_name}.jsonl"
+        ))
+
+        store = TranscriptStore(sinks=sinks, **self.store_options)
+        store.set_file_path(file_path)
+        self._stores[key] = store
+        return store
+
+    async def close(self, room_name, participant_identity):
+        store = self._stores.pop((room_name, participant_identity), None)
+        if store is not None:
+            await store.aclose()
+
+
+def message_text(content):
+    """Flattens chat message content (a string, or a list mixing text and images) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part for part in content if isinstance(part, str))
+    return ""
+
+
+def read_transcript(file_path):
+    """Rebuilds the ``{"conversations": [...]}`` document from a JSONL transcript."""
+    conversations = []
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                conversations.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A session that crashed mid-write can leave a partial last line
+                continue
+    return {"conversations": conversations}
+
+
+if __name__ == "__main__":
+    # Usage: python transcripts.py transcriptions/transcript_<identity>_<timestamp>.jsonl
+    json.dump(read_transcript(sys.argv[1]), sys.stdout, indent=2)
+    print()
@@ -34,7 +34,7 @@ const SelectRole = () => {
         }
 
         try {
-            await axios.post(
+            const response = await axios.post(
                 `${API_BASE_URL}/select-role/`,
                 { job_role: jobRole, specialization: specialization },
                 {
@@ -44,6 +44,9 @@ const SelectRole = () => {
                     },
                 }
             );
+            // The role is signed into the tokens, so swap in the reissued pair
+            localStorage.setItem("access_token", response.data.tokens.access);
+            localStorage.setItem("refresh_token", response.data.tokens.refresh);
             navigate("/dashboard"); // Redirect to dashboard on success
         } catch (err) {
             console.error("Error updating role:", err);
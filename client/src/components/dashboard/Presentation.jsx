@@ -2,6 +2,7 @@ import React, { useEffect, useState } from "react";
 import axios from "axios";
 import { Card, Button, Row, Col, Form, Spinner, Container, Modal } from "react-bootstrap";
 import { FaEdit, FaTrash, FaPlay, FaPlus } from 'react-icons/fa';
+import { refreshAccessToken } from "../../interceptor/axios";
 import "./Presentation.css";
 
 const Presentation = () => {
@@ -14,6 +15,7 @@ const Presentation = () => {
     const [showEditModal, setShowEditModal] = useState(false);
     const [editingPresentation, setEditingPresentation] = useState(null);
     const [newTitle, setNewTitle] = useState("");
+    const [nextPage, setNextPage] = useState(null);
 
     const API_BASE_URL = "http://localhost:8000/api";
 
@@ -21,13 +23,15 @@ const Presentation = () => {
         fetchPresentations();
     }, []);
 
-    const fetchPresentations = async () => {
+    const fetchPresentations = async (pageUrl = null) => {
         try {
             const token = localStorage.getItem("access_token");
-            const { data } = await axios.get(`${API_BASE_URL}/fetch-ppt/`, {
+            const { data } = await axios.get(pageUrl || `${API_BASE_URL}/fetch-ppt/`, {
                 headers: { Authorization: `Bearer ${token}` },
             });
-            setPresentations(data);
+            // The listing is cursor paginated; follow-up pages are appended
+            setPresentations((prev) => (pageUrl ? [...prev, ...data.results] : data.results));
+            setNextPage(data.next);
         } catch (error) {
             console.error("Error fetching presentations:", error);
         } finally {
@@ -52,16 +56,29 @@ const Presentation = () => {
         setTalkingPoints([]);
 
         try {
-            const token = localStorage.getItem("access_token");
-            const { data } = await axios.post(
-                `${API_BASE_URL}/create-ppt/`,
-                { prompt: prompt },
-                { headers: { "Content-Type": "application/json", Authorization: `Bearer ${token}` } }
-            );
+            // fetch is used so slides can be read as they stream in, which bypasses the
+            // axios interceptor, so an expired access token is refreshed here instead
+            const requestStream = (token) => fetch(`${API_BASE_URL}/create-ppt/stream/`, {
+                method: "POST",
+                headers: { "Content-Type": "application/json", Authorization: `Bearer ${token}` },
+                body: JSON.stringify({ prompt: prompt }),
+            });
+            let response = await requestStream(localStorage.getItem("access_token"));
+            if (response.status === 401) {
+                const newToken = await refreshAccessToken();
+                if (newToken) {
+                    response = await requestStream(newToken);
+                }
+            }
 
-            console.log(data);
+            if (!response.ok || !response.body) {
+                throw new Error(`Streaming request failed with status ${response.status}`);
+            }
 
-            if (data.message === "Presentation created successfully") {
+            const result = await readSlideStream(response.body);
+
+            if (result.event === "done") {
+                setTalkingPoints(result.data.talking_points || []);
                 // Fetch all presentations again to get the updated list
                 await fetchPresentations();
                 setPrompt("");
@@ -76,14 +93,60 @@ const Presentation = () => {
         }
     };
 
-    const openPresentation = (presentation) => {
+    const readSlideStream = async (body) => {
+        // Parse server-sent events and render each slide as soon as it arrives
+        const reader = body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+                return { event: "error", data: {} };
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            let boundary;
+            while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                const event = frame.match(/^event: (.*)$/m)?.[1];
+                const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || "{}");
+
+                if (event === "slide") {
+                    setSlides((prev) => [...prev, data.slide]);
+                } else if (event === "done" || event === "error") {
+                    return { event, data };
+                }
+            }
+        }
+    };
+
+    const openPresentation = async (summary) => {
+        // The listing only carries summaries, so load the full deck first.
+        // Open the window before awaiting so popup blockers allow it.
+        const presentationWindow = window.open("", "_blank");
+        let presentation;
+        try {
+            const token = localStorage.getItem("access_token");
+            const response = await axios.get(`${API_BASE_URL}/presentations/${summary.id}/`, {
+                headers: { Authorization: `Bearer ${token}` },
+            });
+            presentation = response.data;
+        } catch (error) {
+            console.error("Error loading presentation:", error);
+        }
+
         if (!presentation || typeof presentation !== "object") {
+            presentationWindow.close();
             alert("Invalid presentation data!");
             return;
         }
 
         const { title, data } = presentation;
         if (!data || !data.slides || !Array.isArray(data.slides)) {
+            presentationWindow.close();
             alert("Invalid slide data!");
             return;
         }
@@ -156,7 +219,6 @@ const Presentation = () => {
             </html>
         `;
 
-        const presentationWindow = window.open("", "_blank");
         presentationWindow.document.write(presentationHTML);
         presentationWindow.document.close();
     };
@@ -182,7 +244,7 @@ const Presentation = () => {
             );
 
             setPresentations((prev) =>
-                prev.map((p) => (p.id === editingPresentation.id ? { ...p, ...response.data } : p))
+                prev.map((p) => (p.id === editingPresentation.id ? { ...p, title: response.data.title } : p))
             );
             setShowEditModal(false);
         } catch (error) {
@@ -245,6 +307,40 @@ const Presentation = () => {
                 </Card>
             </div>
 
+            {(loading || slides.length > 0) && (
+                <div className="live-preview-section mb-5">
+                    <h3 className="text-muted mb-4">Live Preview</h3>
+                    <Row xs={1} md={2} lg={3} className="g-4">
+                        {slides.map((slide, index) => (
+                            <Col key={index}>
+                                <Card className="h-100 shadow-sm">
+                                    <Card.Body>
+                                        <Card.Title className="mb-3">{slide.title || "Untitled Slide"}</Card.Title>
+                                        <ul className="text-muted mb-0">
+                                            {(slide.content || []).map((point, pointIndex) => (
+                                                <li key={pointIndex}>{point}</li>
+                                            ))}
+                                        </ul>
+                                    </Card.Body>
+                                </Card>
+                            </Col>
+                        ))}
+                    </Row>
+                    {talkingPoints.length > 0 && (
+                        <Card className="shadow-sm mt-4">
+                            <Card.Body>
+                                <Card.Title className="mb-3">Talking Points</Card.Title>
+                                <ul className="text-muted mb-0">
+                                    {talkingPoints.map((point, index) => (
+                                        <li key={index}>{point}</li>
+                                    ))}
+                                </ul>
+                            </Card.Body>
+                        </Card>
+                    )}
+                </div>
+            )}
+
             <div className="presentations-section">
                 <h3 className="text-muted mb-4">Your Presentations</h3>
                 {fetching ? (
@@ -307,6 +403,13 @@ const Presentation = () => {
                         ))}
                     </Row>
                 )}
+                {nextPage && (
+                    <div className="text-center mt-4">
+                        <Button variant="outline-primary" onClick={() => fetchPresentations(nextPage)}>
+                            Load more
+                        </Button>
+                    </div>
+                )}
             </div>
 
             <Modal show={showEditModal} onHide={() => setShowEditModal(false)}>
@@ -11,8 +11,15 @@ const TaskTracker = () => {
     const [processing, setProcessing] = useState(false);
     const [tasksUpdated, setTasksUpdated] = useState(false);
 
-    const startInterview = () => {
-        window.location.href = "http://localhost:3001";   // Redirect to the interview page
+    const startInterview = async () => {
+        try {
+            // The agent streams the call into this transcript and processes it when the call ends
+            const response = await axios.post("/api/transcript/sessions/");
+            window.location.href = `http://localhost:3001?session=${response.data.session}`;   // Redirect to the interview page
+        } catch (error) {
+            console.error("Error starting interview:", error);
+            setError("Failed to start interview.");
+        }
     };
 
     const fetchTranscript = async () => {
@@ -25,6 +32,8 @@ const TaskTracker = () => {
             if (response.data && response.data.conversations) {
                 console.log("Conversations:", response.data.conversations);
                 setTranscript(response.data.conversations);
+                // Transcripts recorded by the agent are analyzed on the server when the call ends
+                setTasksUpdated(response.data.status === "PROCESSED");
             } else {
                 console.error("Unexpected API response structure:", response.data);
                 setError("Invalid response format from API.");
@@ -126,7 +135,7 @@ const TaskTracker = () => {
                                 variant="success"
                                 className="mt-2"
                                 onClick={analyzeTranscript}
-                                disabled={processing}
+                                disabled={processing || tasksUpdated}
                             >
                                 {processing ? <Spinner animation="border" size="sm" /> : "Analyze Transcript"}
                             </Button>
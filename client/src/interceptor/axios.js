@@ -2,42 +2,56 @@ import axios from "axios";
 
 let refresh = false;
 
+// Exchanges the stored refresh token for a new access token; resolves to null if there is none
+export const refreshAccessToken = async () => {
+  const refreshToken = localStorage.getItem('refresh_token');
+  if (!refreshToken) {
+    console.error('No refresh token found');
+    return null;
+  }
+
+  // Request a new access token using the refresh token
+  const response = await axios.post(
+    'http://localhost:8000/token/refresh/',
+    { refresh: refreshToken },
+    {
+      headers: { 'Content-Type': 'application/json' },
+      withCredentials: true // Ensure credentials (cookies) are included if needed
+    }
+  );
+
+  if (response.status !== 200) {
+    return null;
+  }
+
+  const newAccessToken = response.data.access;
+  localStorage.setItem("access_token", newAccessToken);
+  // Refresh tokens are rotated, so the old one stops working after this call
+  if (response.data.refresh) {
+    localStorage.setItem("refresh_token", response.data.refresh);
+  }
+
+  // Update the default axios headers
+  axios.defaults.headers.common["Authorization"] = `Bearer ${newAccessToken}`;
+  return newAccessToken;
+};
+
 axios.interceptors.response.use(
   (resp) => resp, // Pass through the response if no error
   async (error) => {
     if (error.response.status === 401 && !refresh) {
       refresh = true;
-      
-      const refreshToken = localStorage.getItem('refresh_token');
-      if (!refreshToken) {
-        console.error('No refresh token found');
-        refresh=false;
-        return Promise.reject(error);
-      }
-      
+
       try {
-        // Request a new access token using the refresh token
-        const response = await axios.post(
-          'http://localhost:8000/token/refresh/',
-          { refresh: refreshToken },
-          { 
-            headers: { 'Content-Type': 'application/json' },
-            withCredentials: true // Ensure credentials (cookies) are included if needed
-          }
-        );
-        
-        if (response.status === 200) {
-          const newAccessToken = response.data.access;
-          localStorage.setItem("access_token", newAccessToken);
-          
-          // Update the default axios headers
-          axios.defaults.headers.common["Authorization"] = `Bearer ${newAccessToken}`;
-          
-          // Retry the failed request with the new token
-          error.config.headers["Authorization"] = `Bearer ${newAccessToken}`;
-          
-          return axios(error.config);
+        const newAccessToken = await refreshAccessToken();
+        if (!newAccessToken) {
+          return Promise.reject(error);
         }
+
+        // Retry the failed request with the new token
+        error.config.headers["Authorization"] = `Bearer ${newAccessToken}`;
+
+        return axios(error.config);
       } catch (err) {
         console.error('Refresh token request failed:', err);
         return Promise.reject(error);
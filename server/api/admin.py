@@ -1,7 +1,10 @@
 from django.contrib import admin
-from .models import Presentation, Task, Project
+from .models import Presentation, PresentationJob, Task, Project, Transcript, Utterance
 
 # Register your models here.
 admin.site.register(Presentation)
+admin.site.register(PresentationJob)
 admin.site.register(Task)
 admin.site.register(Project)
+admin.site.register(Transcript)
+admin.site.register(Utterance)
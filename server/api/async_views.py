@@ -0,0 +1,61 @@
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose handlers are coroutines, dispatched on the event loop.
+
+    Django serves it as an async view, so under ASGI a request only leaves the
+    loop for the ORM calls it awaits. Authenticators with an ``aauthenticate``
+    coroutine (``TokenClaimsAuthentication``) run inline, others in a thread.
+    Permission and throttle checks run inline and must not query the database.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.aauthenticate(request)
+            self.initial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if hasattr(response, '__await__'):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aauthenticate(self, request):
+        """Resolves ``request.user`` up front so ``initial`` never authenticates synchronously."""
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth = await authenticator.aauthenticate(request)
+                else:
+                    user_auth = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth
+                return
+        request._not_authenticated()
+
+
+async def avalidate(serializer):
+    """Runs ``is_valid`` in a thread; related-field and uniqueness validators query the database."""
+    return await sync_to_async(serializer.is_valid)()
@@ -0,0 +1,179 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+import hashlib
+import json
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('api')
+
+DEFAULT_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'TTL': 60 * 60 * 24,
+    'LOCAL_MAX_ENTRIES': 256,
+    'SHARED_ALIAS': 'llm',
+}
+
+
+def completion_cache_key(model, messages, **params):
+    """Content-addressed key for a completion: sha256 over model, prompt and params."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+    return "llm:" + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CompletionCache:
+    """Base class for completion cache tiers. Subclasses implement ``_get``/``_set``."""
+
+    name = 'base'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._set(key, value)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value):
+        raise NotImplementedError
+
+
+class LRUCompletionCache(CompletionCache):
+    """In-process tier with a size bound (least recently used first) and a TTL."""
+
+    name = 'local'
+
+    def __init__(self, max_entries=256, ttl=None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCompletionCache(CompletionCache):
+    """Shared tier backed by a Django cache alias (file or database backend).
+
+    Size and TTL eviction are delegated to the backend's ``TIMEOUT`` and
+    ``MAX_ENTRIES`` options, so every worker process sees the same entries.
+    """
+
+    name = 'shared'
+
+    def __init__(self, alias='llm', ttl=None):
+        super().__init__()
+        self.alias = alias
+        self.ttl = ttl
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def _get(self, key):
+        return self.backend.get(key)
+
+    def _set(self, key, value):
+        self.backend.set(key, value, timeout=self.ttl)
+
+
+class TieredCompletionCache(CompletionCache):
+    """Looks tiers up in order and back-fills faster tiers on a slower-tier hit."""
+
+    name = 'tiered'
+
+    def __init__(self, tiers):
+        super().__init__()
+        self.tiers = tiers
+
+    def _get(self, key):
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for upper in self.tiers[:index]:
+                    upper.set(key, value)
+                return value
+        return None
+
+    def _set(self, key, value):
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def stats(self):
+        content = super().stats()
+        content["tiers"] = {tier.name: tier.stats() for tier in self.tiers}
+        return content
+
+
+_completion_cache = None
+
+
+def get_completion_cache():
+    """Returns the configured completion cache, or ``None`` when caching is disabled."""
+    global _completion_cache
+    config = {**DEFAULT_CACHE_SETTINGS, **getattr(settings, 'LLM_COMPLETION_CACHE', {})}
+    if not config['ENABLED']:
+        return None
+    if _completion_cache is None:
+        tiers = [LRUCompletionCache(max_entries=config['LOCAL_MAX_ENTRIES'], ttl=config['TTL'])]
+        if config['SHARED_ALIAS']:
+            tiers.append(DjangoCompletionCache(alias=config['SHARED_ALIAS'], ttl=config['TTL']))
+        _completion_cache = TieredCompletionCache(tiers)
+    return _completion_cache
+
+
+@receiver(setting_changed)
+def reset_completion_cache(setting=None, **kwargs):
+    global _completion_cache
+    if setting in ('LLM_COMPLETION_CACHE', 'CACHES'):
+        _completion_cache = None
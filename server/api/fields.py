@@ -0,0 +1,25 @@
+from django.db import models
+
+from .schema import PresentationSchemaError, decode_presentation, encode_presentation, is_encoded
+
+
+class PresentationDataField(models.JSONField):
+    """JSONField that stores decks in the validated, compact schema format.
+
+    Values are encoded on the way into the database and decoded on the way
+    out, so model code keeps working with the plain presentation dict.
+    Values that do not match the schema, such as rows from before it, are
+    stored unchanged and read back as-is, so they can still be saved.
+    """
+
+    def get_prep_value(self, value):
+        if value is not None and not is_encoded(value):
+            try:
+                value = encode_presentation(value)
+            except PresentationSchemaError:
+                pass
+        return super().get_prep_value(value)
+
+    def from_db_value(self, value, expression, connection):
+        value = super().from_db_value(value, expression, connection)
+        return decode_presentation(value)
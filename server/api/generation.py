@@ -0,0 +1,138 @@
+from .cache import completion_cache_key, get_completion_cache
+from .helpers import extract_json_from_response
+from .llm import get_gateway
+from .schema import PresentationSchemaError, validate_presentation
+
+import json
+import logging
+
+
+PRESENTATION_MODEL = "llama3-8b-8192"
+
+logger = logging.getLogger('api')
+
+
+def complete_chat(messages, model=PRESENTATION_MODEL, validate=None, **params):
+    """Returns the completion text for ``messages``, served from the completion cache when possible.
+
+    A fresh completion is only cached once ``validate(response)`` returns
+    without raising, so a reply the caller cannot use is not replayed to
+    every retry of the same prompt.
+    """
+    cache = get_completion_cache()
+    key = completion_cache_key(model, messages, **params)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Completion cache hit for {key}")
+            return cached
+
+    response = get_gateway().complete(messages, model, **params)
+
+    if cache is not None and response and is_usable_completion(response, validate):
+        cache.set(key, response)
+    return response
+
+
+def is_usable_completion(response, validate):
+    """Whether ``response`` passes ``validate`` and may be cached."""
+    if validate is None:
+        return True
+    try:
+        validate(response)
+    except Exception as e:
+        logger.warning(f"Not caching unusable completion: {e}")
+        return False
+    return True
+
+
+def build_presentation_prompt(job_role, specialization, prompt):
+    """Renders the slide generation template for the given user profile and prompt."""
+    return f"""
+            I'm an {job_role} with a {specialization} specialization who is going to give you some data/content on an idea that I have.
+            Your job is to generate sensible content pertaining to the idea and generate slides for it.
+            Give approximately 10-12 slides with each slide having around 3-5 bullet points.
+            The slides should be in the order they should be presented.
+            Also highlight talking points that seem important to the user.
+            GIVE THE RESPONSE IN THE FORMAT OF A JSON OBJECT. The JSON object should be formatted as follows:
+            {{
+                "title": "Presentation Title",
+                "slides": [
+                    {{
+                        "title": "Slide 1 Title",
+                        "content": ["Bullet point 1", "Bullet point 2", "Bullet point 3", ...]
+                    }},
+                    ...
+                ],
+                "talking_points": ["Talking point 1", "Talking point 2", ...]
+            }}
+
+            Generate content based on this:
+            {prompt}
+            """
+
+
+def parse_presentation_response(response):
+    """Parses the raw LLM completion into the presentation dict.
+
+    Raises ``ValueError`` when the completion holds no JSON object and
+    ``PresentationSchemaError`` when the object is not a deck.
+    """
+    data = extract_json_from_response(response)
+    validate_presentation(data)
+    return data
+
+
+def generate_presentation_data(job_role, specialization, prompt):
+    """Calls the LLM for a deck and returns the parsed presentation dict.
+
+    Raises ``ValueError``/``json.JSONDecodeError`` when the completion does not
+    contain a usable JSON object, and ``PresentationSchemaError`` when that
+    object does not match the deck schema.
+    """
+    template = build_presentation_prompt(job_role, specialization, prompt)
+
+    response = complete_chat(
+        [{"role": "user", "content": template}],
+        model=PRESENTATION_MODEL,
+        validate=parse_presentation_response,
+    )
+    logger.info("Received response from API")
+
+    try:
+        return parse_presentation_response(response)
+    except PresentationSchemaError as e:
+        logger.error(f"Presentation does not match the deck schema: {e} | Response: {response}")
+        raise
+    except (json.JSONDecodeError, ValueError):
+        logger.error(f"Invalid JSON in API response: {response}")
+        raise
+
+
+def stream_presentation_completion(job_role, specialization, prompt):
+    """Streams the deck completion from the LLM, yielding text deltas as they arrive.
+
+    A cached completion is replayed as a single delta; a fresh one is stored
+    in the completion cache once the stream has finished, if it holds a
+    valid deck.
+    """
+    template = build_presentation_prompt(job_role, specialization, prompt)
+    messages = [{"role": "user", "content": template}]
+
+    cache = get_completion_cache()
+    key = completion_cache_key(PRESENTATION_MODEL, messages)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Completion cache hit for {key}")
+            yield cached
+            return
+
+    parts = []
+    for delta in get_gateway().stream(messages, PRESENTATION_MODEL):
+        parts.append(delta)
+        yield delta
+
+    response = "".join(parts)
+    if cache is not None and response and is_usable_completion(response, parse_presentation_response):
+        cache.set(key, response)
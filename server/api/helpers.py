@@ -1,28 +1,162 @@
 import json
-import re
 import logging
+import re
 
-def extract_json_from_response(response_text):
-    """Extract JSON from response text that might contain markdown formatting"""
-    # Try to find JSON content between markdown code blocks
-    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-    
-    if json_match:
-        json_str = json_match.group(1)
-    else:
-        # If no markdown blocks found, try to find JSON directly
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
+
+logger = logging.getLogger('api')
+
+OPENERS = {'{': '}', '[': ']'}
+SMART_DOUBLE_QUOTES = '“”„‟'
+
+OPEN_PATTERN = re.compile(r'[{\[]')
+STRUCTURE_PATTERN = re.compile(r'[{}\[\]"“”„‟]')
+STRING_END_PATTERN = re.compile(r'["\\]')
+SMART_STRING_END_PATTERN = re.compile(r'[“”„‟\\]')
+JSON_START_PATTERN = re.compile(r'\s*[{}\[\]"“”„‟]')
+
+
+def iter_json_candidates(text):
+    """Yields every balanced top-level ``{...}``/``[...]`` span in ``text``.
+
+    Single forward pass: brackets inside JSON strings (including escaped and
+    smart-quoted ones) are ignored, and scanning resumes after the end of
+    each span, so each character is looked at once. Plain text between
+    structural characters is skipped by the compiled patterns, and
+    surrounding prose and markdown fences never open a bracket.
+
+    A bracket that is never closed and not followed by JSON (``Use { to
+    open``) is treated as prose: the spans that closed directly inside it
+    are yielded once the text runs out, with no second scan.
+    """
+    # Open brackets as (closer, start, spans that closed directly inside)
+    stack = []
+    pos = 0
+    while True:
+        if not stack:
+            match = OPEN_PATTERN.search(text, pos)
+            if match is None:
+                return
+            stack.append((OPENERS[match.group()], match.start(), []))
+            pos = match.end()
+            continue
+
+        match = STRUCTURE_PATTERN.search(text, pos)
+        if match is None:
+            # The text ran out with brackets open; everything after an opener is inside it
+            for _, start, inner in stack:
+                if JSON_START_PATTERN.match(text, start + 1):
+                    # Truncated JSON: its inner spans are fragments, not answers
+                    return
+                for inner_start, inner_end in inner:
+                    yield text[inner_start:inner_end]
+            return
+        c = match.group()
+        pos = match.end()
+        if c == '"' or c in SMART_DOUBLE_QUOTES:
+            pos = _skip_string(text, pos, c != '"')
+        elif c in OPENERS:
+            stack.append((OPENERS[c], match.start(), []))
+        elif c != stack[-1][0]:
+            # Mismatched bracket: abandon this span and keep scanning
+            stack = []
         else:
-            raise ValueError("No JSON content found in response")
-    
-    # Clean up any remaining markdown or formatting
-    json_str = json_str.strip()
-    
-    try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON: {e}")
-        logger.debug(f"JSON string attempted to parse: {json_str}")
-        raise
\ No newline at end of file
+            _, start, _ = stack.pop()
+            if stack:
+                stack[-1][2].append((start, pos))
+            else:
+                yield text[start:pos]
+
+
+def _skip_string(text, pos, smart):
+    """Returns the index just past the string starting at ``pos``."""
+    pattern = SMART_STRING_END_PATTERN if smart else STRING_END_PATTERN
+    while True:
+        match = pattern.search(text, pos)
+        if match is None:
+            return len(text)
+        if match.group() == '\\':
+            pos = match.end() + 1
+            continue
+        return match.end()
+
+
+def repair_json(candidate):
+    """Fixes common LLM JSON defects: smart-quoted strings and trailing commas."""
+    out = []
+    in_string = False
+    smart = False
+    escape = False
+    length = len(candidate)
+    i = 0
+    while i < length:
+        c = candidate[i]
+        if in_string:
+            if escape:
+                escape = False
+                out.append(c)
+            elif c == '\\':
+                escape = True
+                out.append(c)
+            elif smart and c in SMART_DOUBLE_QUOTES:
+                in_string = False
+                out.append('"')
+            elif c == '"':
+                if smart:
+                    out.append('\\"')
+                else:
+                    in_string = False
+                    out.append(c)
+            else:
+                out.append(c)
+        elif c == '"' or c in SMART_DOUBLE_QUOTES:
+            in_string = True
+            smart = c != '"'
+            out.append('"')
+        elif c == ',':
+            j = i + 1
+            while j < length and candidate[j].isspace():
+                j += 1
+            if j >= length or candidate[j] not in '}]':
+                out.append(c)
+        else:
+            out.append(c)
+        i += 1
+    return ''.join(out)
+
+
+def scan_json(text, types=(dict, list)):
+    """Returns the first JSON value of one of ``types`` found in ``text``.
+
+    Each balanced candidate is parsed as-is first and through ``repair_json``
+    second. Raises ``ValueError`` when nothing usable is found.
+    """
+    stripped = text.strip()
+    if stripped[:1] in OPENERS:
+        # Fast path for responses that are nothing but JSON
+        try:
+            value = json.loads(stripped, strict=False)
+            if isinstance(value, types):
+                return value
+        except json.JSONDecodeError:
+            pass
+
+    for candidate in iter_json_candidates(text):
+        for attempt in (candidate, None):
+            if attempt is None:
+                attempt = repair_json(candidate)
+                if attempt == candidate:
+                    break
+            try:
+                value = json.loads(attempt, strict=False)
+            except json.JSONDecodeError as e:
+                logger.debug(f"Failed to parse JSON candidate: {e}")
+                continue
+            if isinstance(value, types):
+                return value
+            break
+    raise ValueError("No JSON content found in response")
+
+
+def extract_json_from_response(response_text):
+    """Extract the first JSON object from response text that might contain markdown formatting"""
+    return scan_json(response_text, types=dict)
@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .generation import generate_presentation_data
+from .models import Presentation, PresentationJob, Transcript
+from .transcripts import (
+    ANALYSIS_CLAIM_TIMEOUT,
+    advance_transcript_analysis,
+    apply_transcript_tasks,
+    claim_transcript_analysis,
+    has_full_window,
+)
+
+import logging
+
+
+logger = logging.getLogger('api')
+
+DEFAULT_PRESENTATION_JOB_TIMEOUT = 30 * 60
+
+# Each workload gets its own pool, so a burst of decks does not hold up standup processing
+POOLS = {
+    'presentations': ('PRESENTATION_JOB_WORKERS', 4, 'ppt-job'),
+    'transcripts': ('TRANSCRIPT_JOB_WORKERS', 2, 'transcript-job'),
+}
+
+_executors = {}
+
+
+def get_executor(pool):
+    """Returns the process-wide pool that runs one kind of background job."""
+    executor = _executors.get(pool)
+    if executor is None:
+        setting, default_workers, thread_name_prefix = POOLS[pool]
+        executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, setting, default_workers),
+            thread_name_prefix=thread_name_prefix,
+        )
+        _executors[pool] = executor
+    return executor
+
+
+def enqueue_presentation_job(job):
+    """Schedules a job for background generation once the row is committed.
+
+    With ``PRESENTATION_JOBS_EAGER`` enabled (tests) the job runs inline.
+    """
+    if getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+        run_presentation_job(job.id)
+        return
+    transaction.on_commit(lambda: get_executor('presentations').submit(run_presentation_job, job.id))
+
+
+def run_presentation_job(job_id):
+    """Generates the deck for a job and records the outcome on the job row."""
+    try:
+        job = PresentationJob.objects.select_related('user').get(id=job_id)
+        job.status = 'RUNNING'
+        job.save(update_fields=['status', 'updated_at'])
+
+        user = job.user
+        parsed_response = generate_presentation_data(user.job_role, user.specialization, job.prompt)
+
+        presentation = Presentation.objects.create(
+            user=user,
+            title=parsed_response.get("title", "Untitled Presentation"),
+            description=job.prompt,
+            data=parsed_response
+        )
+
+        job.presentation = presentation
+        job.status = 'COMPLETED'
+        job.save(update_fields=['presentation', 'status', 'updated_at'])
+        logger.info(f"Presentation job {job_id} completed")
+    except PresentationJob.DoesNotExist:
+        logger.error(f"Presentation job {job_id} not found")
+    except Exception as e:
+        logger.exception(f"Presentation job {job_id} failed")
+        PresentationJob.objects.filter(id=job_id).update(status='FAILED', error=str(e), updated_at=timezone.now())
+    finally:
+        if not getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+            close_old_connections()
+
+
+def fail_stale_presentation_job(job):
+    """Marks a job FAILED if it has not moved for ``PRESENTATION_JOB_TIMEOUT`` seconds.
+
+    Jobs only live in the pool of the process that queued them, so one that
+    was pending or running when that process stopped would otherwise be
+    polled forever. Returns whether the job was failed.
+    """
+    if job.status not in ('PENDING', 'RUNNING'):
+        return False
+    timeout = getattr(settings, 'PRESENTATION_JOB_TIMEOUT', DEFAULT_PRESENTATION_JOB_TIMEOUT)
+    error = "Job did not finish in time; the server may have restarted. Please try again."
+    failed = PresentationJob.objects.filter(
+        id=job.id,
+        status=job.status,
+        updated_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status='FAILED', error=error, updated_at=timezone.now())
+    if failed:
+        logger.warning(f"Presentation job {job.id} went stale and was marked failed")
+        job.status, job.error = 'FAILED', error
+    return bool(failed)
+
+
+def enqueue_transcript_analysis(transcript):
+    """Schedules incremental analysis of a running transcript once the new utterances are committed."""
+    if getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+        run_transcript_analysis(transcript.id)
+        return
+    transaction.on_commit(lambda: get_executor('transcripts').submit(run_transcript_analysis, transcript.id))
+
+
+def run_transcript_analysis(transcript_id):
+    """Folds complete windows of new utterances into the transcript's running task state."""
+    try:
+        while True:
+            with claim_transcript_analysis(transcript_id) as claimed:
+                if not claimed:
+                    logger.info(f"Transcript {transcript_id} is already being analyzed")
+                    return
+                advance_transcript_analysis(transcript_id)
+            # Batches that came in while the claim was held were not enqueued, so look again
+            transcript = Transcript.objects.get(id=transcript_id)
+            if transcript.status == 'ENDED':
+                run_transcript_processing(transcript_id)
+                return
+            if not has_full_window(transcript):
+                return
+    except Exception:
+        # The window stays unanalyzed and is picked up by the next run
+        logger.exception(f"Incremental analysis of transcript {transcript_id} failed")
+    finally:
+        if not getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+            close_old_connections()
+
+
+def enqueue_transcript_processing(transcript):
+    """Schedules task extraction for an ended transcript once the row is committed."""
+    if getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+        run_transcript_processing(transcript.id)
+        return
+    transaction.on_commit(lambda: get_executor('transcripts').submit(run_transcript_processing, transcript.id))
+
+
+def run_transcript_processing(transcript_id):
+    """Analyzes what is left of an ended transcript and applies the extracted tasks to the user's project."""
+    try:
+        with claim_transcript_analysis(transcript_id) as claimed:
+            if not claimed:
+                # The job holding the claim processes the transcript when it lets go
+                logger.info(f"Transcript {transcript_id} is being analyzed; processing is left to that job")
+                return
+            if not Transcript.objects.filter(id=transcript_id, status='ENDED').exists():
+                return
+            transcript = advance_transcript_analysis(transcript_id, final=True)
+            tasks_data = transcript.result or {}
+
+            completed_tasks = tasks_data.get("completed_tasks", [])
+            new_tasks = tasks_data.get("new_tasks", [])
+            apply_transcript_tasks(transcript.user, completed_tasks, new_tasks)
+
+            transcript.status = 'PROCESSED'
+            transcript.save(update_fields=['status'])
+        logger.info(f"Transcript {transcript_id} processed")
+    except Transcript.DoesNotExist:
+        logger.error(f"Transcript {transcript_id} not found")
+    except Exception as e:
+        logger.exception(f"Processing transcript {transcript_id} failed")
+        Transcript.objects.filter(id=transcript_id).update(status='FAILED', error=str(e))
+    finally:
+        if not getattr(settings, 'PRESENTATION_JOBS_EAGER', False):
+            close_old_connections()
+
+
+def retry_stalled_transcripts():
+    """Processes FAILED transcripts again, and ended ones whose processing never finished.
+
+    An ended transcript counts as stalled once it has waited longer than
+    ``ANALYSIS_CLAIM_TIMEOUT`` with no live claim, which is what a worker
+    dying mid-run leaves behind. Runs inline; returns how many were retried.
+    """
+    cutoff = timezone.now() - ANALYSIS_CLAIM_TIMEOUT
+    transcript_ids = list(
+        Transcript.objects.filter(Q(status='FAILED') | Q(status='ENDED', ended_at__lte=cutoff))
+        .filter(Q(analysis_claimed_at__isnull=True) | Q(analysis_claimed_at__lte=cutoff))
+        .values_list('id', flat=True)
+    )
+    for transcript_id in transcript_ids:
+        Transcript.objects.filter(id=transcript_id, status='FAILED').update(status='ENDED', error='')
+        run_transcript_processing(transcript_id)
+    return len(transcript_ids)
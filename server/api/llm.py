@@ -0,0 +1,226 @@
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from dotenv import load_dotenv
+
+import os
+import random
+import threading
+import time
+import logging
+import groq
+import httpx
+
+
+load_dotenv()
+
+logger = logging.getLogger('api')
+
+DEFAULT_GATEWAY_SETTINGS = {
+    'API_KEY': None,
+    'BASE_URL': None,
+    'MAX_CONCURRENCY': 8,
+    'MAX_CONNECTIONS': 20,
+    'REQUESTS_PER_MINUTE': 30,
+    'BURST': 5,
+    'MAX_RETRIES': 4,
+    'BACKOFF_BASE': 0.5,
+    'BACKOFF_MAX': 8.0,
+    'REQUEST_TIMEOUT': 30.0,
+    'DEADLINE': 60.0,
+}
+
+RETRYABLE_ERRORS = (
+    groq.RateLimitError,
+    groq.InternalServerError,
+    groq.APIConnectionError,
+)
+
+
+class LLMGatewayError(Exception):
+    """Raised when a completion could not be obtained from the provider."""
+
+
+class LLMDeadlineExceeded(LLMGatewayError):
+    """Raised when a call cannot finish before its deadline."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``capacity`` banked."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Takes a token if one is available, otherwise returns the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, deadline=None):
+        """Blocks until a token is available; raises if that would pass ``deadline``."""
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return
+            if deadline is not None and self._clock() + wait > deadline:
+                raise LLMDeadlineExceeded("Rate limit wait would exceed the call deadline")
+            self._sleep(wait)
+
+
+class LLMGateway:
+    """Shared entry point for chat completions.
+
+    Every call goes through one pooled HTTP client, a bounded concurrency
+    semaphore and a token bucket sized to the provider quota. Rate limits
+    (429), 5xx responses and connection errors are retried with jittered
+    exponential backoff, honouring ``Retry-After``, until the per-call
+    deadline runs out.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=8, max_connections=20,
+                 requests_per_minute=30, burst=5, max_retries=4, backoff_base=0.5,
+                 backoff_max=8.0, request_timeout=30.0, deadline=60.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_timeout = request_timeout
+        self.deadline = deadline
+        self.bucket = TokenBucket(rate=requests_per_minute / 60.0, capacity=burst)
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.client = groq.Client(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            timeout=request_timeout,
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                timeout=request_timeout,
+            ),
+        )
+
+    def complete(self, messages, model, deadline=None, **params):
+        """Returns the text of a single chat completion."""
+        completion = self._call(messages, model, deadline, stream=False, **params)
+        return completion.choices[0].message.content
+
+    def stream(self, messages, model, deadline=None, **params):
+        """Yields text deltas of a streamed chat completion.
+
+        Only opening the stream is retried; the concurrency slot is held
+        until the stream has been consumed or the generator is closed.
+        """
+        deadline = self._deadline(deadline)
+        self._acquire_slot(deadline)
+        try:
+            stream = self._with_retries(messages, model, deadline, stream=True, **params)
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                # A client that stops reading early must not leave the response holding a pooled connection
+                stream.close()
+        finally:
+            self.semaphore.release()
+
+    def _call(self, messages, model, deadline, **params):
+        deadline = self._deadline(deadline)
+        self._acquire_slot(deadline)
+        try:
+            return self._with_retries(messages, model, deadline, **params)
+        finally:
+            self.semaphore.release()
+
+    def _deadline(self, deadline):
+        return deadline if deadline is not None else time.monotonic() + self.deadline
+
+    def _acquire_slot(self, deadline):
+        if not self.semaphore.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise LLMDeadlineExceeded("Timed out waiting for a free LLM slot")
+
+    def _with_retries(self, messages, model, deadline, **params):
+        attempt = 0
+        while True:
+            self.bucket.acquire(deadline)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMDeadlineExceeded("LLM call deadline exceeded")
+            try:
+                return self.client.chat.completions.create(
+                    messages=messages,
+                    model=model,
+                    timeout=min(self.request_timeout, remaining),
+                    **params,
+                )
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise LLMGatewayError(f"LLM call failed after {attempt} attempts: {e}") from e
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay > deadline:
+                    raise LLMDeadlineExceeded(f"LLM call deadline exceeded while retrying: {e}") from e
+                logger.warning(f"LLM call failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    def _backoff(self, attempt, error):
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        response = getattr(error, 'response', None)
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers.get('retry-after', 0)))
+            except ValueError:
+                pass
+        return delay
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """Returns the process-wide gateway configured from ``settings.LLM_GATEWAY``."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            config = {**DEFAULT_GATEWAY_SETTINGS, **getattr(settings, 'LLM_GATEWAY', {})}
+            _gateway = LLMGateway(
+                api_key=config['API_KEY'] or os.getenv('GROQ_API_KEY'),
+                base_url=config['BASE_URL'],
+                max_concurrency=config['MAX_CONCURRENCY'],
+                max_connections=config['MAX_CONNECTIONS'],
+                requests_per_minute=config['REQUESTS_PER_MINUTE'],
+                burst=config['BURST'],
+                max_retries=config['MAX_RETRIES'],
+                backoff_base=config['BACKOFF_BASE'],
+                backoff_max=config['BACKOFF_MAX'],
+                request_timeout=config['REQUEST_TIMEOUT'],
+                deadline=config['DEADLINE'],
+            )
+        return _gateway
+
+
+@receiver(setting_changed)
+def reset_gateway(setting=None, **kwargs):
+    global _gateway
+    if setting == 'LLM_GATEWAY':
+        _gateway = None
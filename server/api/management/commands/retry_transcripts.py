@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.jobs import retry_stalled_transcripts
+
+
+class Command(BaseCommand):
+    help = 'Processes failed transcripts again, and ended ones whose processing never finished.'
+
+    def handle(self, *args, **options):
+        retried = retry_stalled_transcripts()
+        self.stdout.write(f'Retried {retried} transcripts')
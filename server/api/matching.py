@@ -0,0 +1,235 @@
+from collections import OrderedDict, defaultdict
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Task
+
+import math
+import re
+import threading
+
+
+DEFAULT_MATCH_THRESHOLD = 0.75
+# Trigram similarity a title needs to be scored at all; the token check decides
+CANDIDATE_THRESHOLD = 0.4
+# The best match must beat any differently-worded runner-up by this much
+MATCH_MARGIN = 0.05
+# Two differing words still count as the same one ("add"/"added", "bug"/"bugs")
+TOKEN_SIMILARITY = 0.8
+MAX_SUFFIX_LENGTH = 2
+DEFAULT_MAX_INDEXES = 256
+
+STOPWORDS = frozenset(['a', 'an', 'the', 'to', 'for', 'of', 'on', 'in', 'and', 'with', 'my', 'our', 'i'])
+SUFFIXES = ('ing', 'ed', 'es', 's', 'e')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def title_tokens(title):
+    """Splits a task title into lowercased, lightly stemmed words, dropping filler words."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(title.lower()):
+        if token in STOPWORDS:
+            continue
+        for suffix in SUFFIXES:
+            if len(token) > len(suffix) + 3 and token.endswith(suffix):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+def normalize_title(title):
+    """Reduces a task title to a canonical form that ignores case, spacing, order and filler words.
+
+    "Set up the API" and "Setup API" both become ``"apisetup"``.
+    """
+    return ''.join(sorted(title_tokens(title)))
+
+
+def trigrams(normalized):
+    padded = f'  {normalized} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def token_similarity(a, b):
+    """How alike two differing words are; a short suffix ("bug"/"bugs") always counts."""
+    ratio = SequenceMatcher(None, a, b).ratio()
+    shorter, longer = sorted((a, b), key=len)
+    if longer.startswith(shorter) and len(longer) - len(shorter) <= MAX_SUFFIX_LENGTH:
+        return max(ratio, TOKEN_SIMILARITY)
+    return ratio
+
+
+def token_score(tokens, other):
+    """Scores two titles word by word, or returns ``None`` when a word was swapped for another.
+
+    Words on one side only are allowed ("Update README" / "Update the README
+    file"), but if both titles have a word the other lacks, those words must
+    be near-identical; "login" and "logout" are not. The score is the share of
+    characters in words the titles agree on.
+    """
+    tokens, other = set(tokens), set(other)
+    shared = tokens & other
+    agreed = 2 * sum(len(token) for token in shared)
+    unpaired = tokens - shared
+    remaining = other - shared
+    for token in sorted(unpaired):
+        best, best_ratio = None, TOKEN_SIMILARITY
+        for candidate in remaining:
+            ratio = token_similarity(token, candidate)
+            if ratio >= best_ratio:
+                best, best_ratio = candidate, ratio
+        if best is not None:
+            agreed += best_ratio * (len(token) + len(best))
+            unpaired.discard(token)
+            remaining.discard(best)
+    if unpaired and remaining:
+        return None
+    total = sum(len(token) for token in tokens) + sum(len(token) for token in other)
+    return agreed / total if total else 0.0
+
+
+class TaskMatchIndex:
+    """Trigram index over the normalised task titles of one project.
+
+    Lookups only visit tasks found in the posting lists of the query's rarest
+    trigrams (prefix filtering) whose trigram Jaccard similarity reaches
+    ``CANDIDATE_THRESHOLD``. Those are scored word by word with
+    ``token_score``, and the best one must reach ``threshold`` and beat the
+    runner-up by ``MATCH_MARGIN``.
+    """
+
+    def __init__(self, threshold=DEFAULT_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.max_id = 0
+        self._grams = {}
+        self._by_normalized = defaultdict(set)
+        self._postings = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._grams)
+
+    def add(self, task_id, title):
+        tokens = title_tokens(title)
+        normalized = ''.join(sorted(tokens))
+        grams = trigrams(normalized)
+        with self._lock:
+            self._discard(task_id)
+            self._grams[task_id] = (normalized, grams, tokens)
+            self._by_normalized[normalized].add(task_id)
+            for gram in grams:
+                self._postings[gram].add(task_id)
+            self.max_id = max(self.max_id, task_id)
+
+    def remove(self, task_id):
+        with self._lock:
+            self._discard(task_id)
+
+    def _discard(self, task_id):
+        entry = self._grams.pop(task_id, None)
+        if entry is None:
+            return
+        normalized, grams, _ = entry
+        self._by_normalized[normalized].discard(task_id)
+        if not self._by_normalized[normalized]:
+            del self._by_normalized[normalized]
+        for gram in grams:
+            self._postings[gram].discard(task_id)
+            if not self._postings[gram]:
+                del self._postings[gram]
+
+    def match(self, title):
+        """Returns ``(task_id, score)`` of the most similar task above the threshold, or ``None``."""
+        tokens = title_tokens(title)
+        normalized = ''.join(sorted(tokens))
+        if not normalized:
+            return None
+        with self._lock:
+            exact = self._by_normalized.get(normalized)
+            if exact:
+                return min(exact), 1.0
+
+            grams = trigrams(normalized)
+            # Prefix filter: a candidate must share at least ceil(CANDIDATE_THRESHOLD * |grams|)
+            # trigrams, so it has to appear in one of the rarest remaining ones
+            ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+            prefix_length = len(ordered) - math.ceil(CANDIDATE_THRESHOLD * len(ordered)) + 1
+            candidates = set()
+            for gram in ordered[:prefix_length]:
+                candidates.update(self._postings.get(gram, ()))
+
+            scored = []
+            for task_id in candidates:
+                other_normalized, other_grams, other_tokens = self._grams[task_id]
+                overlap = len(grams & other_grams)
+                if overlap / (len(grams) + len(other_grams) - overlap) < CANDIDATE_THRESHOLD:
+                    continue
+                score = token_score(tokens, other_tokens)
+                if score is not None:
+                    scored.append((-score, task_id, other_normalized))
+            if not scored:
+                return None
+
+            scored.sort()
+            best_score, best_id, best_normalized = scored[0]
+            if -best_score < self.threshold:
+                return None
+            for score, _, other_normalized in scored[1:]:
+                # Equally close, differently worded tasks: guessing could complete the wrong one
+                if other_normalized != best_normalized and score - best_score < MATCH_MARGIN:
+                    return None
+            return best_id, -best_score
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_match_index(project_id):
+    """Returns the project's match index, building it on first use.
+
+    Every call picks up tasks created since the last one (including those
+    written by other processes or through ``bulk_create``) with one query
+    for ids above the highest one already indexed. In-process renames and
+    deletes arrive through the ``Task`` signal handlers below. At most
+    ``TASK_MATCH_MAX_INDEXES`` projects are kept, least recently used first out.
+    """
+    with _indexes_lock:
+        index = _indexes.get(project_id)
+        if index is None:
+            index = TaskMatchIndex(getattr(settings, 'TASK_MATCH_THRESHOLD', DEFAULT_MATCH_THRESHOLD))
+            _indexes[project_id] = index
+            while len(_indexes) > getattr(settings, 'TASK_MATCH_MAX_INDEXES', DEFAULT_MAX_INDEXES):
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(project_id)
+
+    for task_id, title in Task.objects.filter(project_id=project_id, id__gt=index.max_id).values_list('id', 'title'):
+        index.add(task_id, title)
+    return index
+
+
+def clear_match_indexes():
+    with _indexes_lock:
+        _indexes.clear()
+
+
+@receiver(post_save, sender=Task)
+def index_saved_task(sender, instance, **kwargs):
+    index = _indexes.get(instance.project_id)
+    if index is not None:
+        task_id, title = instance.id, instance.title
+        transaction.on_commit(lambda: index.add(task_id, title))
+
+
+@receiver(post_delete, sender=Task)
+def unindex_deleted_task(sender, instance, **kwargs):
+    index = _indexes.get(instance.project_id)
+    if index is not None:
+        task_id = instance.id
+        transaction.on_commit(lambda: index.remove(task_id))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:33
+
+import api.fields
+from api.schema import PresentationSchemaError, validate_presentation
+from django.db import migrations, models
+
+
+def encode_existing_presentations(apps, schema_editor):
+    # Re-saving goes through PresentationDataField, which writes the compact format
+    Presentation = apps.get_model('api', 'Presentation')
+    for presentation in Presentation.objects.all().iterator():
+        try:
+            validate_presentation(presentation.data)
+        except PresentationSchemaError:
+            # Rows that do not fit the schema stay in the legacy format, which is still read as-is
+            continue
+        presentation.save(update_fields=['data'])
+
+
+def decode_existing_presentations(apps, schema_editor):
+    # Reading decodes through PresentationDataField; writing with a plain JSONField skips re-encoding
+    Presentation = apps.get_model('api', 'Presentation')
+    for pk, data in Presentation.objects.values_list('pk', 'data').iterator():
+        Presentation.objects.filter(pk=pk).update(data=models.Value(data, output_field=models.JSONField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_presentationjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='presentation',
+            name='data',
+            field=api.fields.PresentationDataField(),
+        ),
+        migrations.RunPython(encode_existing_presentations, decode_existing_presentations),
+    ]
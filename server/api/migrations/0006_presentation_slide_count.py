@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:34
+
+from django.db import migrations, models
+
+
+def backfill_slide_count(apps, schema_editor):
+    Presentation = apps.get_model('api', 'Presentation')
+    for presentation in Presentation.objects.all().iterator():
+        slides = presentation.data.get('slides') if isinstance(presentation.data, dict) else None
+        presentation.slide_count = len(slides) if isinstance(slides, list) else 0
+        presentation.save(update_fields=['slide_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_compact_presentation_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='presentation',
+            name='slide_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_slide_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:48
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_task_presentation_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Transcript',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('room_name', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('ENDED', 'Ended'), ('PROCESSED', 'Processed'), ('FAILED', 'Failed')], default='OPEN', max_length=20)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ended_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transcripts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Utterance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('speaker', models.CharField(max_length=20)),
+                ('text', models.TextField()),
+                ('spoken_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('transcript', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='utterances', to='api.transcript')),
+            ],
+            options={
+                'ordering': ['sequence'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='transcript',
+            index=models.Index(fields=['user', '-created_at'], name='transcript_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='utterance',
+            constraint=models.UniqueConstraint(fields=('transcript', 'sequence'), name='utterance_transcript_sequence_uniq'),
+        ),
+    ]
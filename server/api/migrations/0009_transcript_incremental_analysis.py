@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_transcript_utterance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='analyzed_sequence',
+            field=models.IntegerField(default=-1),
+        ),
+        migrations.AddField(
+            model_name='transcript',
+            name='summary',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
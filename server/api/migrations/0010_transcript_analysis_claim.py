@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_transcript_incremental_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='analysis_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,17 +1,58 @@
 from django.db import models
+from django.db.models import Q
 from authentication.models import User
 from django.utils import timezone
 
+from .fields import PresentationDataField
+
+import uuid
+
 class Presentation(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='presentations')
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    data = models.JSONField()  # This will store the JSON format for the presentation
+    data = PresentationDataField()  # Validated deck, stored compactly (see api.schema)
+    slide_count = models.PositiveIntegerField(default=0)  # Denormalised so listings never load `data`
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Per-user listing, newest first (see PresentationCursorPagination)
+            models.Index(fields=['user', '-created_at', '-id'], name='presentation_user_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if 'data' not in self.get_deferred_fields():
+            slides = self.data.get('slides') if isinstance(self.data, dict) else None
+            self.slide_count = len(slides) if isinstance(slides, list) else 0
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'data' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'slide_count'}
+        super().save(*args, **kwargs)
+
+class PresentationJob(models.Model):
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed')
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='presentation_jobs')
+    prompt = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    presentation = models.ForeignKey(Presentation, on_delete=models.SET_NULL, related_name='jobs', null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
 class Project(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='project', null=True)
     name = models.CharField(max_length=255)
@@ -38,5 +79,65 @@ class Task(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            # Transcript reconciliation looks tasks up by (user, project, title)
+            models.Index(fields=['user', 'project', 'title'], name='task_user_project_title_idx'),
+            # Open work only; completed tasks are the bulk of the table over time
+            models.Index(
+                fields=['user', 'project'],
+                condition=~Q(status='COMPLETED'),
+                name='task_open_idx',
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class Transcript(models.Model):
+    STATUS_CHOICES = [
+        ('OPEN', 'Open'),
+        ('ENDED', 'Ended'),
+        ('PROCESSED', 'Processed'),
+        ('FAILED', 'Failed')
+    ]
+
+    # The id doubles as the session ticket handed to the voice agent
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transcripts')
+    room_name = models.CharField(max_length=255, blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='OPEN')
+    result = models.JSONField(null=True, blank=True)  # Tasks extracted so far (see api.transcripts)
+    summary = models.TextField(blank=True, default='')  # Running summary carried between analysis windows
+    analyzed_sequence = models.IntegerField(default=-1)  # Last utterance folded into `result`
+    analysis_claimed_at = models.DateTimeField(null=True, blank=True)  # Set while a job is calling the LLM
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    ended_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='transcript_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+
+class Utterance(models.Model):
+    transcript = models.ForeignKey(Transcript, on_delete=models.CASCADE, related_name='utterances')
+    sequence = models.PositiveIntegerField()  # Assigned by the agent; makes batch retries idempotent
+    speaker = models.CharField(max_length=20)
+    text = models.TextField()
+    spoken_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['transcript', 'sequence'], name='utterance_transcript_sequence_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.speaker}: {self.text}"
@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PresentationCursorPagination(CursorPagination):
+    """Newest-first cursor pagination; ``id`` breaks ties between equal timestamps."""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,16 @@
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+import hmac
+
+
+class HasIngestToken(BasePermission):
+    """Allows service callers that send ``Authorization: Bearer <TRANSCRIPT_INGEST_TOKEN>``.
+
+    Denies everything while the setting is empty.
+    """
+
+    def has_permission(self, request, view):
+        expected = getattr(settings, 'TRANSCRIPT_INGEST_TOKEN', '')
+        scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        return bool(expected) and scheme == 'Bearer' and hmac.compare_digest(token.encode(), expected.encode())
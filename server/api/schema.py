@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+import base64
+import json
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+
+SCHEMA_VERSION = 1
+DEFAULT_COMPRESS_THRESHOLD = 4096
+
+
+class PresentationSchemaError(ValueError):
+    """Raised when presentation data does not match the deck schema."""
+
+
+@dataclass
+class Slide:
+    title: str
+    content: list = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        return {**self.extra, "title": self.title, "content": list(self.content)}
+
+
+@dataclass
+class PresentationDeck:
+    title: str = ""
+    slides: list = field(default_factory=list)
+    talking_points: list = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        data = {
+            **self.extra,
+            "slides": [slide.to_dict() for slide in self.slides],
+            "talking_points": list(self.talking_points),
+        }
+        if self.title:
+            data["title"] = self.title
+        return data
+
+
+def _text_list(value, name):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if not isinstance(value, list):
+        raise PresentationSchemaError(f"'{name}' must be a list of strings")
+    items = []
+    for item in value:
+        if isinstance(item, (dict, list)):
+            raise PresentationSchemaError(f"'{name}' must be a list of strings")
+        items.append(str(item))
+    return items
+
+
+def validate_presentation(data):
+    """Checks raw presentation data and returns it as a typed ``PresentationDeck``.
+
+    Scalars are coerced to strings and a lone string is accepted where a list
+    of bullets is expected; anything structurally wrong raises
+    ``PresentationSchemaError``. Unknown top-level and per-slide keys are kept
+    in ``extra``.
+    """
+    if not isinstance(data, dict):
+        raise PresentationSchemaError("Presentation data must be an object")
+
+    raw_slides = data.get("slides") or []
+    if not isinstance(raw_slides, list):
+        raise PresentationSchemaError("'slides' must be a list")
+
+    slides = []
+    for index, raw_slide in enumerate(raw_slides):
+        if not isinstance(raw_slide, dict):
+            raise PresentationSchemaError(f"Slide {index} must be an object")
+        slides.append(Slide(
+            title=str(raw_slide.get("title") or ""),
+            content=_text_list(raw_slide.get("content"), f"slides[{index}].content"),
+            extra={key: value for key, value in raw_slide.items() if key not in ("title", "content")},
+        ))
+
+    title = data.get("title") or ""
+    if not isinstance(title, str):
+        raise PresentationSchemaError("'title' must be a string")
+
+    return PresentationDeck(
+        title=title,
+        slides=slides,
+        talking_points=_text_list(data.get("talking_points"), "talking_points"),
+        extra={key: value for key, value in data.items() if key not in ("title", "slides", "talking_points")},
+    )
+
+
+def _compress(raw):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(raw)
+    return "zlib", zlib.compress(raw, 9)
+
+
+def _decompress(codec, payload):
+    if codec == "zstd":
+        if zstandard is None:
+            raise PresentationSchemaError("zstandard is required to read this presentation")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "zlib":
+        return zlib.decompress(payload)
+    raise PresentationSchemaError(f"Unknown presentation codec '{codec}'")
+
+
+def encode_presentation(data):
+    """Validates ``data`` and returns its compact stored form.
+
+    Slides are stored as ``[title, bullets]`` pairs so per-slide keys are not
+    repeated; a slide with unknown keys gets them as a third item. Decks whose encoding exceeds ``PRESENTATION_COMPRESS_THRESHOLD``
+    bytes are compressed (zstd when available, zlib otherwise) if that
+    actually makes them smaller.
+    """
+    deck = validate_presentation(data)
+    compact = {
+        "v": SCHEMA_VERSION,
+        "t": deck.title,
+        "s": [[slide.title, slide.content, slide.extra] if slide.extra else [slide.title, slide.content]
+              for slide in deck.slides],
+        "p": deck.talking_points,
+    }
+    if deck.extra:
+        compact["x"] = deck.extra
+
+    raw = json.dumps(compact, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    threshold = getattr(settings, 'PRESENTATION_COMPRESS_THRESHOLD', DEFAULT_COMPRESS_THRESHOLD)
+    if threshold is not None and len(raw) > threshold:
+        codec, payload = _compress(raw)
+        encoded = base64.b64encode(payload).decode('ascii')
+        if len(encoded) < len(raw):
+            return {"v": SCHEMA_VERSION, "c": codec, "z": encoded}
+    return compact
+
+
+def is_encoded(value):
+    return isinstance(value, dict) and "v" in value and ("s" in value or "z" in value)
+
+
+def decode_presentation(value):
+    """Turns a stored value back into the canonical presentation dict.
+
+    Rows written before the compact format are returned unchanged.
+    """
+    if not is_encoded(value):
+        return value
+    if "z" in value:
+        value = json.loads(_decompress(value.get("c", "zlib"), base64.b64decode(value["z"])))
+    deck = PresentationDeck(
+        title=value.get("t", ""),
+        slides=[Slide(*slide) for slide in value.get("s", [])],
+        talking_points=value.get("p", []),
+        extra=value.get("x", {}),
+    )
+    return deck.to_dict()
@@ -1,11 +1,26 @@
 from rest_framework import serializers
-from .models import Presentation, Project, Task
+from .models import Presentation, Project, Task, Utterance
+from .schema import PresentationSchemaError, validate_presentation
 
 class PresentationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Presentation
-        fields = ['id', 'user', 'title', 'description', 'data', 'created_at']
-        read_only_fields = ['id', 'user', 'created_at']
+        fields = ['id', 'user', 'title', 'description', 'data', 'slide_count', 'created_at']
+        read_only_fields = ['id', 'user', 'slide_count', 'created_at']
+
+    def validate_data(self, value):
+        try:
+            return validate_presentation(value).to_dict()
+        except PresentationSchemaError as e:
+            raise serializers.ValidationError(str(e))
+
+
+class PresentationSummarySerializer(serializers.ModelSerializer):
+    """Listing representation that never touches the ``data`` blob."""
+    class Meta:
+        model = Presentation
+        fields = ['id', 'title', 'description', 'slide_count', 'created_at']
+        read_only_fields = fields
 
 
 class ProjectSerializer(serializers.ModelSerializer):
@@ -22,3 +37,19 @@ class TaskSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
         return Task.objects.create(user=user, **validated_data)
+
+
+class UtteranceSerializer(serializers.ModelSerializer):
+    timestamp = serializers.DateTimeField(source='spoken_at', required=False)
+
+    class Meta:
+        model = Utterance
+        fields = ['sequence', 'timestamp', 'speaker', 'text']
+
+
+class TranscriptIngestSerializer(serializers.Serializer):
+    """A batch of utterances posted by the voice agent while a session runs."""
+    session = serializers.UUIDField()
+    room = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    utterances = UtteranceSerializer(many=True, required=False)
+    final = serializers.BooleanField(default=False)
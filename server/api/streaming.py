@@ -0,0 +1,126 @@
+from asgiref.sync import sync_to_async
+
+import json
+import logging
+
+
+logger = logging.getLogger('api')
+
+
+class SlideStreamParser:
+    """Incrementally scans a streamed presentation completion for finished slides.
+
+    Text is fed in arbitrary chunks as the model produces it. The parser tracks
+    string/escape state and container nesting in a single pass, so every
+    character is examined exactly once. Whenever an object inside the
+    top-level ``"slides"`` array is closed it is decoded and returned from
+    ``feed``. Anything before the document (prose, markdown fences) is
+    ignored, including a ``{`` in prose: the document's brace must be
+    followed by a key or by ``}``.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.slides_emitted = 0
+        self._pos = 0
+        self._stack = []
+        self._expecting_key = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._top_key = None
+        self._in_slides = False
+        self._slide_start = None
+
+    def feed(self, chunk):
+        """Consumes the next chunk of model output and returns any completed slides."""
+        self.buffer += chunk
+        slides = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_string = buffer[self._string_start:i + 1]
+                continue
+
+            if self._expecting_key:
+                if c.isspace():
+                    continue
+                self._expecting_key = False
+                if c not in '"}':
+                    # The brace was prose ("Use { to open"), not the start of the document
+                    self._stack = []
+
+            if not self._stack and c != '{':
+                # Still outside the JSON document
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ':' and len(self._stack) == 1:
+                self._top_key = self._decode_key(self._last_string)
+            elif c in '{[':
+                if c == '[' and len(self._stack) == 1 and self._top_key == "slides":
+                    self._in_slides = True
+                elif c == '{' and self._in_slides and len(self._stack) == 2:
+                    self._slide_start = i
+                self._expecting_key = not self._stack
+                self._stack.append(c)
+            elif c in '}]' and self._stack:
+                self._stack.pop()
+                if c == '}' and self._in_slides and len(self._stack) == 2 and self._slide_start is not None:
+                    slide = self._decode_slide(buffer[self._slide_start:i + 1])
+                    self._slide_start = None
+                    if slide is not None:
+                        slides.append(slide)
+                elif c == ']' and self._in_slides and len(self._stack) == 1:
+                    self._in_slides = False
+        self._pos = len(buffer)
+        self.slides_emitted += len(slides)
+        return slides
+
+    @staticmethod
+    def _decode_key(raw):
+        try:
+            return json.loads(raw) if raw else None
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _decode_slide(raw):
+        try:
+            slide = json.loads(raw)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed streamed slide: {raw}")
+            return None
+        return slide if isinstance(slide, dict) else None
+
+
+def sse_event(event, data):
+    """Formats a single server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def iterate_in_thread(iterator):
+    """Async view of a blocking iterator, advanced one ``next()`` at a time in a worker thread.
+
+    Under ASGI, Django reads a synchronous ``StreamingHttpResponse`` iterator
+    to the end before sending anything; wrapping it keeps events flowing as
+    they are produced.
+    """
+    sentinel = object()
+    next_part = sync_to_async(next, thread_sensitive=True)
+    while True:
+        part = await next_part(iterator, sentinel)
+        if part is sentinel:
+            return
+        yield part
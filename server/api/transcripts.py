@@ -0,0 +1,285 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .generation import complete_chat
+from .helpers import extract_json_from_response
+from .matching import get_match_index
+from .models import Project, Task, Transcript, Utterance
+
+import json
+import logging
+
+
+logger = logging.getLogger('api')
+
+TRANSCRIPT_MODEL = "llama3-8b-8192"
+
+DEFAULT_ANALYSIS_WINDOW = 12
+
+# A claim older than this is treated as left behind by a crashed worker
+ANALYSIS_CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def analyze_transcript(transcript):
+    """Calls LLM to extract completed and new tasks from the transcript."""
+    template = f"""
+    You are an AI assistant analyzing a conversation transcript. Your task is to:
+    - Identify **tasks the user has completed**.
+    - Identify **new tasks the user should work on**.
+
+    ### **Response Format (ONLY JSON)**
+    ```json
+    {{
+        "completed_tasks": ["Completed Task 1", "Completed Task 2"],
+        "new_tasks": [
+            {{"title": "New Task 1", "description": "Details about Task 1"}},
+            {{"title": "New Task 2", "description": "Details about Task 2"}}
+        ]
+    }}
+    ```
+
+    **Transcript:**  
+    {transcript}
+    """
+
+    try:
+        response = complete_chat(
+            [{"role": "user", "content": template}],
+            model=TRANSCRIPT_MODEL,
+            validate=extract_json_from_response,
+        )
+        logger.info(f"Raw LLM Response: {response}")
+
+        parsed_response = extract_json_from_response(response)
+        logger.info(f"Extracted JSON from LLM: {parsed_response}")
+
+        return parsed_response
+
+    except ValueError as e:
+        logger.error(f"Invalid JSON from LLM: {str(e)} | Response: {response}")
+        return {"completed_tasks": [], "new_tasks": []}
+    except Exception as e:
+        logger.error(f"Error in LLM analysis: {str(e)}")
+        return {"completed_tasks": [], "new_tasks": []}
+
+
+def analyze_transcript_delta(summary, tasks, delta):
+    """Asks the LLM what a new stretch of a transcript adds to the analysis so far.
+
+    The prompt carries only the new utterances, the running summary and the
+    titles of tasks found so far, so its size does not grow with the call.
+    Returns the parsed reply; raises ``ValueError`` if it is not usable.
+    """
+    known_titles = {
+        "completed_tasks": tasks.get("completed_tasks", []),
+        "new_tasks": [task.get("title") for task in tasks.get("new_tasks", [])],
+    }
+    template = f"""
+    You are an AI assistant following a standup conversation as it happens. You are
+    given a summary of the conversation so far, the tasks already extracted from it,
+    and the next part of the transcript. Your task is to:
+    - Identify **tasks the user has completed** that are mentioned in the new part.
+    - Identify **new tasks the user should work on** that are mentioned in the new part.
+    - Do not repeat tasks that are already listed unless the user now says a listed new task is done.
+    - Update the summary so it stays under three sentences.
+
+    ### **Response Format (ONLY JSON)**
+    ```json
+    {{
+        "summary": "Short summary of the whole conversation so far",
+        "completed_tasks": ["Completed Task 1"],
+        "new_tasks": [
+            {{"title": "New Task 1", "description": "Details about Task 1"}}
+        ]
+    }}
+    ```
+
+    **Summary so far:**
+    {summary or "The conversation has just started."}
+
+    **Tasks so far:**
+    {json.dumps(known_titles)}
+
+    **New part of the transcript:**
+    {delta}
+    """
+
+    response = complete_chat(
+        [{"role": "user", "content": template}],
+        model=TRANSCRIPT_MODEL,
+        validate=extract_json_from_response,
+    )
+    parsed_response = extract_json_from_response(response)
+    logger.info(f"Incremental analysis: {parsed_response}")
+    return parsed_response
+
+
+def merge_transcript_tasks(tasks, update):
+    """Folds one window's extracted tasks into the running task state."""
+    completed = list(tasks.get("completed_tasks", []))
+    for title in update.get("completed_tasks") or []:
+        if isinstance(title, str) and title and title not in completed:
+            completed.append(title)
+
+    new_tasks = {task["title"]: task for task in tasks.get("new_tasks", [])}
+    for task in update.get("new_tasks") or []:
+        if isinstance(task, dict) and task.get("title") and task["title"] not in new_tasks:
+            new_tasks[task["title"]] = {"title": task["title"], "description": task.get("description", "")}
+
+    # A task planned earlier in the call and reported done later only counts as completed
+    return {
+        "completed_tasks": completed,
+        "new_tasks": [task for title, task in new_tasks.items() if title not in completed],
+    }
+
+
+def analysis_in_progress(transcript):
+    """Whether a job currently holds the analysis claim on ``transcript``."""
+    claimed_at = transcript.analysis_claimed_at
+    return claimed_at is not None and claimed_at > timezone.now() - ANALYSIS_CLAIM_TIMEOUT
+
+
+def has_full_window(transcript):
+    """Whether a full window of utterances is waiting to be analyzed."""
+    window = getattr(settings, 'TRANSCRIPT_ANALYSIS_WINDOW', DEFAULT_ANALYSIS_WINDOW)
+    return Utterance.objects.filter(
+        transcript_id=transcript.id, sequence__gt=transcript.analyzed_sequence
+    )[window - 1:window].exists()
+
+
+@contextmanager
+def claim_transcript_analysis(transcript_id):
+    """Claims a transcript so only one job at a time calls the LLM for it.
+
+    Yields whether the claim was taken. The claim is a conditional update of
+    ``analysis_claimed_at``, released on exit; a claim older than
+    ``ANALYSIS_CLAIM_TIMEOUT`` can be taken over.
+    """
+    now = timezone.now()
+    claimed = Transcript.objects.filter(id=transcript_id).filter(
+        Q(analysis_claimed_at__isnull=True) | Q(analysis_claimed_at__lte=now - ANALYSIS_CLAIM_TIMEOUT)
+    ).update(analysis_claimed_at=now)
+    try:
+        yield bool(claimed)
+    finally:
+        if claimed:
+            Transcript.objects.filter(id=transcript_id, analysis_claimed_at=now).update(analysis_claimed_at=None)
+
+
+def advance_transcript_analysis(transcript_id, final=False):
+    """Analyzes the utterances of a transcript that arrived since the last run.
+
+    Utterances are taken in windows of ``TRANSCRIPT_ANALYSIS_WINDOW``. Until
+    the transcript ends only full windows are analyzed; with ``final`` the
+    remainder is too. Callers hold ``claim_transcript_analysis``; progress is
+    still saved with a compare-and-set on ``analyzed_sequence``, so a run whose
+    claim was taken over never folds a window in twice.
+    Returns the transcript with its latest state.
+    """
+    window = getattr(settings, 'TRANSCRIPT_ANALYSIS_WINDOW', DEFAULT_ANALYSIS_WINDOW)
+    while True:
+        transcript = Transcript.objects.select_related('user').get(id=transcript_id)
+        delta = list(
+            Utterance.objects.filter(transcript_id=transcript_id, sequence__gt=transcript.analyzed_sequence)
+            .order_by('sequence')
+            .values_list('sequence', 'speaker', 'text')[:window]
+        )
+        if not delta or (len(delta) < window and not final):
+            return transcript
+
+        update = analyze_transcript_delta(
+            transcript.summary,
+            transcript.result or {},
+            "\n".join(f"{speaker}: {text}" for _, speaker, text in delta),
+        )
+        Transcript.objects.filter(id=transcript_id, analyzed_sequence=transcript.analyzed_sequence).update(
+            summary=str(update.get("summary") or transcript.summary),
+            result=merge_transcript_tasks(transcript.result or {}, update),
+            analyzed_sequence=delta[-1][0],
+        )
+
+
+def apply_transcript_tasks(user, completed_tasks, new_tasks):
+    """Updates the database with completed and new tasks.
+
+    Returns ``False`` when the user has no project to attach tasks to.
+    """
+    project = Project.objects.filter(user=user).first()
+
+    if not project:
+        logger.error(f"No active project found for user {user}. Cannot assign tasks.")
+        return False
+
+    completed_titles = list(dict.fromkeys(title for title in completed_tasks if title))
+    new_tasks_by_title = {}
+    for task_data in new_tasks:
+        title = task_data.get("title")
+        if title and title not in new_tasks_by_title:
+            new_tasks_by_title[title] = task_data
+
+    # Resolve near-duplicate titles ("Setup API" vs "Set up the API") in memory
+    titles = set(completed_titles) | set(new_tasks_by_title)
+    index = get_match_index(project.id)
+    fuzzy_matches = {}
+    for title in titles:
+        match = index.match(title)
+        if match:
+            fuzzy_matches[title] = match[0]
+
+    with transaction.atomic():
+        # One query for every task we might touch, then one bulk write per kind
+        candidates = Task.objects.filter(user=user, project=project).filter(
+            Q(title__in=titles) | Q(id__in=fuzzy_matches.values())
+        )
+        tasks_by_id = {task.id: task for task in candidates}
+        existing = {}
+        for task in tasks_by_id.values():
+            existing.setdefault(task.title, task)
+        for title, task_id in fuzzy_matches.items():
+            if title not in existing and task_id in tasks_by_id:
+                existing[title] = tasks_by_id[task_id]
+                logger.info(f"Matched '{title}' to existing task '{tasks_by_id[task_id].title}'")
+
+        now = timezone.now()
+        to_update = []
+        to_create = []
+
+        # Process completed tasks
+        for task_title in completed_titles:
+            task = existing.get(task_title)
+            if task:
+                if task.status != "COMPLETED":
+                    task.status = "COMPLETED"
+                    task.updated_at = now
+                    to_update.append(task)
+                    logger.info(f"Task '{task_title}' marked as completed.")
+            else:
+                task = Task(user=user, project=project, title=task_title, status="COMPLETED")
+                existing[task_title] = task
+                to_create.append(task)
+                logger.info(f"Completed task '{task_title}' created.")
+
+        # Process new tasks
+        for task_title, task_data in new_tasks_by_title.items():
+            if task_title in existing:
+                logger.info(f"Task '{task_title}' already exists. Skipping duplicate.")
+                continue
+            to_create.append(Task(
+                user=user,
+                project=project,
+                title=task_title,
+                description=task_data.get("description"),
+                status="TODO",
+            ))
+            logger.info(f"New task added: {task_title}")
+
+        if to_update:
+            Task.objects.bulk_update(to_update, ["status", "updated_at"])
+        if to_create:
+            Task.objects.bulk_create(to_create)
+    return True
@@ -4,7 +4,11 @@ from . import views
 urlpatterns = [
     # Presentation URLs
     path('create-ppt/', views.CreatePPTView.as_view(), name='create-ppt'),
+    path('create-ppt/stream/', views.StreamPPTView.as_view(), name='create-ppt-stream'),
+    path('create-ppt/jobs/', views.CreatePPTJobView.as_view(), name='create-ppt-job'),
+    path('ppt-jobs/<uuid:job_id>/', views.PresentationJobView.as_view(), name='ppt-job'),
     path('fetch-ppt/', views.UserPPTView.as_view(), name='fetch-ppt'),
+    path('presentations/<int:id>/', views.PresentationDetailView.as_view(), name='presentation-detail'),
     path('update-ppt/<int:id>/', views.UpdatePresentationView.as_view(), name='update-ppt'),
     path('delete-ppt/<int:id>/', views.DeletePresentationView.as_view(), name='delete-ppt'),
 
@@ -17,7 +21,12 @@ urlpatterns = [
     path('projects/<int:project_id>/tasks/', views.TaskListCreateView.as_view(), name='project-tasks'),
     path('tasks/<int:id>/', views.TaskDetailView.as_view(), name='task-detail'),
 
+    # LLM URLs
+    path('llm/cache-stats/', views.LLMCacheStatsView.as_view(), name='llm-cache-stats'),
+
     # Transcript URLs
     path('transcript/', views.GetTranscriptView.as_view(), name='get-transcript'),
     path('transcript/process/', views.ProcessTranscriptView.as_view(), name='process-transcript'),
+    path('transcript/sessions/', views.TranscriptSessionView.as_view(), name='transcript-session'),
+    path('transcript/ingest/', views.TranscriptIngestView.as_view(), name='transcript-ingest'),
 ]
\ No newline at end of file
@@ -1,34 +1,56 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404
 from django.conf import settings
-
-from dotenv import load_dotenv
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
 
 from authentication.models import User
-from .helpers import extract_json_from_response
-from .models import Presentation, Project, Task
-from .serializers import PresentationSerializer, ProjectSerializer, TaskSerializer
+from .async_views import AsyncAPIView, avalidate
+from .cache import get_completion_cache
+from .generation import (
+    generate_presentation_data,
+    parse_presentation_response,
+    stream_presentation_completion,
+)
+from .jobs import (
+    enqueue_presentation_job,
+    enqueue_transcript_analysis,
+    enqueue_transcript_processing,
+    fail_stale_presentation_job,
+)
+from .models import Presentation, PresentationJob, Project, Task, Transcript, Utterance
+from .pagination import PresentationCursorPagination
+from .permissions import HasIngestToken
+from .schema import PresentationSchemaError
+from .serializers import (
+    PresentationSerializer,
+    PresentationSummarySerializer,
+    ProjectSerializer,
+    TaskSerializer,
+    TranscriptIngestSerializer,
+    UtteranceSerializer,
+)
+from .streaming import SlideStreamParser, iterate_in_thread, sse_event
+from .transcripts import DEFAULT_ANALYSIS_WINDOW, analysis_in_progress, analyze_transcript, apply_transcript_tasks
 
 
 import os
 import json
 import logging
-import groq
-import re
-
-
-load_dotenv()
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 
-client = groq.Client(api_key=GROQ_API_KEY)
 
 logger = logging.getLogger('api')
 
+SUMMARY_FIELDS = ('id', 'user_id', 'title', 'description', 'slide_count', 'created_at')
+
 
 class HomeView(APIView):
     permission_classes = (IsAuthenticated, )
@@ -51,52 +73,8 @@ class CreatePPTView(APIView):
 
             logger.info(f"Received prompt: {prompt}")
 
-            template = f"""
-            I'm an {job_role} with a {specialization} specialization who is going to give you some data/content on an idea that I have.
-            Your job is to generate sensible content pertaining to the idea and generate slides for it. 
-            Give approximately 10-12 slides with each slide having around 3-5 bullet points. 
-            The slides should be in the order they should be presented. 
-            Also highlight talking points that seem important to the user.
-            GIVE THE RESPONSE IN THE FORMAT OF A JSON OBJECT. The JSON object should be formatted as follows:
-            {{  
-                "title": "Presentation Title",
-                "slides": [
-                    {{
-                        "title": "Slide 1 Title",
-                        "content": ["Bullet point 1", "Bullet point 2", "Bullet point 3", ...]
-                    }},
-                    ...
-                ],
-                "talking_points": ["Talking point 1", "Talking point 2", ...]
-            }}
-
-            Generate content based on this: 
-            {prompt}
-            """
-
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "user",
-                        "content": template
-                    }
-                ],
-                model="llama3-8b-8192",
-            )
-
-            response = chat_completion.choices[0].message.content
-
-            logger.info("Received response from API")
-
-
-
             try:
-                # First try to parse the response directly as JSON
-                try:
-                    parsed_response = json.loads(response)
-                except json.JSONDecodeError:
-                    # If direct parsing fails, try to extract JSON from markdown
-                    parsed_response = extract_json_from_response(response)
+                parsed_response = generate_presentation_data(job_role, specialization, prompt)
 
                 presentation = Presentation.objects.create(
                     user=request.user,
@@ -115,8 +93,9 @@ class CreatePPTView(APIView):
                     },
                     status=201
                 )
+            except PresentationSchemaError as e:
+                return JsonResponse({"error": f"Presentation does not match the deck schema: {str(e)}"}, status=500)
             except (json.JSONDecodeError, ValueError) as e:
-                logger.error(f"Invalid JSON in API response: {response}")
                 return JsonResponse({"error": f"Invalid JSON in API response: {str(e)}"}, status=500)
 
         except json.JSONDecodeError:
@@ -127,19 +106,137 @@ class CreatePPTView(APIView):
             return JsonResponse({"error": str(e)}, status=500)
 
 
+class StreamPPTView(APIView):
+    permission_classes = (IsAuthenticated, )
+    def post(self, request):
+        """Streams slides as server-sent events while the deck is being generated."""
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in request body")
+            return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+
+        prompt = data.get("prompt")
+        if not prompt:
+            return JsonResponse({"error": "Prompt is required"}, status=400)
+
+        logger.info(f"Received streaming prompt: {prompt}")
+
+        events = self.stream_slides(request.user, prompt)
+        if isinstance(request._request, ASGIRequest):
+            events = iterate_in_thread(events)
+
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def stream_slides(self, user, prompt):
+        """Yields one ``slide`` event per finished slide, then persists the deck."""
+        parser = SlideStreamParser()
+        try:
+            index = 0
+            for delta in stream_presentation_completion(user.job_role, user.specialization, prompt):
+                for slide in parser.feed(delta):
+                    yield sse_event("slide", {"index": index, "slide": slide})
+                    index += 1
+
+            parsed_response = parse_presentation_response(parser.buffer)
+            presentation = Presentation.objects.create(
+                user=user,
+                title=parsed_response.get("title", "Untitled Presentation"),
+                description=prompt,
+                data=parsed_response
+            )
+            logger.info("Created streamed presentation")
+
+            yield sse_event("done", {
+                "presentation_id": presentation.id,
+                "title": presentation.title,
+                "talking_points": parsed_response.get("talking_points", []),
+            })
+        except PresentationSchemaError as e:
+            logger.error(f"Streamed presentation does not match the deck schema: {parser.buffer}")
+            yield sse_event("error", {"error": f"Presentation does not match the deck schema: {str(e)}"})
+        except (json.JSONDecodeError, ValueError) as e:
+            logger.error(f"Invalid JSON in streamed API response: {parser.buffer}")
+            yield sse_event("error", {"error": f"Invalid JSON in API response: {str(e)}"})
+        except Exception as e:
+            logger.exception("An error occurred while streaming the presentation")
+            yield sse_event("error", {"error": str(e)})
+
+
+class CreatePPTJobView(APIView):
+    permission_classes = (IsAuthenticated, )
+    def post(self, request):
+        """Queues a presentation generation job and returns its id immediately."""
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            logger.error("Invalid JSON in request body")
+            return JsonResponse({"error": "Invalid JSON in request body"}, status=400)
+
+        prompt = data.get("prompt")
+        if not prompt:
+            return JsonResponse({"error": "Prompt is required"}, status=400)
+
+        job = PresentationJob.objects.create(user=request.user, prompt=prompt)
+        enqueue_presentation_job(job)
+        logger.info(f"Queued presentation job {job.id}")
+
+        return JsonResponse(
+            {
+                "message": "Presentation generation started",
+                "job_id": str(job.id),
+                "status": "PENDING",
+                "status_url": reverse('ppt-job', kwargs={'job_id': job.id}),
+            },
+            status=202
+        )
+
+
+class PresentationJobView(APIView):
+    permission_classes = (IsAuthenticated, )
+    def get(self, request, job_id):
+        """Reports the progress of a generation job and its result once ready."""
+        job = get_object_or_404(PresentationJob, id=job_id, user=request.user)
+        fail_stale_presentation_job(job)
+        content = {
+            "job_id": str(job.id),
+            "status": job.status,
+        }
+        if job.status == 'COMPLETED' and job.presentation_id:
+            content["presentation_id"] = job.presentation_id
+            content["title"] = job.presentation.title
+        elif job.status == 'FAILED':
+            content["error"] = job.error
+        return Response(content, status=status.HTTP_200_OK)
+
+
 class UserPPTView(APIView):
     permission_classes = (IsAuthenticated, )
     def get(self, request):
+        """Lists the user's presentations newest first, one cursor page at a time."""
         try: 
-            user = request.user
-            presentations = Presentation.objects.filter(user=user)
-            serializer = PresentationSerializer(presentations, many=True)
+            presentations = Presentation.objects.filter(user=request.user).only(*SUMMARY_FIELDS)
+            paginator = PresentationCursorPagination()
+            page = paginator.paginate_queryset(presentations, request, view=self)
+            serializer = PresentationSummarySerializer(page, many=True)
             logger.info("Delivered user presentations successfully")
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return paginator.get_paginated_response(serializer.data)
         except Exception as e:
-            logger.error("Error in user presentations view: ", str(e))
+            logger.error(f"Error in user presentations view: {str(e)}")
             return JsonResponse({"error": str(e)}, status=500)
 
+
+class PresentationDetailView(APIView):
+    permission_classes = (IsAuthenticated, )
+    def get(self, request, id):
+        """Returns a single presentation including its full deck."""
+        presentation = get_object_or_404(Presentation, id=id, user=request.user)
+        serializer = PresentationSerializer(presentation)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 class UpdatePresentationView(APIView):
     permission_classes = (IsAuthenticated, )
     def put(self, request, id):
@@ -178,124 +275,203 @@ class DeletePresentationView(APIView):
             return JsonResponse({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ProjectListCreateView(APIView):
+class ProjectListCreateView(AsyncAPIView):
     permission_classes = (IsAuthenticated,)
 
-    def get(self, request):
+    async def get(self, request):
         """Get all projects for the authenticated user."""
-        projects = Project.objects.filter(user=request.user)
+        projects = [project async for project in Project.objects.filter(user=request.user)]
         serializer = ProjectSerializer(projects, many=True)
         return Response(serializer.data)
 
-    def post(self, request):
+    async def post(self, request):
         """Create a new project for the authenticated user."""
         serializer = ProjectSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save(user=request.user)
+        if await avalidate(serializer):
+            serializer.instance = await Project.objects.acreate(**{**serializer.validated_data, 'user': request.user})
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class ProjectDetailView(APIView):
+class ProjectDetailView(AsyncAPIView):
     permission_classes = (IsAuthenticated,)
 
-    def get_project(self, request, id):
-        return get_object_or_404(Project, id=id, user=request.user)
+    async def get_project(self, request, id):
+        return await aget_object_or_404(Project, id=id, user=request.user)
 
-    def get(self, request, id):
-        project = self.get_project(request, id)
+    async def get(self, request, id):
+        project = await self.get_project(request, id)
         serializer = ProjectSerializer(project)
         return Response(serializer.data)
 
-    def put(self, request, id):
-        project = self.get_project(request, id)
+    async def put(self, request, id):
+        project = await self.get_project(request, id)
         serializer = ProjectSerializer(project, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
+        if await avalidate(serializer):
+            for attr, value in serializer.validated_data.items():
+                setattr(project, attr, value)
+            await project.asave()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def delete(self, request, id):
-        project = self.get_project(request, id)
-        project.delete()
+    async def delete(self, request, id):
+        project = await self.get_project(request, id)
+        await project.adelete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class TaskListCreateView(APIView):
+class TaskListCreateView(AsyncAPIView):
     permission_classes = (IsAuthenticated,)
 
-    def get(self, request, project_id=None):
+    async def get(self, request, project_id=None):
         """Get tasks for a specific project or all tasks if no project_id."""
         if project_id:
-            project = get_object_or_404(Project, id=project_id, user=request.user)
+            project = await aget_object_or_404(Project, id=project_id, user=request.user)
             tasks = Task.objects.filter(project=project)
         else:
             tasks = Task.objects.filter(user=request.user)
-        serializer = TaskSerializer(tasks, many=True)
+        serializer = TaskSerializer([task async for task in tasks], many=True)
         return Response(serializer.data)
 
-    def post(self, request, project_id):
+    async def post(self, request, project_id):
         """Create a new task for a specific project."""
-        project = get_object_or_404(Project, id=project_id, user=request.user)
-        
+        project = await aget_object_or_404(Project, id=project_id, user=request.user)
+
         # Ensure the request data includes required fields
         data = request.data.copy()
         data['project'] = project.id  # Explicitly set project
-        
+
         serializer = TaskSerializer(data=data, context={'request': request})
-        if serializer.is_valid():
-            serializer.save(project=project)  # Assign user and project explicitly
+        if await avalidate(serializer):
+            # Assign user and project explicitly
+            serializer.instance = await Task.objects.acreate(
+                **{**serializer.validated_data, 'project': project, 'user': request.user}
+            )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class TaskDetailView(APIView):
+class TaskDetailView(AsyncAPIView):
     permission_classes = (IsAuthenticated,)
 
-    def get_task(self, request, id):
-        task = get_object_or_404(Task, id=id)
-        if task.project.user != request.user:  # Ensure the user owns the project
-            return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
+    async def get_task(self, request, id):
+        task = await aget_object_or_404(Task.objects.select_related('project'), id=id)
+        if task.project.user_id != request.user.pk:  # Ensure the user owns the project
+            raise PermissionDenied('Unauthorized')
         return task
 
-
-    def get(self, request, id):
-        task = self.get_task(request, id)
+    async def get(self, request, id):
+        task = await self.get_task(request, id)
         serializer = TaskSerializer(task)
         return Response(serializer.data)
 
-    def put(self, request, id):
-        task = self.get_task(request, id)
+    async def put(self, request, id):
+        task = await self.get_task(request, id)
         serializer = TaskSerializer(task, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
+        if await avalidate(serializer):
+            for attr, value in serializer.validated_data.items():
+                setattr(task, attr, value)
+            await task.asave()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def delete(self, request, id):
-        task = self.get_task(request, id)
-        task.delete()
+    async def delete(self, request, id):
+        task = await self.get_task(request, id)
+        await task.adelete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class LLMCacheStatsView(APIView):
+    permission_classes = (IsAdminUser, )
+    def get(self, request):
+        """Reports hit/miss counters of the completion cache for this process."""
+        cache = get_completion_cache()
+        if cache is None:
+            return Response({"enabled": False}, status=status.HTTP_200_OK)
+        return Response({"enabled": True, **cache.stats()}, status=status.HTTP_200_OK)
+
+
 class GetTranscriptView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request):
-        """Fetches a mock transcript from a file inside the 'data' folder."""
-        mock_transcript = '{"conversations": [{"timestamp": "2025-02-25T02:57:31.873907","speaker": "Bot","text": "Hey, ready to tell me your completed tasks and your new tasks?"},{"timestamp": "2025-02-25T02:57:39.144934","speaker": "User","text": "Yeah."},{"timestamp": "2025-02-25T02:57:46.606046","speaker": "User","text": "So I\'ve pasted a front end, and I\'ve created a dataset."},{"timestamp": "2025-02-25T02:58:10.123456","speaker": "User","text": "I also set up the API for fetching presentation data and integrated it with the frontend."},{"timestamp": "2025-02-25T02:58:18.654321","speaker": "User","text": "And I implemented authentication using JWT tokens in Django."},{"timestamp": "2025-02-25T02:58:25.789012","speaker": "User","text": "So there\'s nothing left?"},{"timestamp": "2025-02-25T02:58:27.453830","speaker": "User","text": "Uh,"},{"timestamp": "2025-02-25T02:58:30.123456","speaker": "User","text": "Oh, my project is almost complete."},{"timestamp": "2025-02-25T02:58:35.987654","speaker": "Bot","text": "That’s great! Do you have any final tasks left to polish it up?"},{"timestamp": "2025-02-25T02:58:42.654321","speaker": "User","text": "Actually, yeah. I need to refine the UI design, add error handling, and improve the presentation generation quality."},{"timestamp": "2025-02-25T02:58:50.987654","speaker": "User","text": "Also, I need to test the entire flow end-to-end and fix any issues that come up."},{"timestamp": "2025-02-25T02:58:55.321987","speaker": "Bot","text": "Nice! Once you finish those, your project should be solid. Let me know if you need help."},{"timestamp": "2025-02-25T02:59:02.654321","speaker": "User","text": "Will do. Thanks!"}]}'
-        # if not os.path.exists(transcript_path):
-        #     logger.error("Transcript file not found")
-        #     return Response({"error": "Transcript file not found"}, status=status.HTTP_404_NOT_FOUND)
+        """Returns the user's most recent transcript as recorded by the voice agent."""
+        transcript = Transcript.objects.filter(user=request.user).order_by('-created_at').first()
+        if transcript is None:
+            return Response({"error": "No transcript found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(
+            {
+                "session": str(transcript.id),
+                "status": transcript.status,
+                "conversations": UtteranceSerializer(transcript.utterances.all(), many=True).data,
+                "result": transcript.result,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class TranscriptSessionView(APIView):
+    permission_classes = (IsAuthenticated,)
 
-        try:
-            # with open(transcript_path, "r", encoding="utf-8") as file:
-            #     mock_transcript = file.read()
+    def post(self, request):
+        """Opens a transcript for a new voice session; the id is passed to the agent as its ticket."""
+        transcript = Transcript.objects.create(user=request.user)
+        return Response({"session": str(transcript.id)}, status=status.HTTP_201_CREATED)
 
-            return Response(json.loads(mock_transcript), status=status.HTTP_200_OK)
 
-        except Exception as e:
-            logger.error(f"Error reading transcript file: {str(e)}")
-            return Response({"error": "Failed to read transcript file"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+class TranscriptIngestView(APIView):
+    authentication_classes = ()
+    permission_classes = (HasIngestToken,)
+
+    def post(self, request):
+        """Stores a batch of utterances from the voice agent and schedules analysis of the new ones.
+
+        Utterances are keyed by their sequence number, so retried batches are not stored twice.
+        A final batch sent again after processing failed runs processing once more.
+        """
+        serializer = TranscriptIngestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        with transaction.atomic():
+            transcript = Transcript.objects.select_for_update().filter(id=data["session"]).first()
+            if transcript is None:
+                return Response({"error": "Transcript not found"}, status=status.HTTP_404_NOT_FOUND)
+            retrying = transcript.status == 'FAILED' and data["final"]
+            if transcript.status != 'OPEN' and not retrying:
+                return Response({"error": "Transcript is already closed"}, status=status.HTTP_409_CONFLICT)
+
+            utterances = data.get("utterances", [])
+            Utterance.objects.bulk_create(
+                [Utterance(transcript=transcript, **utterance) for utterance in utterances],
+                ignore_conflicts=True,
+            )
 
+            update_fields = []
+            if data.get("room") and not transcript.room_name:
+                transcript.room_name = data["room"]
+                update_fields.append('room_name')
+            if data["final"]:
+                transcript.status = 'ENDED'
+                transcript.ended_at = transcript.ended_at or timezone.now()
+                transcript.error = ''
+                update_fields += ['status', 'ended_at', 'error']
+            if update_fields:
+                transcript.save(update_fields=update_fields)
+
+        if data["final"]:
+            logger.info(f"Transcript {transcript.id} ended with a batch of {len(utterances)} utterances")
+            enqueue_transcript_processing(transcript)
+        elif utterances:
+            # Analyze the call in windows as it runs, so the final step only has the tail left
+            window = getattr(settings, 'TRANSCRIPT_ANALYSIS_WINDOW', DEFAULT_ANALYSIS_WINDOW)
+            # A running analysis keeps going while full windows are left, so it picks these up
+            if analysis_in_progress(transcript):
+                logger.info(f"Transcript {transcript.id} is already being analyzed")
+            elif max(u["sequence"] for u in utterances) - transcript.analyzed_sequence >= window:
+                enqueue_transcript_analysis(transcript)
+
+        return Response({"received": len(utterances), "status": transcript.status}, status=status.HTTP_202_ACCEPTED)
 
 
 class ProcessTranscriptView(APIView):
@@ -344,95 +520,8 @@ class ProcessTranscriptView(APIView):
 
     def analyze_transcript_with_llm(self, transcript):
         """Calls LLM to extract completed and new tasks from the transcript."""
-        template = f"""
-        You are an AI assistant analyzing a conversation transcript. Your task is to:
-        - Identify **tasks the user has completed**.
-        - Identify **new tasks the user should work on**.
-
-        ### **Response Format (ONLY JSON)**
-        ```json
-        {{
-            "completed_tasks": ["Completed Task 1", "Completed Task 2"],
-            "new_tasks": [
-                {{"title": "New Task 1", "description": "Details about Task 1"}},
-                {{"title": "New Task 2", "description": "Details about Task 2"}}
-            ]
-        }}
-        ```
-
-        **Transcript:**  
-        {transcript}
-        """
-
-        try:
-            chat_completion = client.chat.completions.create(
-                messages=[{"role": "user", "content": template}],
-                model="llama3-8b-8192",
-            )
-
-            response = chat_completion.choices[0].message.content
-            logger.info(f"Raw LLM Response: {response}")
-
-            # Extract JSON properly
-            match = re.search(r'```json\n(.*?)\n```', response, re.DOTALL)
-            if match:
-                response_cleaned = match.group(1).strip()
-            else:
-                # Fallback: Try to extract anything that looks like JSON
-                response_cleaned = re.search(r'{.*}', response, re.DOTALL)
-                response_cleaned = response_cleaned.group(0).strip() if response_cleaned else ""
-
-            if not response_cleaned:
-                logger.error(f"LLM returned invalid JSON: {response}")
-                return {"completed_tasks": [], "new_tasks": []}
-
-            logger.info(f"Extracted JSON from LLM: {response_cleaned}")
-
-            # Parse JSON
-            parsed_response = json.loads(response_cleaned)
-
-            return parsed_response
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON from LLM: {str(e)} | Response: {response}")
-            return {"completed_tasks": [], "new_tasks": []}
-        except Exception as e:
-            logger.error(f"Error in LLM analysis: {str(e)}")
-            return {"completed_tasks": [], "new_tasks": []}
+        return analyze_transcript(transcript)
 
     def process_tasks(self, user, completed_tasks, new_tasks):
         """Updates the database with completed and new tasks."""
-        project = Project.objects.filter(user=user).first()
-
-        if not project:
-            logger.error(f"No active project found for user {user}. Cannot assign tasks.")
-            return Response({"error": "No active project found for user."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Process completed tasks
-        for task_title in completed_tasks:
-            task = Task.objects.filter(user=user, project=project, title=task_title).first()
-            if task:
-                if task.status != "COMPLETED":
-                    task.status = "COMPLETED"
-                    task.save()
-                    logger.info(f"Task '{task_title}' marked as completed.")
-            else:
-                Task.objects.create(user=user, project=project, title=task_title, status="COMPLETED")
-                logger.info(f"Completed task '{task_title}' created.")
-
-        # Process new tasks
-        for task_data in new_tasks:
-            task, created = Task.objects.get_or_create(
-                user=user,
-                project=project,
-                title=task_data["title"],
-                defaults={
-                    "description": task_data["description"],
-                    "status": "TODO"
-                },
-            )
-            if created:
-                logger.info(f"New task added: {task.title}")
-            else:
-                logger.info(f"Task '{task.title}' already exists. Skipping duplicate.")
-
+        return apply_transcript_tasks(user, completed_tasks, new_tasks)
@@ -0,0 +1,55 @@
+from asgiref.sync import sync_to_async
+from django.db import router
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import TokenUser
+from .tokens import USER_CLAIMS
+
+
+class TokenClaimsAuthentication(JWTAuthentication):
+    """JWT authentication that builds ``request.user`` from the token's claims.
+
+    The signature already proves the claims, so no query is made to set the
+    user; fields not carried in the token are loaded on first access (see
+    ``TokenUser``). As with any stateless token, a user deactivated after the
+    token was issued keeps access until it expires. Tokens issued without the
+    profile claims fall back to loading the user.
+    """
+
+    async def aauthenticate(self, request):
+        """``authenticate`` for async views: inline for claims tokens, in a thread when the user must be loaded."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if not self.has_user_claims(validated_token):
+            return await sync_to_async(super().get_user)(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def has_user_claims(self, validated_token):
+        return all(claim in validated_token for claim in USER_CLAIMS)
+
+    def get_user(self, validated_token):
+        if not self.has_user_claims(validated_token):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+        values = {
+            TokenUser._meta.pk.attname: TokenUser._meta.pk.to_python(user_id),
+            **{claim: validated_token[claim] for claim in USER_CLAIMS},
+        }
+        fields = [field.attname for field in TokenUser._meta.concrete_fields if field.attname in values]
+        return TokenUser.from_db(
+            router.db_for_read(TokenUser), fields, [values[attname] for attname in fields]
+        )
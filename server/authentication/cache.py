@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TokenUser, User
+
+import threading
+import time
+
+
+DEFAULT_USER_CACHE_SIZE = 256
+DEFAULT_USER_CACHE_TTL = 60
+
+_rows = OrderedDict()
+_rows_lock = threading.Lock()
+
+
+def get_user_row(user_id):
+    """Returns the user's field values keyed by attname, loading the row on a miss.
+
+    Rows are kept in a small least-recently-used cache per process for at
+    most ``AUTH_USER_CACHE_TTL`` seconds. Saves and deletes made in this
+    process drop the user's row through the signal handlers below; changes
+    made by other processes show up once the row expires.
+    """
+    with _rows_lock:
+        entry = _rows.get(user_id)
+        if entry is not None:
+            row, loaded_at = entry
+            if time.monotonic() - loaded_at < getattr(settings, 'AUTH_USER_CACHE_TTL', DEFAULT_USER_CACHE_TTL):
+                _rows.move_to_end(user_id)
+                return row
+            del _rows[user_id]
+    return load_user_row(user_id)
+
+
+def load_user_row(user_id):
+    """Reads the user's row from the database and caches it, bypassing any cached copy."""
+    attnames = [field.attname for field in User._meta.concrete_fields]
+    row = User.objects.filter(pk=user_id).values(*attnames).get()
+
+    with _rows_lock:
+        _rows[user_id] = (row, time.monotonic())
+        _rows.move_to_end(user_id)
+        while len(_rows) > getattr(settings, 'AUTH_USER_CACHE_SIZE', DEFAULT_USER_CACHE_SIZE):
+            _rows.popitem(last=False)
+    return row
+
+
+def invalidate_user(user_id):
+    with _rows_lock:
+        _rows.pop(user_id, None)
+
+
+def clear_user_cache():
+    with _rows_lock:
+        _rows.clear()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=TokenUser)
+def invalidate_saved_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
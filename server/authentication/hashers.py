@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+import os
+import threading
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-ins in progress, please try again shortly.'
+    default_code = 'hashing_pool_busy'
+    # Sent as Retry-After by DRF's exception handler
+    wait = 1
+
+
+_executor = None
+_slots = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def hashing_config():
+    return getattr(settings, 'PASSWORD_HASHING', {})
+
+
+def get_hashing_pool():
+    """Returns the process-wide hashing pool and the semaphore bounding how many hashes it admits."""
+    global _executor, _slots
+    with _pool_lock:
+        if _executor is None:
+            config = hashing_config()
+            workers = config.get('WORKERS') or os.cpu_count() or 1
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            _slots = threading.BoundedSemaphore(workers + config.get('QUEUE', 0))
+    return _executor, _slots
+
+
+def run_hash(fn, *args):
+    """Runs a password hash on the hashing pool and waits for the result.
+
+    Request threads would otherwise all hash at once and starve each other
+    of CPU during a signup burst. The pool caps concurrent hashes at
+    ``WORKERS`` with at most ``QUEUE`` more waiting; a request that cannot
+    get a slot within ``QUEUE_TIMEOUT`` seconds fails fast with a 503
+    instead of adding to the backlog.
+    """
+    config = hashing_config()
+    if not config.get('ENABLED', True) or getattr(_local, 'in_pool', False):
+        return fn(*args)
+
+    executor, slots = get_hashing_pool()
+    if not slots.acquire(timeout=config.get('QUEUE_TIMEOUT', 0.5)):
+        raise HashingPoolBusy()
+    try:
+        return executor.submit(_call_in_pool, fn, args).result()
+    finally:
+        slots.release()
+
+
+def _call_in_pool(fn, args):
+    # A hasher's verify() calls its own encode(), which must not queue behind itself
+    _local.in_pool = True
+    try:
+        return fn(*args)
+    finally:
+        _local.in_pool = False
+
+
+class PooledHasherMixin:
+    def encode(self, password, salt, *args, **kwargs):
+        return run_hash(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return run_hash(super().verify, password, encoded)
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    """Argon2id with the cost parameters from ``PASSWORD_HASHING['ARGON2']``.
+
+    Hashes made with other parameters are re-encoded on the next login.
+    """
+
+    @property
+    def time_cost(self):
+        return hashing_config().get('ARGON2', {}).get('TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return hashing_config().get('ARGON2', {}).get('MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return hashing_config().get('ARGON2', {}).get('PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return hashing_config().get('PBKDF2_ITERATIONS') or hashers.PBKDF2PasswordHasher.iterations
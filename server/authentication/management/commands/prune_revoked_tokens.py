@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from authentication.revocation import prune_revoked_tokens
+
+
+class Command(BaseCommand):
+    help = 'Deletes revoked refresh tokens that have expired.'
+
+    def handle(self, *args, **options):
+        deleted = prune_revoked_tokens()
+        self.stdout.write(f'Pruned {deleted} expired revoked tokens')
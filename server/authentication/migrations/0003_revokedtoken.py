@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:00
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_blacklisted_tokens(apps, schema_editor):
+    # Carry over unexpired revocations from simplejwt's token_blacklist tables
+    # (the app is no longer installed, so they are read directly if present)
+    connection = schema_editor.connection
+    tables = connection.introspection.table_names()
+    if 'token_blacklist_blacklistedtoken' not in tables:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO authentication_revokedtoken (jti, expires_at) '
+            'SELECT o.jti, o.expires_at FROM token_blacklist_blacklistedtoken b '
+            'JOIN token_blacklist_outstandingtoken o ON o.id = b.token_id '
+            'WHERE o.expires_at > %s',
+            [timezone.now()],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_tokenuser'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(copy_blacklisted_tokens, migrations.RunPython.noop),
+    ]
@@ -9,3 +9,34 @@ class User(AbstractUser):
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
+
+
+class RevokedToken(models.Model):
+    """Refresh token revoked by rotation or logout, kept only until the token expires."""
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
+class TokenUser(User):
+    """User built from access token claims, without a query.
+
+    Only the fields carried in the token are set; reading any other field
+    loads the whole row once, through the per-process user cache, instead
+    of one query per field.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is None or from_queryset is not None or not deferred.issuperset(fields):
+            return super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+        from .cache import get_user_row
+        row = get_user_row(self.pk)
+        for attname in deferred:
+            setattr(self, attname, row[attname])
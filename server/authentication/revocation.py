@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('authentication')
+
+DEFAULT_SWEEP_INTERVAL = 60 * 60
+
+_last_sweep = 0.0
+_sweep_lock = threading.Lock()
+
+
+def is_revoked(jti):
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke_token(jti, expires_at):
+    """Records a refresh token as revoked. Returns ``False`` if it already was.
+
+    The JTI is the primary key, so of two requests racing to rotate the same
+    token only one gets to revoke it.
+    """
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+    sweep_revoked_tokens()
+    return True
+
+
+def prune_revoked_tokens(now=None):
+    """Deletes revocations of tokens that have expired and returns how many were removed.
+
+    An expired token is rejected on its ``exp`` claim before the revocation
+    check runs, so its row is no longer needed.
+    """
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
+
+
+def sweep_revoked_tokens():
+    """Prunes expired revocations at most once per ``REVOKED_TOKEN_SWEEP_INTERVAL`` seconds per process."""
+    global _last_sweep
+    interval = getattr(settings, 'REVOKED_TOKEN_SWEEP_INTERVAL', DEFAULT_SWEEP_INTERVAL)
+    with _sweep_lock:
+        now = time.monotonic()
+        if _last_sweep and now - _last_sweep < interval:
+            return
+        _last_sweep = now
+    try:
+        deleted = prune_revoked_tokens()
+    except Exception as e:
+        logger.error(f"Pruning revoked tokens failed: {str(e)}")
+        return
+    if deleted:
+        logger.info(f"Pruned {deleted} expired revoked tokens")
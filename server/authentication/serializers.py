@@ -1,7 +1,60 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .cache import load_user_row
 from .models import User
+from .revocation import is_revoked
+from .tokens import USER_CLAIMS, ClaimsRefreshToken
+
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'job_role', 'specialization']
+
+
+class TokenObtainPairSerializer(jwt_serializers.TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        # Always read the row: the cached copy may predate a change made by another worker
+        try:
+            user = load_user_row(User._meta.pk.to_python(refresh[api_settings.USER_ID_CLAIM]))
+        except (KeyError, User.DoesNotExist):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        if not user['is_active']:
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        # Re-stamp the profile claims so refreshed access tokens pick up profile changes
+        for claim in USER_CLAIMS:
+            refresh[claim] = user[claim]
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs['token'])
+        if is_revoked(token.get(api_settings.JTI_CLAIM)):
+            raise serializers.ValidationError('Token is blacklisted')
+        return {}
@@ -0,0 +1,42 @@
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .revocation import is_revoked, revoke_token
+
+
+# Profile fields signed into every token so requests can be authenticated
+# without loading the user (see authentication.authentication)
+USER_CLAIMS = ('email', 'job_role', 'specialization')
+
+
+def stamp_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying the user's profile claims, which its access tokens inherit.
+
+    Issuing a token writes nothing; only revoked ones are stored, by JTI, in
+    ``RevokedToken`` until they expire. ``blacklist`` keeps simplejwt's name
+    so its refresh serializer revokes the old token on rotation.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        return stamp_user_claims(super().for_user(user), user)
+
+    def verify(self):
+        super().verify()
+        self.check_blacklist()
+
+    def check_blacklist(self):
+        if is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        if not revoke_token(self[api_settings.JTI_CLAIM], datetime_from_epoch(self['exp'])):
+            raise TokenError('Token is blacklisted')
@@ -1,13 +1,16 @@
 from django.shortcuts import render
 from django.contrib.auth import get_user_model 
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .hashers import HashingPoolBusy
 from .serializers import UserSerializer
+from .tokens import ClaimsRefreshToken
 
 import logging
 
@@ -28,14 +31,18 @@ class SignupView(APIView):
             logger.info("User missed a field")
             return Response({'error': 'All fields are required'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if User.objects.filter(email=email).exists():
-            logger.info("Email already registered")
-            return Response({'error': 'Email already registered'}, status=status.HTTP_400_BAD_REQUEST)
-
         try:
-            user = User.objects.create_user(username=username, email=email, password=password)
+            # Hash before opening the transaction, so only the insert runs inside it
+            user = User(
+                username=User.normalize_username(username),
+                email=User.objects.normalize_email(email),
+                password=make_password(password),
+            )
+            # The unique constraint on email rejects duplicates; no separate lookup up front
+            with transaction.atomic():
+                user.save()
             logger.info("User created successfully")
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             logger.info("Refresh token generated")
             
             return Response({
@@ -46,6 +53,15 @@ class SignupView(APIView):
                     'access': str(refresh.access_token),
                 }
             }, status=status.HTTP_201_CREATED)
+        except IntegrityError:
+            if User.objects.filter(email=email).exists():
+                logger.info("Email already registered")
+                return Response({'error': 'Email already registered'}, status=status.HTTP_400_BAD_REQUEST)
+            logger.info("Username already taken")
+            return Response({'error': 'Username already taken'}, status=status.HTTP_400_BAD_REQUEST)
+        except HashingPoolBusy:
+            logger.warning("Signup rejected, password hashing pool is full")
+            raise
         except Exception as e: 
             logger.error(f"User creation failed: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -83,11 +99,17 @@ class SelectRoleView(APIView):
 
             request.user.job_role = job_role
             request.user.specialization = specialization
-            request.user.save()
-                
+            # Saving drops the cached row; the new tokens carry the updated claims
+            request.user.save(update_fields=['job_role', 'specialization'])
+            refresh = ClaimsRefreshToken.for_user(request.user)
+
             return Response({
                 'message': 'Profile updated successfully',
-                'user': UserSerializer(request.user).data
+                'user': UserSerializer(request.user).data,
+                'tokens': {
+                    'refresh': str(refresh),
+                    'access': str(refresh.access_token),
+                }
             })
         except Exception as e:
             logger.error(f"Error in select_role_view: {str(e)}")
@@ -108,7 +130,7 @@ class LogoutView(APIView):
                 logger.info("Refresh token not provided")
                 return Response({'error': 'Refresh token required'}, status=status.HTTP_400_BAD_REQUEST)
 
-            token = RefreshToken(refresh_token)
+            token = ClaimsRefreshToken(refresh_token)
             token.blacklist()
             logger.info("Logout successful")
             return Response({'message': 'Logout successful'}, status=status.HTTP_205_RESET_CONTENT)
@@ -0,0 +1,76 @@
+"""Compares the old regex JSON extraction with the single-pass scanner.
+
+Runs both over the model output corpus in ``data/llm_outputs.jsonl`` and
+reports per-sample success and the mean time per call.
+
+Usage (from the ``server`` directory):
+    python benchmarks/bench_json_extract.py [--repeat 200]
+"""
+from pathlib import Path
+
+import argparse
+import json
+import re
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api.helpers import extract_json_from_response  # noqa: E402
+
+
+CORPUS = Path(__file__).resolve().parent / 'data' / 'llm_outputs.jsonl'
+
+
+def regex_extract(response_text):
+    """The previous implementation: direct parse, then fence regex, then greedy braces."""
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        pass
+    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+    if json_match:
+        json_str = json_match.group(1)
+    else:
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if not json_match:
+            raise ValueError("No JSON content found in response")
+        json_str = json_match.group(0)
+    return json.loads(json_str.strip())
+
+
+def succeeds(extract, response):
+    try:
+        return isinstance(extract(response), dict)
+    except ValueError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    samples = [json.loads(line) for line in CORPUS.read_text(encoding='utf-8').splitlines() if line]
+
+    print(f"{'sample':<18}{'bytes':>8}{'regex ok':>10}{'scan ok':>9}{'regex us':>11}{'scan us':>10}")
+    totals = {'regex': 0.0, 'scan': 0.0}
+    for sample in samples:
+        response = sample['response']
+        row = []
+        for name, extract in (('regex', regex_extract), ('scan', extract_json_from_response)):
+            seconds = timeit.timeit(lambda: succeeds(extract, response), number=args.repeat) / args.repeat
+            totals[name] += seconds
+            row.append((succeeds(extract, response), seconds * 1e6))
+        (regex_ok, regex_us), (scan_ok, scan_us) = row
+        print(f"{sample['name']:<18}{len(response):>8}{str(regex_ok):>10}{str(scan_ok):>9}{regex_us:>11.1f}{scan_us:>10.1f}")
+
+    regex_passed = sum(succeeds(regex_extract, s['response']) for s in samples)
+    scan_passed = sum(succeeds(extract_json_from_response, s['response']) for s in samples)
+    print()
+    print(f"parsed: regex {regex_passed}/{len(samples)}, scan {scan_passed}/{len(samples)}")
+    print(f"total per pass: regex {totals['regex'] * 1e3:.2f} ms, scan {totals['scan'] * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
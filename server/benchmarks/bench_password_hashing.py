@@ -0,0 +1,99 @@
+"""Cost and signup throughput of the candidate password hasher settings.
+
+For each candidate it prints the median time of one hash, then runs
+--signups hashes from --concurrency request threads at once, first with
+every thread hashing directly and then through the bounded hashing pool,
+and prints throughput and p95 latency for both. Pick the strongest
+candidate whose p95 under burst is still acceptable, and set it in
+``PASSWORD_HASHING`` / ``PASSWORD_HASHER``.
+
+Usage (from the ``server`` directory):
+    python benchmarks/bench_password_hashing.py --signups 200 --concurrency 32
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+# (label, hasher, PASSWORD_HASHING overrides)
+CANDIDATES = [
+    ('pbkdf2 1M iterations (Django default)', 'pbkdf2', {}),
+    ('pbkdf2 600k iterations (OWASP)', 'pbkdf2', {'PBKDF2_ITERATIONS': 600_000}),
+    ('argon2 t=2 m=100MiB p=8 (Django default)', 'argon2',
+     {'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 102400, 'PARALLELISM': 8}}),
+    ('argon2 t=3 m=64MiB p=1', 'argon2', {'ARGON2': {'TIME_COST': 3, 'MEMORY_COST': 65536, 'PARALLELISM': 1}}),
+    ('argon2 t=2 m=19MiB p=1 (OWASP)', 'argon2', {'ARGON2': {'TIME_COST': 2, 'MEMORY_COST': 19456, 'PARALLELISM': 1}}),
+]
+
+
+def configure(hasher, overrides, pooled):
+    from django.contrib.auth.hashers import get_hashers
+    settings.PASSWORD_HASHING = {**settings.PASSWORD_HASHING, **overrides, 'ENABLED': pooled,
+                                 'QUEUE_TIMEOUT': 3600}
+    settings.PASSWORD_HASHERS = [f'authentication.hashers.{HASHERS[hasher]}']
+    get_hashers.cache_clear()
+
+
+HASHERS = {'argon2': 'Argon2PasswordHasher', 'pbkdf2': 'PBKDF2PasswordHasher'}
+
+
+def single_hash_ms(repeat):
+    from django.contrib.auth.hashers import make_password
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        make_password('correct horse battery staple')
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e3
+
+
+def burst(signups, concurrency):
+    from django.contrib.auth.hashers import make_password
+
+    def signup(_):
+        started = time.perf_counter()
+        make_password('correct horse battery staple')
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as requests:
+        latencies = sorted(requests.map(signup, range(signups)))
+    elapsed = time.perf_counter() - started
+    return signups / elapsed, latencies[int(len(latencies) * 0.95)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--signups', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    django.setup()
+    print(f"{os.cpu_count()} CPUs, hashing pool of {settings.PASSWORD_HASHING.get('WORKERS') or os.cpu_count()} workers\n")
+
+    for label, hasher, overrides in CANDIDATES:
+        configure(hasher, overrides, pooled=True)
+        one = single_hash_ms(args.repeat)
+        configure(hasher, overrides, pooled=False)
+        direct_rate, direct_p95 = burst(args.signups, args.concurrency)
+        configure(hasher, overrides, pooled=True)
+        pooled_rate, pooled_p95 = burst(args.signups, args.concurrency)
+        print(f"== {label}: {one:.0f} ms per hash")
+        print(f"   direct: {direct_rate:.1f} signups/s, p95 {direct_p95:.0f} ms")
+        print(f"   pooled: {pooled_rate:.1f} signups/s, p95 {pooled_p95:.0f} ms\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Query plans and latency of the per-user hot queries, with and without indexes.
+
+Builds a throwaway database (a SQLite file by default, or the database from
+the Django settings with --use-settings-db), fills it with --tasks tasks
+spread over --users users, then prints ``EXPLAIN`` output and the median latency of
+each hot query before and after dropping the composite indexes from
+``api.models``.
+
+Usage (from the ``server`` directory):
+    python benchmarks/bench_task_indexes.py --tasks 1000000 --users 1000
+"""
+from pathlib import Path
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+INDEXES = [
+    'presentation_user_created_idx',
+    'task_project_status_idx',
+    'task_user_project_title_idx',
+    'task_open_idx',
+]
+
+
+def setup_database(use_settings_db):
+    if not use_settings_db:
+        path = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+        settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)}
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def populate(task_count, user_count):
+    from django.utils import timezone
+    from authentication.models import User
+    from api.models import Presentation, Project, Task
+
+    tasks_per_user = max(1, task_count // user_count)
+    User.objects.bulk_create(
+        User(username=f'bench{i}', email=f'bench{i}@example.com', password='!') for i in range(user_count)
+    )
+    users = list(User.objects.filter(username__startswith='bench').order_by('id'))
+    Project.objects.bulk_create(Project(user=user, name=f'Project {user.id}') for user in users)
+    projects = {project.user_id: project for project in Project.objects.filter(user__in=users)}
+
+    statuses = ['COMPLETED', 'COMPLETED', 'COMPLETED', 'IN_PROGRESS', 'TODO']
+    now = timezone.now()
+    batch = []
+    for user in users:
+        project = projects[user.id]
+        for i in range(tasks_per_user):
+            batch.append(Task(
+                user=user, project=project, title=f'Task {i} for user {user.id}',
+                status=statuses[i % len(statuses)], created_at=now,
+            ))
+            if len(batch) >= 20000:
+                Task.objects.bulk_create(batch)
+                batch = []
+    Task.objects.bulk_create(batch)
+
+    Presentation.objects.bulk_create(
+        Presentation(user=user, title=f'Deck {i}', data={'slides': []}, created_at=now)
+        for user in users[:100] for i in range(20)
+    )
+    return users[len(users) // 2], projects[users[len(users) // 2].id], tasks_per_user
+
+
+def hot_queries(user, project, tasks_per_user):
+    from api.models import Presentation, Task
+
+    title = f'Task {tasks_per_user // 2} for user {user.id}'
+    return {
+        'tasks by user': Task.objects.filter(user=user),
+        'tasks by project+status': Task.objects.filter(project=project, status='TODO'),
+        'task by user+project+title': Task.objects.filter(user=user, project=project, title=title),
+        'open tasks for user': Task.objects.filter(user=user, project=project).exclude(status='COMPLETED'),
+        'presentations newest first': Presentation.objects.filter(user=user).order_by('-created_at', '-id')[:20],
+    }
+
+
+def measure(queries, repeat):
+    results = {}
+    for name, queryset in queries.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append(time.perf_counter() - started)
+        results[name] = (statistics.median(timings) * 1e3, queryset.explain())
+    return results
+
+
+def drop_indexes():
+    from django.db import connection
+    with connection.cursor() as cursor:
+        for name in INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {name}')
+    # Reconnect so no statement prepared against the old schema is reused
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--use-settings-db', action='store_true',
+                        help='benchmark against the configured database instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    setup_database(args.use_settings_db)
+    started = time.perf_counter()
+    user, project, tasks_per_user = populate(args.tasks, args.users)
+    print(f"Inserted {tasks_per_user * args.users} tasks in {time.perf_counter() - started:.1f}s\n")
+
+    with_indexes = measure(hot_queries(user, project, tasks_per_user), args.repeat)
+    drop_indexes()
+    without_indexes = measure(hot_queries(user, project, tasks_per_user), args.repeat)
+
+    for name, (indexed_ms, indexed_plan) in with_indexes.items():
+        plain_ms, plain_plan = without_indexes[name]
+        print(f"== {name}: {indexed_ms:.2f} ms with indexes, {plain_ms:.2f} ms without")
+        print(f"   with:    {indexed_plan}")
+        print(f"   without: {plain_plan}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Refresh latency as the revoked-token table grows, and what pruning leaves of it.
+
+Builds a throwaway database (a SQLite file by default, or the database from
+the Django settings with --use-settings-db) and inserts revocations the way
+--rotations token rotations would, in steps. After each step it times
+--repeat real refreshes through the refresh serializer (the revocation
+check, the insert for the rotated token and the claim stamping). Inserted
+tokens expire evenly over the last --days days of rotations, as they would
+with a one-day refresh lifetime and steady traffic, so the final prune shows
+how many rows a running deployment actually keeps.
+
+Usage (from the ``server`` directory):
+    python benchmarks/bench_token_refresh.py --rotations 2000000
+"""
+from pathlib import Path
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+
+def setup_database(use_settings_db):
+    if not use_settings_db:
+        path = Path(tempfile.mkdtemp()) / 'bench.sqlite3'
+        settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)}
+    # Keep the sweeper out of the timings; pruning is measured separately
+    settings.REVOKED_TOKEN_SWEEP_INTERVAL = float('inf')
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def insert_revocations(count, start, total, days):
+    from datetime import timedelta
+    from django.utils import timezone
+    from authentication.models import RevokedToken
+
+    # Rotation i happened (total - i) / total * days ago; its token expires a day later
+    now = timezone.now()
+    batch = []
+    for i in range(start, start + count):
+        rotated_at = now - timedelta(days=days * (total - i) / total)
+        batch.append(RevokedToken(jti=uuid.uuid4().hex, expires_at=rotated_at + timedelta(days=1)))
+        if len(batch) >= 20000:
+            RevokedToken.objects.bulk_create(batch)
+            batch = []
+    RevokedToken.objects.bulk_create(batch)
+
+
+def measure_refresh(user, repeat):
+    from authentication.serializers import TokenRefreshSerializer
+    from authentication.tokens import ClaimsRefreshToken
+
+    refresh = str(ClaimsRefreshToken.for_user(user))
+    timings = []
+    for _ in range(repeat):
+        serializer = TokenRefreshSerializer(data={'refresh': refresh})
+        started = time.perf_counter()
+        serializer.is_valid(raise_exception=True)
+        timings.append(time.perf_counter() - started)
+        refresh = serializer.validated_data['refresh']
+    timings.sort()
+    return statistics.median(timings) * 1e3, timings[int(len(timings) * 0.95)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rotations', type=int, default=2_000_000)
+    parser.add_argument('--steps', type=int, default=4)
+    parser.add_argument('--days', type=float, default=30.0,
+                        help='period the rotations are spread over')
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--use-settings-db', action='store_true',
+                        help='benchmark against the configured database instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    setup_database(args.use_settings_db)
+    from authentication.models import RevokedToken, User
+    from authentication.revocation import prune_revoked_tokens
+
+    user = User.objects.create_user(username='bench', email='bench@example.com', password='bench-password')
+
+    step = args.rotations // args.steps
+    p50, p95 = measure_refresh(user, args.repeat)
+    print(f"{0:>10} revoked rows: refresh p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+    for n in range(args.steps):
+        started = time.perf_counter()
+        insert_revocations(step, n * step, args.rotations, args.days)
+        inserted = time.perf_counter() - started
+        p50, p95 = measure_refresh(user, args.repeat)
+        rows = RevokedToken.objects.count()
+        print(f"{rows:>10} revoked rows: refresh p50 {p50:.2f} ms, p95 {p95:.2f} ms (inserted in {inserted:.1f}s)")
+
+    started = time.perf_counter()
+    deleted = prune_revoked_tokens()
+    print(f"\nPruned {deleted} expired rows in {time.perf_counter() - started:.1f}s, "
+          f"{RevokedToken.objects.count()} left")
+    p50, p95 = measure_refresh(user, args.repeat)
+    print(f"After pruning: refresh p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Throughput and latency of the task API under concurrent users.
+
+Signs up one account per virtual user against a running server, gives each
+a project, then for --duration seconds has --users virtual users loop over
+a mix of the hot requests: list projects, list the project's tasks, create
+a task and update one. Prints requests per second and p50/p95/p99 latency
+per request kind, plus error counts.
+
+Run it once against the development setup and once against the production
+profile to compare them:
+    python manage.py runserver 8000                          # SQLite, one process
+    docker compose up django postgres                        # uvicorn workers, PostgreSQL
+
+Measured on one CPU with SQLite, 20 users for 15 s: runserver 69 req/s,
+uvicorn with 1 worker 75 req/s, uvicorn with 4 workers 53 req/s (the workers
+queue on SQLite's file lock). PostgreSQL is what lets extra workers help; that
+comparison has not been run yet.
+
+Usage (from the ``server`` directory):
+    python benchmarks/load_test_api.py --base-url http://localhost:8000 --users 50 --duration 30
+"""
+from collections import defaultdict
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def create_user(client, run_id, n):
+    response = await client.post('/signup/', json={
+        'username': f'load-{run_id}-{n}',
+        'email': f'load-{run_id}-{n}@example.com',
+        'password': f'load-test-{run_id}',
+    })
+    response.raise_for_status()
+    headers = {'Authorization': f"Bearer {response.json()['tokens']['access']}"}
+
+    response = await client.post('/api/projects/', json={'name': f'Load test {n}'}, headers=headers)
+    response.raise_for_status()
+    return headers, response.json()['id']
+
+
+async def virtual_user(client, headers, project_id, deadline, timings, errors):
+    task_ids = []
+
+    async def timed(kind, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            errors[kind] += 1
+            return None
+        timings[kind].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors[kind] += 1
+            return None
+        return response
+
+    n = 0
+    while time.monotonic() < deadline:
+        await timed('list projects', 'GET', '/api/projects/')
+        await timed('list tasks', 'GET', f'/api/projects/{project_id}/tasks/')
+        response = await timed('create task', 'POST', f'/api/projects/{project_id}/tasks/',
+                               json={'title': f'Task {n}', 'description': 'load test', 'status': 'TODO'})
+        if response is not None:
+            task_ids.append(response.json()['id'])
+        if task_ids:
+            await timed('update task', 'PUT', f'/api/tasks/{task_ids[n % len(task_ids)]}/',
+                        json={'title': f'Task {n}', 'status': 'IN_PROGRESS'})
+        n += 1
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=30.0)
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        # Signups are CPU-bound password hashing; create the accounts a few at a time
+        accounts = []
+        for start in range(0, args.users, 8):
+            accounts += await asyncio.gather(*(
+                create_user(client, run_id, n) for n in range(start, min(start + 8, args.users))
+            ))
+
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, headers, project_id, deadline, timings, errors)
+            for headers, project_id in accounts
+        ))
+        elapsed = time.monotonic() - started
+
+    total = sum(len(samples) for samples in timings.values())
+    print(f"{args.base_url}: {args.users} users, {total} requests in {elapsed:.1f}s "
+          f"= {total / elapsed:.1f} req/s, {sum(errors.values())} errors\n")
+    for kind, samples in timings.items():
+        ordered = sorted(samples)
+        print(f"{kind:>14}: {len(samples) / elapsed:7.1f} req/s  "
+              f"p50 {statistics.median(ordered) * 1e3:7.1f} ms  "
+              f"p95 {percentile(ordered, 0.95) * 1e3:7.1f} ms  "
+              f"p99 {percentile(ordered, 0.99) * 1e3:7.1f} ms  "
+              f"errors {errors[kind]}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -12,24 +12,37 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
 import os
 import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Everything environment-specific below can be set in server/.env
+load_dotenv(BASE_DIR / '.env')
+
 LOG_DIR = os.path.join(BASE_DIR, 'logs')
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = os.getenv('DEBUG', '1') == '1'
+
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-60xp5_5rcap0t0_z99aq-)2fqidb_ppag7zwxl%8dhqr4g)tiq'
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured('DJANGO_SECRET_KEY must be set when DEBUG is off')
+    SECRET_KEY = 'django-insecure-60xp5_5rcap0t0_z99aq-)2fqidb_ppag7zwxl%8dhqr4g)tiq'
 
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '*').split(',')
 
-ALLOWED_HOSTS = ['*']
+# Server processes per host (uvicorn --workers reads the same variable).
+# Process-local limits such as the LLM request rate are split between them.
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
 
 
 # Application definition
@@ -44,7 +57,6 @@ INSTALLED_APPS = [
     'authentication',
     'api',
     'rest_framework',
-    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
 ]
 
@@ -88,7 +100,7 @@ CORS_ALLOW_HEADERS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.TokenClaimsAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -100,10 +112,57 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'authentication.serializers.TokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.TokenRefreshSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'authentication.serializers.TokenVerifySerializer',
 }
 
+# Rotated and logged-out refresh tokens are kept in RevokedToken until they
+# expire; expired rows are swept at most this often (seconds) per process
+REVOKED_TOKEN_SWEEP_INTERVAL = 60 * 60
+
+# Per-process LRU of user rows behind TokenClaimsAuthentication; rows older
+# than the TTL (seconds) are reloaded, so changes made by other workers show up
+AUTH_USER_CACHE_SIZE = 256
+AUTH_USER_CACHE_TTL = 60
+
 AUTH_USER_MODEL = 'authentication.User'
 
+# Shared LLM client (see api.llm); defaults match the Groq free-tier quota.
+# The limits are per process, so the account-wide ones are divided among workers.
+LLM_GATEWAY = {
+    'API_KEY': os.getenv('GROQ_API_KEY'),
+    'BASE_URL': os.getenv('GROQ_BASE_URL'),
+    'MAX_CONCURRENCY': max(1, int(os.getenv('LLM_MAX_CONCURRENCY', '8')) // WEB_CONCURRENCY),
+    'REQUESTS_PER_MINUTE': max(1, int(os.getenv('LLM_REQUESTS_PER_MINUTE', '30')) // WEB_CONCURRENCY),
+    'BURST': 5,
+    'MAX_RETRIES': 4,
+    'REQUEST_TIMEOUT': 30.0,
+    'DEADLINE': 60.0,
+}
+
+# Presentation decks larger than this many bytes are stored compressed (see api.schema)
+PRESENTATION_COMPRESS_THRESHOLD = 4096
+
+# Minimum word-level similarity for transcript tasks to match existing ones (see api.matching)
+TASK_MATCH_THRESHOLD = 0.75
+# Projects whose task match index is kept in memory per process
+TASK_MATCH_MAX_INDEXES = 256
+
+# Background presentation generation (see api.jobs)
+PRESENTATION_JOB_WORKERS = int(os.getenv('PRESENTATION_JOB_WORKERS', '4'))
+# Pending or running jobs that have not moved for this many seconds are reported as failed
+PRESENTATION_JOB_TIMEOUT = 30 * 60
+PRESENTATION_JOBS_EAGER = False
+# Standup transcript analysis runs on its own pool (see api.jobs)
+TRANSCRIPT_JOB_WORKERS = int(os.getenv('TRANSCRIPT_JOB_WORKERS', '2'))
+
+# Shared secret the voice agent sends when posting transcripts (see api.permissions)
+TRANSCRIPT_INGEST_TOKEN = os.getenv('TRANSCRIPT_INGEST_TOKEN', '')
+
+# Utterances per incremental analysis call while a call is running (see api.transcripts)
+TRANSCRIPT_ANALYSIS_WINDOW = 12
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
@@ -127,17 +186,48 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# PostgreSQL when POSTGRES_HOST is set, otherwise the local SQLite file.
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+if os.getenv('POSTGRES_HOST'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'mayur'),
+            'USER': os.getenv('POSTGRES_USER', 'mayur'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('POSTGRES_HOST'),
+            'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+    if DB_POOL_MAX_SIZE:
+        # psycopg connection pool, one per worker process. Safe under ASGI,
+        # where persistent per-thread connections (CONN_MAX_AGE) are not.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+                'max_size': DB_POOL_MAX_SIZE,
+                'timeout': 10,
+            },
+        }
+    else:
+        # Behind an external pooler such as pgbouncer in transaction mode
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', '60'))
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
-}
 
 # Test configuration
 TEST_RUNNER = 'django.test.runner.DiscoverRunner'
@@ -231,6 +321,57 @@ if 'test' in sys.argv:
 #     }
 
 
+# Caches
+# The 'llm' alias is the shared tier of the completion cache (see api.cache)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'llm': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'llm',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+LLM_COMPLETION_CACHE = {
+    'ENABLED': os.getenv('LLM_COMPLETION_CACHE', '1') == '1',
+    'TTL': 60 * 60 * 24,
+    'LOCAL_MAX_ENTRIES': 256,
+    'SHARED_ALIAS': 'llm',
+}
+
+
+# Password hashing
+# New hashes use PASSWORD_HASHER; the others still verify older hashes, which
+# are upgraded on the next login. All hashing runs on a bounded pool (see
+# authentication.hashers); benchmarks/bench_password_hashing.py compares costs.
+
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2')
+
+PASSWORD_HASHERS = sorted([
+    'authentication.hashers.Argon2PasswordHasher',
+    'authentication.hashers.PBKDF2PasswordHasher',
+], key=lambda path: PASSWORD_HASHER not in path.lower())
+
+PASSWORD_HASHING = {
+    'WORKERS': int(os.getenv('PASSWORD_HASH_WORKERS', '0')),  # 0: one per CPU
+    'QUEUE': int(os.getenv('PASSWORD_HASH_QUEUE', '16')),
+    'QUEUE_TIMEOUT': 0.5,
+    # OWASP's Argon2id baseline: ~40 ms per hash against ~440 ms for Django's
+    # PBKDF2 default, and the pool caps memory at WORKERS * 19 MiB
+    'ARGON2': {
+        'TIME_COST': 2,
+        'MEMORY_COST': 19 * 1024,  # KiB
+        'PARALLELISM': 1,
+    },
+    'PBKDF2_ITERATIONS': None,  # Django's default
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
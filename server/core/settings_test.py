@@ -8,6 +8,26 @@ DATABASES = {
     }
 }
 
+# Keep cached completions in memory and off unless a test enables them
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'llm': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'llm-tests',
+    },
+}
+
+LLM_COMPLETION_CACHE = {
+    'ENABLED': False,
+}
+
+# Run presentation jobs inline so tests can assert on their outcome
+PRESENTATION_JOBS_EAGER = True
+
+TRANSCRIPT_INGEST_TOKEN = 'test-ingest-token'
+
 # Simplified logging configuration for tests
 LOGGING = {
     'version': 1,
@@ -1,12 +1,19 @@
-from django.test import TestCase
+from django.test import AsyncClient, TestCase, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from api.models import Presentation
+from api.models import Presentation, PresentationJob, Project, Task
+from api.matching import TaskMatchIndex, clear_match_indexes, get_match_index, normalize_title
+from api.views import ProcessTranscriptView
+from authentication.tokens import ClaimsRefreshToken
 
+from datetime import timedelta
 from unittest.mock import patch
 
 User = get_user_model()
@@ -86,8 +93,47 @@ class APITests(TestCase):
         url = reverse('fetch-ppt')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # Should return our test presentation
-        self.assertEqual(response.data[0]['title'], 'Test Presentation')
+        self.assertEqual(len(response.data['results']), 1)  # Should return our test presentation
+        self.assertEqual(response.data['results'][0]['title'], 'Test Presentation')
+        self.assertEqual(response.data['results'][0]['slide_count'], 2)
+        self.assertNotIn('data', response.data['results'][0])
+
+    def test_fetch_presentations_does_not_load_data(self):
+        url = reverse('fetch-ppt')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        presentation_queries = [q['sql'] for q in queries if 'api_presentation' in q['sql']]
+        self.assertEqual(len(presentation_queries), 1)
+        self.assertNotIn('"data"', presentation_queries[0])
+
+    def test_fetch_presentations_cursor_pagination(self):
+        for i in range(3):
+            Presentation.objects.create(user=self.user, title=f"Deck {i}", data={"slides": []})
+
+        response = self.client.get(reverse('fetch-ppt'), {'page_size': 2})
+        self.assertEqual([p['title'] for p in response.data['results']], ['Deck 2', 'Deck 1'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([p['title'] for p in response.data['results']], ['Deck 0', 'Test Presentation'])
+        self.assertIsNone(response.data['next'])
+
+    def test_presentation_detail(self):
+        url = reverse('presentation-detail', kwargs={'id': self.presentation.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['slides']), 2)
+
+    def test_presentation_detail_other_user(self):
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=other_user)
+
+        url = reverse('presentation-detail', kwargs={'id': self.presentation.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_update_presentation_success(self):
         url = reverse('update-ppt', kwargs={'id': self.presentation.id})
@@ -128,3 +174,270 @@ class APITests(TestCase):
         url = reverse('delete-ppt', kwargs={'id': self.presentation.id})
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch('api.jobs.generate_presentation_data')
+    def test_create_presentation_job(self, mock_generate):
+        mock_generate.return_value = {
+            "title": "Queued Presentation",
+            "slides": [{"title": "Intro", "content": ["Point 1"]}],
+            "talking_points": []
+        }
+
+        response = self.client.post(reverse('create-ppt-job'), {'prompt': 'AI in healthcare'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.json()['job_id']
+
+        status_response = self.client.get(reverse('ppt-job', kwargs={'job_id': job_id}))
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data['status'], 'COMPLETED')
+        self.assertEqual(status_response.data['title'], 'Queued Presentation')
+        self.assertTrue(Presentation.objects.filter(id=status_response.data['presentation_id'], user=self.user).exists())
+
+    @patch('api.jobs.generate_presentation_data', side_effect=ValueError("No JSON content found in response"))
+    def test_create_presentation_job_failure(self, mock_generate):
+        response = self.client.post(reverse('create-ppt-job'), {'prompt': 'AI in healthcare'}, format='json')
+        job_id = response.json()['job_id']
+
+        status_response = self.client.get(reverse('ppt-job', kwargs={'job_id': job_id}))
+        self.assertEqual(status_response.data['status'], 'FAILED')
+        self.assertIn('No JSON content', status_response.data['error'])
+
+    def test_stale_presentation_job_is_failed(self):
+        stale = PresentationJob.objects.create(user=self.user, prompt='Lost in a restart', status='RUNNING')
+        fresh = PresentationJob.objects.create(user=self.user, prompt='Still queued')
+        PresentationJob.objects.filter(id=stale.id).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        response = self.client.get(reverse('ppt-job', kwargs={'job_id': stale.id}))
+        self.assertEqual(response.data['status'], 'FAILED')
+        self.assertIn('did not finish', response.data['error'])
+
+        response = self.client.get(reverse('ppt-job', kwargs={'job_id': fresh.id}))
+        self.assertEqual(response.data['status'], 'PENDING')
+
+    def test_presentation_job_other_user(self):
+        other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        job = PresentationJob.objects.create(user=other_user, prompt='Private prompt')
+
+        response = self.client.get(reverse('ppt-job', kwargs={'job_id': job.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProcessTasksTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(user=self.user, name='Standups')
+        self.view = ProcessTranscriptView()
+        clear_match_indexes()
+
+    def count_queries(self, completed_tasks, new_tasks):
+        with CaptureQueriesContext(connection) as queries:
+            self.view.process_tasks(self.user, completed_tasks, new_tasks)
+        return len(queries)
+
+    def test_updates_and_creates_tasks(self):
+        Task.objects.create(user=self.user, project=self.project, title='Set up the API', status='IN_PROGRESS')
+        Task.objects.create(user=self.user, project=self.project, title='Refine UI', status='TODO')
+
+        self.view.process_tasks(
+            self.user,
+            ['Set up the API', 'Created a dataset', 'Created a dataset'],
+            [
+                {'title': 'Refine UI', 'description': 'Duplicate'},
+                {'title': 'Add error handling', 'description': 'Cover LLM failures'},
+                {'title': 'Created a dataset', 'description': 'Already completed'},
+            ],
+        )
+
+        tasks = {task.title: task for task in Task.objects.filter(project=self.project)}
+        self.assertEqual(len(tasks), 4)
+        self.assertEqual(tasks['Set up the API'].status, 'COMPLETED')
+        self.assertEqual(tasks['Created a dataset'].status, 'COMPLETED')
+        self.assertEqual(tasks['Refine UI'].description, None)
+        self.assertEqual(tasks['Add error handling'].status, 'TODO')
+
+    def test_fuzzy_matches_existing_tasks(self):
+        Task.objects.create(user=self.user, project=self.project, title='Setup API', status='IN_PROGRESS')
+        Task.objects.create(user=self.user, project=self.project, title='Implement JWT authentication', status='TODO')
+
+        self.view.process_tasks(
+            self.user,
+            ['Set up the API', 'Implemented authentication using JWT'],
+            [{'title': 'Set up API', 'description': 'Duplicate'}],
+        )
+
+        tasks = Task.objects.filter(project=self.project)
+        self.assertEqual(tasks.count(), 2)
+        self.assertFalse(tasks.exclude(status='COMPLETED').exists())
+
+    def test_query_count_is_constant(self):
+        for i in range(20):
+            Task.objects.create(user=self.user, project=self.project, title=f'Existing {i}', status='TODO')
+
+        small = self.count_queries(
+            ['Existing 0', 'Done 0'],
+            [{'title': 'New 0', 'description': ''}],
+        )
+        large = self.count_queries(
+            [f'Existing {i}' for i in range(1, 20)] + [f'Done {i}' for i in range(1, 20)],
+            [{'title': f'New {i}', 'description': ''} for i in range(1, 20)],
+        )
+        self.assertEqual(small, large)
+
+
+class TaskMatchIndexTests(TestCase):
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title("Set up the API"), normalize_title("Setup API"))
+        self.assertEqual(normalize_title("Refine the UI design"), normalize_title("UI design refining"))
+
+    def test_match_threshold(self):
+        index = TaskMatchIndex(threshold=0.6)
+        index.add(1, "Add error handling")
+        index.add(2, "Improve presentation generation quality")
+
+        self.assertEqual(index.match("Added error handling")[0], 1)
+        self.assertEqual(index.match("Improve the generation quality of presentations")[0], 2)
+        self.assertIsNone(index.match("Write documentation"))
+
+    def test_requires_words_to_agree(self):
+        index = TaskMatchIndex()
+        index.add(1, "Write unit tests for login")
+        index.add(2, "Update README")
+        index.add(3, "Deploy backend to staging")
+        index.add(4, "Fix login bug")
+
+        self.assertIsNone(index.match("Write unit tests for logout"))
+        self.assertIsNone(index.match("Deploy frontend to staging"))
+        self.assertIsNone(index.match("Update the changelog"))
+        self.assertEqual(index.match("Update the README file")[0], 2)
+        self.assertEqual(index.match("Fixed the login bugs")[0], 4)
+
+    def test_ambiguous_matches_are_rejected(self):
+        index = TaskMatchIndex()
+        index.add(1, "Write unit tests for login")
+        index.add(2, "Write unit tests for logout")
+
+        self.assertIsNone(index.match("Write unit tests"))
+        self.assertEqual(index.match("Write unit tests for login")[0], 1)
+
+    @override_settings(TASK_MATCH_MAX_INDEXES=2)
+    def test_indexes_are_evicted_least_recently_used_first(self):
+        clear_match_indexes()
+        first, second, third = get_match_index(1), get_match_index(2), get_match_index(3)
+
+        self.assertIsNot(get_match_index(1), first)
+        self.assertIs(get_match_index(3), third)
+        self.assertIsNot(get_match_index(2), second)
+
+    def test_incremental_updates(self):
+        index = TaskMatchIndex()
+        index.add(1, "Write tests")
+        index.add(1, "Deploy to staging")
+        self.assertIsNone(index.match("Write tests"))
+        index.remove(1)
+        self.assertIsNone(index.match("Deploy to staging"))
+        self.assertEqual(len(index), 0)
+
+    def test_signals_keep_index_current(self):
+        clear_match_indexes()
+        user = User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+        project = Project.objects.create(user=user, name='Standups')
+        index = get_match_index(project.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(user=user, project=project, title='Write tests')
+        self.assertEqual(index.match('Writing tests')[0], task.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.title = 'Deploy to staging'
+            task.save()
+        self.assertIsNone(index.match('Writing tests'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertIsNone(index.match('Deploy to staging'))
+
+
+class ProjectTaskViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_project_crud(self):
+        response = self.client.post(reverse('project-list-create'), {'name': 'Standups'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        project_id = response.data['id']
+        self.assertEqual(response.data['user'], self.user.id)
+
+        response = self.client.get(reverse('project-list-create'))
+        self.assertEqual([project['name'] for project in response.data], ['Standups'])
+
+        response = self.client.put(reverse('project-detail', args=[project_id]), {'description': 'Daily'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Project.objects.get(id=project_id).description, 'Daily')
+
+        response = self.client.delete(reverse('project-detail', args=[project_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Project.objects.exists())
+
+    def test_task_crud(self):
+        project = Project.objects.create(user=self.user, name='Standups')
+        response = self.client.post(reverse('project-tasks', args=[project.id]), {'title': 'Write tests'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(id=response.data['id'])
+        self.assertEqual((task.user, task.project), (self.user, project))
+
+        self.assertEqual(len(self.client.get(reverse('task-list')).data), 1)
+        self.assertEqual(len(self.client.get(reverse('project-tasks', args=[project.id])).data), 1)
+
+        response = self.client.put(reverse('task-detail', args=[task.id]), {'status': 'COMPLETED'}, format='json')
+        self.assertEqual(response.data['status'], 'COMPLETED')
+
+        response = self.client.delete(reverse('task-detail', args=[task.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Task.objects.exists())
+
+    def test_invalid_task(self):
+        project = Project.objects.create(user=self.user, name='Standups')
+        response = self.client.post(reverse('project-tasks', args=[project.id]), {'status': 'DONE'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('title', response.data)
+
+    def test_other_users_projects_and_tasks(self):
+        project = Project.objects.create(user=self.other, name='Private')
+        task = Task.objects.create(user=self.other, project=project, title='Secret')
+
+        self.assertEqual(self.client.get(reverse('project-detail', args=[project.id])).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse('project-tasks', args=[project.id])).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse('task-detail', args=[task.id])).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(reverse('task-list')).data, [])
+
+    def test_requires_authentication(self):
+        response = APIClient().get(reverse('project-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_client_with_token(self):
+        project = await Project.objects.acreate(user=self.user, name='Standups')
+        await Task.objects.acreate(user=self.user, project=project, title='Write tests')
+        access = str(ClaimsRefreshToken.for_user(self.user).access_token)
+
+        response = await AsyncClient().get(reverse('task-list'), headers={'Authorization': f'Bearer {access}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['title'] for task in response.json()], ['Write tests'])
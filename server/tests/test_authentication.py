@@ -1,8 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.test import TestCase
+from django.utils import timezone
 from django.urls import reverse
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from django.contrib.auth import get_user_model
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.authentication import TokenClaimsAuthentication
+from authentication.cache import clear_user_cache, get_user_row
+from authentication.hashers import get_hashing_pool
+from authentication.models import RevokedToken, TokenUser
+from authentication.revocation import prune_revoked_tokens
+from authentication.tokens import ClaimsRefreshToken
 
 User = get_user_model()
 
@@ -119,3 +132,185 @@ class AuthenticationTests(TestCase):
         # Try to logout without a refresh token
         response = self.client.post(self.logout_url, {}, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TokenClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        clear_user_cache()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            job_role='developer',
+            specialization='backend'
+        )
+
+    def authenticate(self, access):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        return TokenClaimsAuthentication().authenticate(request)[0]
+
+    def login(self):
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_user_is_built_from_claims(self):
+        access = self.login()['access']
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(access)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user, self.user)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.job_role, 'developer')
+            self.assertEqual(user.specialization, 'backend')
+
+        # Other fields load the whole row once, then come from the cache
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, 'testuser')
+            self.assertTrue(user.is_active)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(access).username, 'testuser')
+
+    def test_select_role_reissues_tokens(self):
+        access = self.login()['access']
+        self.assertEqual(self.authenticate(access).username, 'testuser')
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        response = self.client.post(reverse('select-role'), {
+            'job_role': 'designer',
+            'specialization': 'ux'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user = self.authenticate(response.data['tokens']['access'])
+        self.assertEqual(user.job_role, 'designer')
+        self.assertEqual(user.specialization, 'ux')
+
+        # The stale cached row was dropped by the update
+        self.assertEqual(get_user_row(self.user.pk)['job_role'], 'designer')
+
+    def test_refresh_restamps_claims(self):
+        refresh = self.login()['refresh']
+        get_user_row(self.user.pk)
+        # Bypasses the signals, like a change made by another worker
+        User.objects.filter(pk=self.user.pk).update(job_role='designer')
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.authenticate(response.data['access']).job_role, 'designer')
+
+    def test_refresh_rejects_user_deactivated_elsewhere(self):
+        refresh = self.login()['refresh']
+        get_user_row(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_rows_expire(self):
+        get_user_row(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(first_name='Ada')
+        self.assertEqual(get_user_row(self.user.pk)['first_name'], '')
+
+        with self.settings(AUTH_USER_CACHE_TTL=0):
+            self.assertEqual(get_user_row(self.user.pk)['first_name'], 'Ada')
+
+    def test_token_without_claims_loads_user(self):
+        access = str(RefreshToken.for_user(self.user).access_token)
+        user = self.authenticate(access)
+        self.assertIsInstance(user, User)
+        self.assertNotIsInstance(user, TokenUser)
+        self.assertEqual(user.job_role, 'developer')
+
+
+class RevokedTokenTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.refresh = str(ClaimsRefreshToken.for_user(self.user))
+
+    def refresh_token(self, refresh):
+        return self.client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+
+    def test_issuing_tokens_writes_nothing(self):
+        with self.assertNumQueries(0):
+            ClaimsRefreshToken.for_user(self.user)
+
+    def test_rotated_token_cannot_be_reused(self):
+        response = self.refresh_token(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refresh_token(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+    def test_logout_revokes_token(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('logout'), {'refresh_token': self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+
+        self.assertEqual(self.refresh_token(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_verify'), {'token': self.refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prune_removes_expired_tokens(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti='expired', expires_at=now - timedelta(minutes=1))
+        RevokedToken.objects.create(jti='live', expires_at=now + timedelta(days=1))
+
+        self.assertEqual(prune_revoked_tokens(), 1)
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user_data = {
+            'username': 'testuser',
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }
+
+    def test_signup_duplicate_username(self):
+        self.client.post(reverse('signup'), self.user_data, format='json')
+        response = self.client.post(reverse('signup'), {**self.user_data, 'email': 'other@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Username already taken')
+
+    def test_signup_is_rejected_when_pool_is_full(self):
+        _, slots = get_hashing_pool()
+        held = 0
+        while slots.acquire(blocking=False):
+            held += 1
+        try:
+            with self.settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, 'QUEUE_TIMEOUT': 0}):
+                response = self.client.post(reverse('signup'), self.user_data, format='json')
+        finally:
+            for _ in range(held):
+                slots.release()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(User.objects.exists())
+
+    def test_older_hashes_are_upgraded_on_login(self):
+        user = User.objects.create_user(**self.user_data)
+        User.objects.filter(pk=user.pk).update(password=make_password('testpass123', hasher='pbkdf2_sha256'))
+
+        response = self.client.post(reverse('token_obtain_pair'), {
+            'email': 'test@example.com',
+            'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('argon2$argon2id$v=19$m=19456,t=2,p=1$'))
@@ -0,0 +1,95 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from api.cache import (
+    DjangoCompletionCache,
+    LRUCompletionCache,
+    TieredCompletionCache,
+    completion_cache_key,
+)
+from api.generation import complete_chat, generate_presentation_data, stream_presentation_completion
+
+from unittest.mock import patch
+
+import time
+
+
+class CompletionCacheTests(TestCase):
+    def tearDown(self):
+        caches['llm'].clear()
+
+    def test_key_depends_on_model_prompt_and_params(self):
+        messages = [{"role": "user", "content": "Hello"}]
+        key = completion_cache_key("llama3-8b-8192", messages, temperature=0)
+
+        self.assertEqual(key, completion_cache_key("llama3-8b-8192", list(messages), temperature=0))
+        self.assertNotEqual(key, completion_cache_key("llama3-70b-8192", messages, temperature=0))
+        self.assertNotEqual(key, completion_cache_key("llama3-8b-8192", messages, temperature=1))
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCompletionCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        self.assertEqual(cache.get("a"), "1")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1})
+
+    def test_lru_expires_entries(self):
+        cache = LRUCompletionCache(max_entries=2, ttl=0.01)
+        cache.set("a", "1")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_tiered_cache_backfills_local_tier(self):
+        local = LRUCompletionCache(max_entries=2)
+        shared = DjangoCompletionCache(alias='llm')
+        shared.set("key", "value")
+        cache = TieredCompletionCache([local, shared])
+
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(local.get("key"), "value")
+        self.assertEqual(cache.stats()["tiers"]["shared"], {"hits": 1, "misses": 0})
+
+    @override_settings(LLM_COMPLETION_CACHE={'ENABLED': True})
+    @patch('api.generation.get_gateway')
+    def test_complete_chat_skips_repeated_calls(self, mock_get_gateway):
+        mock_get_gateway.return_value.complete.return_value = '{"title": "Cached"}'
+        messages = [{"role": "user", "content": "Same prompt"}]
+
+        self.assertEqual(complete_chat(messages), '{"title": "Cached"}')
+        self.assertEqual(complete_chat(messages), '{"title": "Cached"}')
+        self.assertEqual(mock_get_gateway.return_value.complete.call_count, 1)
+
+    @override_settings(LLM_COMPLETION_CACHE={'ENABLED': True})
+    @patch('api.generation.get_gateway')
+    def test_unusable_completion_is_not_cached(self, mock_get_gateway):
+        mock_get_gateway.return_value.complete.side_effect = [
+            "Sorry, I can't help with that.",
+            '{"title": "Deck", "slides": [], "talking_points": []}',
+        ]
+
+        with self.assertRaises(ValueError):
+            generate_presentation_data("Engineer", "Backend", "Same prompt")
+        self.assertEqual(generate_presentation_data("Engineer", "Backend", "Same prompt")["title"], "Deck")
+        self.assertEqual(generate_presentation_data("Engineer", "Backend", "Same prompt")["title"], "Deck")
+        self.assertEqual(mock_get_gateway.return_value.complete.call_count, 2)
+
+    @override_settings(LLM_COMPLETION_CACHE={'ENABLED': True})
+    @patch('api.generation.get_gateway')
+    def test_unusable_stream_is_not_cached(self, mock_get_gateway):
+        mock_get_gateway.return_value.stream.side_effect = [
+            iter(["Sorry, ", "no."]),
+            iter(['{"title": "Deck", ', '"slides": []}']),
+        ]
+
+        self.assertEqual("".join(stream_presentation_completion("Engineer", "Backend", "Same prompt")), "Sorry, no.")
+        for _ in range(2):
+            self.assertEqual(
+                "".join(stream_presentation_completion("Engineer", "Backend", "Same prompt")),
+                '{"title": "Deck", "slides": []}',
+            )
+        self.assertEqual(mock_get_gateway.return_value.stream.call_count, 2)
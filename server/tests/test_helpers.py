@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+
+from api.helpers import extract_json_from_response, repair_json, scan_json
+
+import time
+
+
+class JSONScannerTests(SimpleTestCase):
+    def test_plain_json(self):
+        self.assertEqual(extract_json_from_response('{"title": "Deck"}'), {"title": "Deck"})
+
+    def test_markdown_fence_and_trailing_prose(self):
+        response = 'Sure!\n```json\n{"title": "Deck", "slides": []}\n```\nHope this helps {really}.'
+        self.assertEqual(extract_json_from_response(response), {"title": "Deck", "slides": []})
+
+    def test_braces_and_escaped_quotes_inside_strings(self):
+        response = 'Here: {"title": "Use {braces} and \\"quotes\\" }"} done'
+        self.assertEqual(extract_json_from_response(response)["title"], 'Use {braces} and "quotes" }')
+
+    def test_skips_unparseable_candidates(self):
+        response = 'Format is {title: ...}. Result: {"title": "Deck"}'
+        self.assertEqual(extract_json_from_response(response), {"title": "Deck"})
+
+    def test_unclosed_bracket_in_prose(self):
+        self.assertEqual(extract_json_from_response('Use { to open. {"title": "x"}'), {"title": "x"})
+        self.assertEqual(extract_json_from_response('Lists look like [a, b and {"title": "x"}'), {"title": "x"})
+
+    def test_many_unclosed_brackets_scan_in_linear_time(self):
+        started = time.perf_counter()
+        self.assertEqual(extract_json_from_response('{ a ' * 50000 + '{"title": "x"}'), {"title": "x"})
+        # A rescan per unclosed bracket took minutes here
+        self.assertLess(time.perf_counter() - started, 2)
+
+    def test_truncated_json_is_not_mined_for_fragments(self):
+        with self.assertRaises(ValueError):
+            extract_json_from_response('{"title": "Deck", "slides": [{"title": "A", "content": []}, {"title": "B"')
+
+    def test_repairs_trailing_commas(self):
+        response = '{"slides": [{"title": "A", "content": ["x", "y",],},], "talking_points": [],}'
+        self.assertEqual(extract_json_from_response(response)["slides"][0]["content"], ["x", "y"])
+
+    def test_repairs_smart_quotes(self):
+        response = '{“title”: “Deck with \\"quoted\\" and "raw" words”}'
+        self.assertEqual(extract_json_from_response(response)["title"], 'Deck with "quoted" and "raw" words')
+
+    def test_repair_keeps_commas_inside_strings(self):
+        self.assertEqual(repair_json('{"a": "x, }",}'), '{"a": "x, }"}')
+
+    def test_arrays_when_allowed(self):
+        self.assertEqual(scan_json('Tasks: ["a", "b"]'), ["a", "b"])
+        self.assertEqual(extract_json_from_response('[1] then {"a": 1}'), {"a": 1})
+
+    def test_no_json(self):
+        with self.assertRaises(ValueError):
+            extract_json_from_response("I cannot help with that.")
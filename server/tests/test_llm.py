@@ -0,0 +1,129 @@
+from django.test import SimpleTestCase
+
+from api.llm import LLMDeadlineExceeded, LLMGateway, LLMGatewayError, TokenBucket
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import json
+import threading
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """Answers chat completion requests, rate limiting the first ``failures`` calls."""
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server.calls += 1
+        if server.calls <= server.failures:
+            self.send_response(429)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": {"message": "Rate limit reached"}}).encode())
+            return
+        body = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "llama3-8b-8192",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": '{"title": "Fake"}'},
+            }],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LLMGatewayTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGroqHandler)
+        self.server.calls = 0
+        self.server.failures = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def gateway(self, **kwargs):
+        options = {
+            'api_key': 'test-key',
+            'base_url': f'http://127.0.0.1:{self.server.server_address[1]}',
+            'requests_per_minute': 6000,
+            'burst': 10,
+            'backoff_base': 0.01,
+            'backoff_max': 0.05,
+        }
+        options.update(kwargs)
+        return LLMGateway(**options)
+
+    def test_complete_returns_message_content(self):
+        content = self.gateway().complete([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+        self.assertEqual(content, '{"title": "Fake"}')
+        self.assertEqual(self.server.calls, 1)
+
+    def test_retries_rate_limited_calls(self):
+        self.server.failures = 2
+        content = self.gateway().complete([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+        self.assertEqual(content, '{"title": "Fake"}')
+        self.assertEqual(self.server.calls, 3)
+
+    def test_gives_up_after_max_retries(self):
+        self.server.failures = 10
+        with self.assertRaises(LLMGatewayError):
+            self.gateway(max_retries=2).complete([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+        self.assertEqual(self.server.calls, 3)
+
+    def test_rate_limit_wait_respects_deadline(self):
+        gateway = self.gateway(requests_per_minute=1, burst=1, deadline=0.5)
+        gateway.complete([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+        with self.assertRaises(LLMDeadlineExceeded):
+            gateway.complete([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+        self.assertEqual(self.server.calls, 1)
+
+    def test_abandoned_stream_is_closed(self):
+        class FakeStream:
+            closed = False
+
+            def __iter__(self):
+                for text in ("a", "b", "c"):
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+            def close(self):
+                self.closed = True
+
+        stream = FakeStream()
+        gateway = self.gateway(max_concurrency=1)
+        with patch.object(gateway.client.chat.completions, 'create', return_value=stream):
+            deltas = gateway.stream([{"role": "user", "content": "hi"}], "llama3-8b-8192")
+            self.assertEqual(next(deltas), "a")
+            deltas.close()
+
+        self.assertTrue(stream.closed)
+        self.assertTrue(gateway.semaphore.acquire(blocking=False))
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_refills_at_configured_rate(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0], sleep=sleep)
+        bucket.acquire()
+        bucket.acquire()
+        bucket.acquire()
+
+        self.assertEqual(sleeps, [0.5])
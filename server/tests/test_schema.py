@@ -0,0 +1,179 @@
+from django.apps import apps
+from django.db import connection, models
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.models import Presentation
+from api.schema import (
+    PresentationSchemaError,
+    decode_presentation,
+    encode_presentation,
+    validate_presentation,
+)
+
+from unittest.mock import patch
+
+import importlib
+import json
+
+User = get_user_model()
+
+DECK = {
+    "title": "Schema Deck",
+    "slides": [
+        {"title": "Intro", "content": ["Point 1", "Point 2"]},
+        {"title": "Outro", "content": ["Point 3"]}
+    ],
+    "talking_points": ["Talk point 1"]
+}
+
+
+def large_deck(slide_count=40):
+    return {
+        "title": "Large Deck",
+        "slides": [
+            {"title": f"Slide {i}", "content": [f"Repeated bullet point number {j} about scaling" for j in range(5)]}
+            for i in range(slide_count)
+        ],
+        "talking_points": ["Keep it short"]
+    }
+
+
+class PresentationSchemaTests(TestCase):
+    def test_round_trip(self):
+        encoded = encode_presentation(DECK)
+        self.assertEqual(encoded["v"], 1)
+        self.assertEqual(encoded["s"][0], ["Intro", ["Point 1", "Point 2"]])
+        self.assertEqual(decode_presentation(encoded), DECK)
+
+    def test_large_decks_are_compressed(self):
+        deck = large_deck()
+        encoded = encode_presentation(deck)
+        self.assertIn("z", encoded)
+        self.assertLess(len(json.dumps(encoded)), len(json.dumps(deck)) / 3)
+        self.assertEqual(decode_presentation(encoded), deck)
+
+    @override_settings(PRESENTATION_COMPRESS_THRESHOLD=None)
+    def test_compression_can_be_disabled(self):
+        self.assertNotIn("z", encode_presentation(large_deck()))
+
+    def test_coerces_llm_quirks(self):
+        deck = validate_presentation({"slides": [{"title": "A", "content": "Single bullet"}], "talking_points": [1]})
+        self.assertEqual(deck.slides[0].content, ["Single bullet"])
+        self.assertEqual(deck.talking_points, ["1"])
+
+    def test_rejects_invalid_structure(self):
+        with self.assertRaises(PresentationSchemaError):
+            validate_presentation({"slides": "not a list"})
+        with self.assertRaises(PresentationSchemaError):
+            validate_presentation({"slides": [{"title": "A", "content": [{"nested": True}]}]})
+
+    def test_unknown_keys_are_kept(self):
+        deck = {**DECK, "theme": "dark", "slides": [{"title": "Intro", "content": ["Point 1"], "notes": "Smile"}]}
+        encoded = encode_presentation(deck)
+        self.assertEqual(encoded["s"][0], ["Intro", ["Point 1"], {"notes": "Smile"}])
+        self.assertEqual(decode_presentation(encoded), deck)
+
+    def test_legacy_rows_are_returned_unchanged(self):
+        self.assertEqual(decode_presentation(DECK), DECK)
+
+
+class PresentationStorageTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def stored_data(self, presentation):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT data FROM api_presentation WHERE id = %s", [presentation.id])
+            return json.loads(cursor.fetchone()[0])
+
+    def test_model_stores_compact_form(self):
+        presentation = Presentation.objects.create(user=self.user, title="Deck", data=DECK)
+
+        self.assertEqual(self.stored_data(presentation)["v"], 1)
+        self.assertEqual(Presentation.objects.get(id=presentation.id).data, DECK)
+
+    def test_serializer_returns_decoded_deck(self):
+        Presentation.objects.create(user=self.user, title="Deck", data=large_deck())
+
+        response = self.client.get(reverse('presentation-detail', kwargs={'id': Presentation.objects.get().id}))
+        self.assertEqual(response.data["data"], large_deck())
+
+    def test_legacy_row_can_still_be_saved(self):
+        presentation = Presentation.objects.create(user=self.user, title="Deck", data=DECK)
+        legacy = {"slides": ["just a string"]}
+        Presentation.objects.filter(id=presentation.id).update(data=models.Value(legacy, output_field=models.JSONField()))
+
+        url = reverse('update-ppt', kwargs={'id': presentation.id})
+        response = self.client.put(url, {"title": "Renamed"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.stored_data(presentation), legacy)
+        self.assertEqual(Presentation.objects.get(id=presentation.id).title, "Renamed")
+
+    @patch('api.generation.get_gateway')
+    def test_off_schema_deck_reports_schema_error(self, mock_get_gateway):
+        mock_get_gateway.return_value.complete.return_value = json.dumps(
+            {"title": "Deck", "slides": [{"title": "A", "content": [{"text": "Nested bullet"}]}]}
+        )
+
+        response = self.client.post(reverse('create-ppt'), {"prompt": "Scaling"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn("does not match the deck schema", response.json()["error"])
+        self.assertFalse(Presentation.objects.exists())
+
+    def test_update_with_invalid_data(self):
+        presentation = Presentation.objects.create(user=self.user, title="Deck", data=DECK)
+
+        url = reverse('update-ppt', kwargs={'id': presentation.id})
+        response = self.client.put(url, {"data": {"slides": "oops"}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CompactPresentationMigrationTests(TestCase):
+    migration = importlib.import_module('api.migrations.0005_compact_presentation_data')
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def store_raw(self, data):
+        presentation = Presentation.objects.create(user=self.user, title="Deck", data={"slides": []})
+        Presentation.objects.filter(id=presentation.id).update(data=models.Value(data, output_field=models.JSONField()))
+        return presentation
+
+    def stored_data(self, presentation):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT data FROM api_presentation WHERE id = %s", [presentation.id])
+            return json.loads(cursor.fetchone()[0])
+
+    def test_invalid_rows_stay_legacy(self):
+        valid = self.store_raw(DECK)
+        invalid = self.store_raw({"slides": "not a list"})
+
+        self.migration.encode_existing_presentations(apps, None)
+
+        self.assertEqual(self.stored_data(valid)["v"], 1)
+        self.assertEqual(self.stored_data(invalid), {"slides": "not a list"})
+
+    def test_reverse_restores_plain_json(self):
+        small = Presentation.objects.create(user=self.user, title="Deck", data=DECK)
+        large = Presentation.objects.create(user=self.user, title="Deck", data=large_deck())
+        self.assertIn("z", self.stored_data(large))
+
+        self.migration.decode_existing_presentations(apps, None)
+
+        self.assertEqual(self.stored_data(small), DECK)
+        self.assertEqual(self.stored_data(large), large_deck())
@@ -0,0 +1,129 @@
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.models import Presentation
+from authentication.tokens import ClaimsRefreshToken
+from api.streaming import SlideStreamParser
+
+from unittest.mock import patch
+
+import json
+
+User = get_user_model()
+
+COMPLETION = '''Here is your presentation:
+```json
+{
+    "title": "Streaming {Decks}",
+    "slides": [
+        {"title": "Intro", "content": ["Why \\"streams\\" matter", "Braces } inside strings"]},
+        {"title": "Details", "content": ["Nested [arrays]", "Point 2"]}
+    ],
+    "talking_points": ["Keep it short"]
+}
+```
+Let me know if you need changes.'''
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class SlideStreamParserTests(TestCase):
+    def test_emits_slides_as_they_complete(self):
+        parser = SlideStreamParser()
+        emitted = []
+        for chunk in chunked(COMPLETION, 7):
+            emitted.extend(parser.feed(chunk))
+
+        self.assertEqual([slide["title"] for slide in emitted], ["Intro", "Details"])
+        self.assertEqual(emitted[0]["content"][1], "Braces } inside strings")
+        self.assertEqual(parser.slides_emitted, 2)
+
+    def test_slide_is_emitted_before_stream_ends(self):
+        parser = SlideStreamParser()
+        first_slide_end = COMPLETION.index('"Braces } inside strings"]}') + len('"Braces } inside strings"]}')
+
+        self.assertEqual(len(parser.feed(COMPLETION[:first_slide_end])), 1)
+        self.assertEqual(len(parser.feed(COMPLETION[first_slide_end:])), 1)
+
+    def test_unbalanced_brace_in_prose(self):
+        parser = SlideStreamParser()
+        emitted = []
+        for chunk in chunked('Use { to open the deck. ' + COMPLETION, 1):
+            emitted.extend(parser.feed(chunk))
+
+        self.assertEqual([slide["title"] for slide in emitted], ["Intro", "Details"])
+
+    def test_ignores_objects_outside_slides(self):
+        parser = SlideStreamParser()
+        slides = parser.feed('{"meta": {"title": "x"}, "talking_points": [{"a": 1}], "slides": []}')
+        self.assertEqual(slides, [])
+
+
+class StreamPPTViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def read_events(self, response):
+        body = b"".join(response.streaming_content).decode()
+        events = []
+        for frame in body.strip().split("\n\n"):
+            event, data = frame.split("\n", 1)
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return events
+
+    @patch('api.views.stream_presentation_completion')
+    def test_stream_presentation(self, mock_stream):
+        mock_stream.return_value = iter(chunked(COMPLETION, 40))
+
+        response = self.client.post(reverse('create-ppt-stream'), {'prompt': 'Streaming'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        events = self.read_events(response)
+        self.assertEqual([name for name, _ in events], ["slide", "slide", "done"])
+        self.assertEqual(events[1][1]["index"], 1)
+
+        presentation = Presentation.objects.get(id=events[-1][1]["presentation_id"])
+        self.assertEqual(presentation.title, "Streaming {Decks}")
+        self.assertEqual(len(presentation.data["slides"]), 2)
+
+    @patch('api.views.stream_presentation_completion')
+    async def test_stream_presentation_over_asgi(self, mock_stream):
+        mock_stream.return_value = iter(chunked(COMPLETION, 40))
+        access = str(ClaimsRefreshToken.for_user(self.user).access_token)
+
+        response = await AsyncClient().post(
+            reverse('create-ppt-stream'), {'prompt': 'Streaming'},
+            content_type='application/json', headers={'Authorization': f'Bearer {access}'}
+        )
+        # Served as an async stream rather than collected into a list first
+        self.assertTrue(response.is_async)
+        body = b"".join([part async for part in response.streaming_content]).decode()
+        self.assertEqual(body.count("event: slide"), 2)
+        self.assertIn("event: done", body)
+
+    @patch('api.views.stream_presentation_completion')
+    def test_stream_presentation_invalid_json(self, mock_stream):
+        mock_stream.return_value = iter(["I cannot help with that."])
+
+        response = self.client.post(reverse('create-ppt-stream'), {'prompt': 'Streaming'}, format='json')
+        events = self.read_events(response)
+
+        self.assertEqual(events[-1][0], "error")
+        self.assertFalse(Presentation.objects.exists())
+
+    def test_stream_presentation_no_prompt(self):
+        response = self.client.post(reverse('create-ppt-stream'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,246 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from api.models import Project, Task, Transcript
+from api.transcripts import ANALYSIS_CLAIM_TIMEOUT
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import json
+
+User = get_user_model()
+
+
+class TranscriptIngestTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.project = Project.objects.create(user=self.user, name='Standups')
+        self.transcript = Transcript.objects.create(user=self.user)
+
+        self.client = APIClient()
+        self.agent = APIClient()
+        self.agent.credentials(HTTP_AUTHORIZATION='Bearer test-ingest-token')
+
+    def ingest(self, utterances, final=False, client=None):
+        return (client or self.agent).post(reverse('transcript-ingest'), {
+            'session': str(self.transcript.id),
+            'room': 'voice_assistant_room_1',
+            'utterances': utterances,
+            'final': final,
+        }, format='json')
+
+    def test_start_session(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('transcript-session'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        transcript = Transcript.objects.get(id=response.data['session'])
+        self.assertEqual(transcript.user, self.user)
+        self.assertEqual(transcript.status, 'OPEN')
+
+    def test_requires_ingest_token(self):
+        response = self.ingest([], client=self.client)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer wrong-token')
+        response = self.ingest([], client=self.client)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_retried_batches_are_stored_once(self):
+        batch = [
+            {'sequence': 0, 'speaker': 'Bot', 'text': 'Hey, ready?'},
+            {'sequence': 1, 'speaker': 'User', 'text': 'Yeah.'},
+        ]
+        self.assertEqual(self.ingest(batch).status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(self.ingest(batch).status_code, status.HTTP_202_ACCEPTED)
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.utterances.count(), 2)
+        self.assertEqual(self.transcript.room_name, 'voice_assistant_room_1')
+        self.assertEqual(self.transcript.status, 'OPEN')
+
+    @override_settings(TRANSCRIPT_ANALYSIS_WINDOW=2)
+    @patch('api.transcripts.complete_chat')
+    def test_transcript_is_analyzed_in_windows(self, mock_complete):
+        mock_complete.side_effect = [
+            json.dumps({
+                'summary': 'User set up the API.',
+                'completed_tasks': ['Set up the API'],
+                'new_tasks': [{'title': 'Add error handling', 'description': 'Cover LLM failures'}],
+            }),
+            json.dumps({
+                'summary': 'User set up the API and finished error handling.',
+                'completed_tasks': ['Add error handling'],
+                'new_tasks': [{'title': 'Write tests', 'description': ''}],
+            }),
+        ]
+
+        self.ingest([
+            {'sequence': 0, 'speaker': 'User', 'text': 'I set up the API.'},
+            {'sequence': 1, 'speaker': 'User', 'text': 'Next I will add error handling.'},
+        ])
+        self.ingest([{'sequence': 2, 'speaker': 'User', 'text': 'Actually error handling is done too.'}])
+        self.assertEqual(mock_complete.call_count, 1)
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.analyzed_sequence, 1)
+        self.assertEqual(self.transcript.summary, 'User set up the API.')
+
+        response = self.ingest([{'sequence': 3, 'speaker': 'User', 'text': 'Tests are next.'}], final=True)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(mock_complete.call_count, 2)
+
+        # The second call only carries the new utterances plus the running state
+        prompt = mock_complete.call_args[0][0][0]['content']
+        self.assertIn('Tests are next.', prompt)
+        self.assertNotIn('I set up the API.', prompt)
+        self.assertIn('User set up the API.', prompt)
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.status, 'PROCESSED')
+        self.assertIsNotNone(self.transcript.ended_at)
+        self.assertEqual(self.transcript.result, {
+            'completed_tasks': ['Set up the API', 'Add error handling'],
+            'new_tasks': [{'title': 'Write tests', 'description': ''}],
+        })
+        self.assertEqual(
+            dict(Task.objects.filter(project=self.project).values_list('title', 'status')),
+            {'Set up the API': 'COMPLETED', 'Add error handling': 'COMPLETED', 'Write tests': 'TODO'},
+        )
+
+        # A late retry of the final batch must not run processing again
+        response = self.ingest([], final=True)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(mock_complete.call_count, 2)
+
+    @override_settings(TRANSCRIPT_ANALYSIS_WINDOW=2)
+    @patch('api.transcripts.complete_chat')
+    def test_batches_during_analysis_do_not_start_another(self, mock_complete):
+        def reply(messages, **kwargs):
+            if mock_complete.call_count == 1:
+                # More of the call arrives, and the call ends, while the first window is with the LLM
+                self.ingest([
+                    {'sequence': 2, 'speaker': 'User', 'text': 'Error handling is done.'},
+                    {'sequence': 3, 'speaker': 'User', 'text': 'Docs are next.'},
+                ])
+                self.ingest([{'sequence': 4, 'speaker': 'User', 'text': 'Then tests.'}])
+                self.ingest([{'sequence': 5, 'speaker': 'User', 'text': 'That is all.'}], final=True)
+                self.assertEqual(mock_complete.call_count, 1)
+            return json.dumps({'summary': f'Window {mock_complete.call_count}.', 'completed_tasks': [], 'new_tasks': []})
+
+        mock_complete.side_effect = reply
+        self.ingest([
+            {'sequence': 0, 'speaker': 'User', 'text': 'I set up the API.'},
+            {'sequence': 1, 'speaker': 'User', 'text': 'Next I will add error handling.'},
+        ])
+
+        # Each window goes to the LLM exactly once
+        prompts = [call[0][0][0]['content'] for call in mock_complete.call_args_list]
+        self.assertEqual(len(prompts), 3)
+        self.assertIn('Next I will add error handling.', prompts[0])
+        self.assertIn('Docs are next.', prompts[1])
+        self.assertNotIn('I set up the API.', prompts[1])
+        self.assertIn('That is all.', prompts[2])
+        self.assertNotIn('Docs are next.', prompts[2])
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.status, 'PROCESSED')
+        self.assertEqual(self.transcript.analyzed_sequence, 5)
+        self.assertIsNone(self.transcript.analysis_claimed_at)
+
+    @patch('api.transcripts.complete_chat')
+    def test_failed_final_analysis_marks_transcript(self, mock_complete):
+        mock_complete.return_value = 'no json here'
+        self.ingest([{'sequence': 0, 'speaker': 'User', 'text': 'I set up the API.'}], final=True)
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.status, 'FAILED')
+        self.assertEqual(self.transcript.analyzed_sequence, -1)
+
+    @override_settings(TRANSCRIPT_ANALYSIS_WINDOW=2)
+    @patch('api.transcripts.complete_chat')
+    def test_stale_claim_is_taken_over(self, mock_complete):
+        mock_complete.return_value = json.dumps({'summary': 'Started.', 'completed_tasks': [], 'new_tasks': []})
+        # Left behind by a worker that died mid-analysis
+        Transcript.objects.filter(id=self.transcript.id).update(
+            analysis_claimed_at=timezone.now() - ANALYSIS_CLAIM_TIMEOUT - timedelta(seconds=1)
+        )
+
+        self.ingest([
+            {'sequence': 0, 'speaker': 'User', 'text': 'I set up the API.'},
+            {'sequence': 1, 'speaker': 'User', 'text': 'Next I will add error handling.'},
+        ])
+
+        self.assertEqual(mock_complete.call_count, 1)
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.analyzed_sequence, 1)
+        self.assertIsNone(self.transcript.analysis_claimed_at)
+
+    @patch('api.transcripts.complete_chat')
+    def test_retried_final_batch_reprocesses_failed_transcript(self, mock_complete):
+        mock_complete.return_value = 'no json here'
+        batch = [{'sequence': 0, 'speaker': 'User', 'text': 'I set up the API.'}]
+        self.ingest(batch, final=True)
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.status, 'FAILED')
+
+        mock_complete.return_value = json.dumps({'completed_tasks': ['Set up the API'], 'new_tasks': []})
+        response = self.ingest(batch, final=True)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.transcript.refresh_from_db()
+        self.assertEqual(self.transcript.status, 'PROCESSED')
+        self.assertEqual(self.transcript.error, '')
+        self.assertTrue(Task.objects.filter(project=self.project, title='Set up the API', status='COMPLETED').exists())
+
+    @patch('api.transcripts.complete_chat')
+    def test_retry_command_processes_failed_and_stalled_transcripts(self, mock_complete):
+        mock_complete.return_value = json.dumps({'completed_tasks': ['Set up the API'], 'new_tasks': []})
+        long_ago = timezone.now() - ANALYSIS_CLAIM_TIMEOUT - timedelta(seconds=1)
+        failed = Transcript.objects.create(user=self.user, status='FAILED', ended_at=timezone.now(), error='LLM down')
+        stalled = Transcript.objects.create(
+            user=self.user, status='ENDED', ended_at=long_ago, analysis_claimed_at=long_ago
+        )
+        running = Transcript.objects.create(
+            user=self.user, status='ENDED', ended_at=long_ago, analysis_claimed_at=timezone.now()
+        )
+        for transcript in (failed, stalled, running):
+            transcript.utterances.create(sequence=0, speaker='User', text='I set up the API.')
+
+        out = StringIO()
+        call_command('retry_transcripts', stdout=out)
+
+        self.assertIn('Retried 2 transcripts', out.getvalue())
+        statuses = dict(Transcript.objects.filter(id__in=[failed.id, stalled.id, running.id]).values_list('id', 'status'))
+        self.assertEqual(statuses, {failed.id: 'PROCESSED', stalled.id: 'PROCESSED', running.id: 'ENDED'})
+
+    def test_get_latest_transcript(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('get-transcript'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['conversations'], [])
+
+        self.ingest([
+            {'sequence': 1, 'speaker': 'User', 'text': 'Yeah.', 'timestamp': '2025-02-25T02:57:39Z'},
+            {'sequence': 0, 'speaker': 'Bot', 'text': 'Hey, ready?', 'timestamp': '2025-02-25T02:57:31Z'},
+        ])
+        response = self.client.get(reverse('get-transcript'))
+        self.assertEqual(response.data['session'], str(self.transcript.id))
+        self.assertEqual([entry['text'] for entry in response.data['conversations']], ['Hey, ready?', 'Yeah.'])
+
+    def test_get_transcript_without_sessions(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('get-transcript'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)